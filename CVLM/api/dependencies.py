@@ -12,6 +12,9 @@ from infrastructure.adapters.postgres_cv_repository import PostgresCvRepository
 from infrastructure.adapters.postgres_motivational_letter_repository import PostgresMotivationalLetterRepository
 from infrastructure.adapters.postgres_promo_code_repository import PostgresPromoCodeRepository
 from infrastructure.adapters.postgres_generation_history_repository import PostgresGenerationHistoryRepository
+from infrastructure.adapters.postgres_idempotency_repository import PostgresIdempotencyRepository
+from infrastructure.adapters.postgres_credit_ledger_repository import PostgresCreditLedgerRepository
+from infrastructure.adapters.sqlalchemy_unit_of_work import SqlAlchemyUnitOfWork
 from infrastructure.adapters.auth_middleware import verify_access_token
 from infrastructure.adapters.google_oauth_service import GoogleOAuthService
 from infrastructure.adapters.logger_config import setup_logger
@@ -26,6 +29,7 @@ from domain.services.generation_history_service import GenerationHistoryService
 from domain.services.use_case_validator import UseCaseValidator
 from domain.services.job_info_extractor import JobInfoExtractor
 from domain.services.filename_builder import FilenameBuilder
+from domain.services.idempotency_service import IdempotencyService
 
 # Use Cases
 from domain.use_cases.generate_cover_letter import GenerateCoverLetterUseCase
@@ -65,6 +69,21 @@ def get_history_repository(db: Session = Depends(get_db)) -> PostgresGenerationH
     return PostgresGenerationHistoryRepository(db)
 
 
+def get_idempotency_repository(db: Session = Depends(get_db)) -> PostgresIdempotencyRepository:
+    """Factory pour IdempotencyRepository"""
+    return PostgresIdempotencyRepository(db)
+
+
+def get_credit_ledger_repository(db: Session = Depends(get_db)) -> PostgresCreditLedgerRepository:
+    """Factory pour CreditLedgerRepository"""
+    return PostgresCreditLedgerRepository(db)
+
+
+def get_unit_of_work(db: Session = Depends(get_db)) -> SqlAlchemyUnitOfWork:
+    """Factory pour UnitOfWork (même session que les repositories de la requête)"""
+    return SqlAlchemyUnitOfWork(db)
+
+
 # === Service Factories ===
 
 def get_cv_validation_service(
@@ -75,10 +94,11 @@ def get_cv_validation_service(
 
 
 def get_credit_service(
-    user_repo: PostgresUserRepository = Depends(get_user_repository)
+    user_repo: PostgresUserRepository = Depends(get_user_repository),
+    credit_ledger_repo: PostgresCreditLedgerRepository = Depends(get_credit_ledger_repository)
 ) -> CreditService:
     """Factory pour CreditService"""
-    return CreditService(user_repo)
+    return CreditService(user_repo, credit_ledger_repo)
 
 
 def get_letter_generation_service() -> LetterGenerationService:
@@ -88,10 +108,11 @@ def get_letter_generation_service() -> LetterGenerationService:
 
 def get_admin_service(
     user_repo: PostgresUserRepository = Depends(get_user_repository),
-    promo_repo: PostgresPromoCodeRepository = Depends(get_promo_code_repository)
+    promo_repo: PostgresPromoCodeRepository = Depends(get_promo_code_repository),
+    history_repo: PostgresGenerationHistoryRepository = Depends(get_history_repository)
 ) -> AdminService:
     """Factory pour AdminService"""
-    return AdminService(user_repo, promo_repo)
+    return AdminService(user_repo, promo_repo, history_repo)
 
 
 def get_promo_code_service(
@@ -109,6 +130,13 @@ def get_history_service(
     return GenerationHistoryService(history_repo)
 
 
+def get_idempotency_service(
+    idempotency_repo: PostgresIdempotencyRepository = Depends(get_idempotency_repository)
+) -> IdempotencyService:
+    """Factory pour IdempotencyService"""
+    return IdempotencyService(idempotency_repo)
+
+
 def get_job_info_extractor() -> JobInfoExtractor:
     """Factory pour JobInfoExtractor (stateless service)"""
     return JobInfoExtractor()
@@ -136,7 +164,7 @@ def get_generate_cover_letter_use_case(
     letter_generation_service: LetterGenerationService = Depends(get_letter_generation_service),
     history_service: GenerationHistoryService = Depends(get_history_service),
     letter_repository: PostgresMotivationalLetterRepository = Depends(get_letter_repository),
-    user_repository: PostgresUserRepository = Depends(get_user_repository)
+    unit_of_work: SqlAlchemyUnitOfWork = Depends(get_unit_of_work)
 ) -> GenerateCoverLetterUseCase:
     """Factory pour GenerateCoverLetterUseCase"""
     return GenerateCoverLetterUseCase(
@@ -146,7 +174,7 @@ def get_generate_cover_letter_use_case(
         letter_generation_service=letter_generation_service,
         history_service=history_service,
         letter_repository=letter_repository,
-        user_repository=user_repository
+        unit_of_work=unit_of_work
     )
 
 
@@ -186,13 +214,13 @@ def get_upload_cv_use_case(
 ) -> UploadCvUseCase:
     """Factory pour UploadCvUseCase"""
     from infrastructure.adapters.pypdf_parse import PyPdfParser
-    from infrastructure.adapters.local_file_storage import LocalFileStorage
-    from config.constants import MAX_FILE_SIZE, FILE_STORAGE_BASE_PATH
+    from infrastructure.adapters.file_storage_factory import get_async_file_storage
+    from config.constants import MAX_FILE_SIZE
     
     return UploadCvUseCase(
         cv_repository=cv_repository,
         document_parser=PyPdfParser(),
-        file_storage=LocalFileStorage(base_path=FILE_STORAGE_BASE_PATH),
+        file_storage=get_async_file_storage(),
         max_file_size=MAX_FILE_SIZE,
         allowed_extensions=['.pdf']
     )
@@ -200,26 +228,37 @@ def get_upload_cv_use_case(
 
 def get_download_history_file_use_case(
     history_repository: PostgresGenerationHistoryRepository = Depends(get_history_repository),
-    filename_builder: FilenameBuilder = Depends(get_filename_builder)
+    filename_builder: FilenameBuilder = Depends(get_filename_builder),
+    history_service: GenerationHistoryService = Depends(get_history_service),
+    letter_repository: PostgresMotivationalLetterRepository = Depends(get_letter_repository),
+    letter_generation_service: LetterGenerationService = Depends(get_letter_generation_service)
 ) -> DownloadHistoryFileUseCase:
     """Factory pour DownloadHistoryFileUseCase"""
+    from infrastructure.adapters.file_storage_factory import get_async_file_storage
+    
     return DownloadHistoryFileUseCase(
         history_repository=history_repository,
-        filename_builder=filename_builder
+        filename_builder=filename_builder,
+        history_service=history_service,
+        letter_repository=letter_repository,
+        letter_generation_service=letter_generation_service,
+        file_storage=get_async_file_storage()
     )
 
 
 def get_download_letter_use_case(
     letter_repository: PostgresMotivationalLetterRepository = Depends(get_letter_repository),
-    filename_builder: FilenameBuilder = Depends(get_filename_builder)
+    filename_builder: FilenameBuilder = Depends(get_filename_builder),
+    letter_generation_service: LetterGenerationService = Depends(get_letter_generation_service)
 ) -> DownloadLetterUseCase:
     """Factory pour DownloadLetterUseCase"""
-    from infrastructure.adapters.local_file_storage import LocalFileStorage
+    from infrastructure.adapters.file_storage_factory import get_async_file_storage
     
     return DownloadLetterUseCase(
         letter_repository=letter_repository,
-        file_storage=LocalFileStorage(),
-        filename_builder=filename_builder
+        file_storage=get_async_file_storage(),
+        filename_builder=filename_builder,
+        letter_generation_service=letter_generation_service
     )
 
 
@@ -228,11 +267,11 @@ def get_delete_cv_use_case(
     cv_validation_service: CvValidationService = Depends(get_cv_validation_service)
 ) -> DeleteCvUseCase:
     """Factory pour DeleteCvUseCase"""
-    from infrastructure.adapters.local_file_storage import LocalFileStorage
+    from infrastructure.adapters.file_storage_factory import get_async_file_storage
     
     return DeleteCvUseCase(
         cv_repository=cv_repository,
-        file_storage=LocalFileStorage(),
+        file_storage=get_async_file_storage(),
         cv_validation_service=cv_validation_service
     )
 
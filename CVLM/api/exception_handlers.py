@@ -23,7 +23,10 @@ async def business_exception_handler(request: Request, exc: Exception):
         ResourceNotFoundError,
         UnauthorizedAccessError,
         FileValidationError,
-        PromoCodeError
+        PromoCodeError,
+        IdempotencyKeyConflictError,
+        IdempotencyKeyMismatchError,
+        PdfRenderingBusyError
     )
     
     # Exceptions métier → HTTPException
@@ -47,5 +50,17 @@ async def business_exception_handler(request: Request, exc: Exception):
         logger.warning(f"Erreur code promo: {exc.message}")
         raise HTTPException(status_code=400, detail=exc.message)
     
+    elif isinstance(exc, IdempotencyKeyConflictError):
+        logger.warning(f"Requête idempotente en cours: {exc.message}")
+        raise HTTPException(status_code=409, detail=exc.message)
+    
+    elif isinstance(exc, IdempotencyKeyMismatchError):
+        logger.warning(f"Clé d'idempotence réutilisée: {exc.message}")
+        raise HTTPException(status_code=422, detail=exc.message)
+    
+    elif isinstance(exc, PdfRenderingBusyError):
+        logger.warning(f"Rendu PDF saturé: {exc.message}")
+        raise HTTPException(status_code=503, detail=exc.message)
+    
     # Laisser passer les autres exceptions
     raise exc
@@ -0,0 +1,94 @@
+"""
+Helpers FastAPI pour le header Idempotency-Key
+Utilisés par les endpoints coûteux (génération, upload) pour rejouer la réponse d'origine
+"""
+import json
+from typing import Optional, Union
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from domain.services.idempotency_service import IdempotencyService
+from domain.exceptions import IdempotencyKeyConflictError, IdempotencyKeyMismatchError
+from infrastructure.adapters.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def begin_idempotent_request(
+    service: IdempotencyService,
+    user_id: str,
+    idempotency_key: Optional[str],
+    endpoint: str,
+    *request_parts: Union[str, bytes, None]
+) -> Optional[JSONResponse]:
+    """
+    Réserve la clé d'idempotence avant d'exécuter l'endpoint
+
+    Returns:
+        JSONResponse à retourner telle quelle si la requête a déjà été traitée,
+        None si l'endpoint doit s'exécuter (ou si aucun header n'est fourni)
+
+    Raises:
+        HTTPException 400: Clé invalide
+        HTTPException 409: Requête identique encore en cours
+        HTTPException 422: Clé réutilisée pour une requête différente
+    """
+    if idempotency_key is None:
+        return None
+
+    request_hash = service.compute_request_hash(endpoint, *request_parts)
+
+    try:
+        record = service.begin(user_id, idempotency_key, endpoint, request_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(status_code=409, detail=e.message)
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+
+    if record is None:
+        return None
+
+    return JSONResponse(
+        status_code=record.status_code or 200,
+        content=json.loads(record.response_body),
+        headers={IDEMPOTENT_REPLAYED_HEADER: "true"}
+    )
+
+
+def complete_idempotent_request(
+    service: IdempotencyService,
+    user_id: str,
+    idempotency_key: Optional[str],
+    response: BaseModel,
+    status_code: int = 200
+) -> None:
+    """Mémorise la réponse de l'endpoint (no-op sans header)"""
+    if idempotency_key is None:
+        return
+
+    try:
+        service.complete(user_id, idempotency_key, status_code, response.model_dump())
+    except Exception as e:
+        # La réponse a été produite: ne pas la perdre pour un échec de mémorisation
+        logger.error(f"Erreur mémorisation réponse idempotente: {e}")
+
+
+def release_idempotent_request(
+    service: IdempotencyService,
+    user_id: str,
+    idempotency_key: Optional[str]
+) -> None:
+    """Libère la clé après un échec pour que le client puisse réessayer (no-op sans header)"""
+    if idempotency_key is None:
+        return
+
+    try:
+        service.release(user_id, idempotency_key)
+    except Exception as e:
+        logger.error(f"Erreur libération clé d'idempotence: {e}")
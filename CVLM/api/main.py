@@ -8,13 +8,16 @@ from pathlib import Path
 
 from infrastructure.database.config import init_database
 from infrastructure.adapters.local_file_storage import LocalFileStorage
+from infrastructure.adapters.file_storage_factory import get_async_file_storage
+from infrastructure.adapters.fpdf_generator import FpdfGenerator
+from infrastructure.adapters.weasyprint_pool import get_weasyprint_pool
+from infrastructure.adapters.pdf_render_cache import get_pdf_render_cache
 from infrastructure.adapters.logger_config import setup_logger
 from config.constants import (
     CORS_ALLOWED_ORIGINS,
     CORS_ORIGIN_REGEX,
     FILE_STORAGE_BASE_PATH,
-    TEMP_DIR,
-    OUTPUT_DIR
+    TEMP_DIR
 )
 
 # Import routes
@@ -38,7 +41,8 @@ app.add_middleware(
     allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "Idempotency-Key"],
+    expose_headers=["Idempotent-Replayed"],
 )
 
 # Initialiser la base de données au démarrage
@@ -51,13 +55,38 @@ async def startup_event():
         
         # Créer les répertoires nécessaires
         TEMP_DIR.mkdir(parents=True, exist_ok=True)
-        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         Path(FILE_STORAGE_BASE_PATH).mkdir(parents=True, exist_ok=True)
         logger.info("Répertoires de stockage initialisés")
         
     except Exception as e:
         logger.error(f"Erreur initialisation: {e}")
         raise
+    
+    try:
+        # Police FPDF chargée une fois: la première lettre ne paie pas le parsing
+        FpdfGenerator.warm_up()
+    except Exception as e:
+        logger.warning(f"Préchargement police PDF impossible: {e}")
+    
+    try:
+        # Cache de rendus ouvert au démarrage: son inventaire (parcours du répertoire)
+        # ne tombe pas sur la boucle d'événements à la première lettre
+        get_pdf_render_cache()
+    except Exception as e:
+        logger.warning(f"Ouverture du cache de rendus PDF impossible: {e}")
+    
+    try:
+        # Workers WeasyPrint démarrés et préchauffés avant la première requête
+        get_weasyprint_pool().start()
+    except Exception as e:
+        logger.warning(f"Démarrage du pool WeasyPrint impossible: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Arrête les workers de rendu PDF et le pool d'I/O fichiers"""
+    get_weasyprint_pool().shutdown()
+    get_async_file_storage().shutdown()
 
 # Exception Handlers
 @app.exception_handler(Exception)
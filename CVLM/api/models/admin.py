@@ -2,9 +2,11 @@
 Modèles Pydantic pour l'administration
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
+from api.models.auth import UserResponse
+
 
 class PromoCodeGenerateRequest(BaseModel):
     code: str
@@ -14,6 +16,15 @@ class PromoCodeGenerateRequest(BaseModel):
     expires_at: Optional[datetime] = None
 
 
+class PromoCodeBulkGenerateRequest(BaseModel):
+    count: int
+    pdf_credits: int = 0
+    text_credits: int = 0
+    max_uses: int = 1
+    days_valid: Optional[int] = None
+    prefix: Optional[str] = None
+
+
 class PromoCodeResponse(BaseModel):
     code: str
     pdf_credits: int
@@ -48,8 +59,33 @@ class UserPromoteRequest(BaseModel):
     user_id: str
 
 
+class UserListResponse(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class DailyCount(BaseModel):
+    day: str
+    count: int
+
+
+class DailyGenerationStats(BaseModel):
+    day: str
+    llm_provider: str
+    total: int
+    success: int
+
+
 class DashboardStatsResponse(BaseModel):
     total_users: int
+    total_admins: int
+    total_pdf_credits: int
+    total_text_credits: int
     total_promo_codes: int
     active_promo_codes: int
+    total_promo_redemptions: int
     total_generations: int
+    success_rate: float
+    signups_per_day: List[DailyCount]
+    generations_per_day: List[DailyGenerationStats]
@@ -20,13 +20,47 @@ class HistoryEntryResponse(BaseModel):
 
 
 class HistoryListResponse(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_is_estimate: bool = False
     items: List[HistoryEntryResponse]
 
 
+def history_list_response(result: dict) -> HistoryListResponse:
+    """Formate un résultat paginé du repository en HistoryListResponse"""
+    items = [
+        HistoryEntryResponse(
+            id=item.id,
+            type=item.type,
+            job_title=item.job_title,
+            company_name=item.company_name,
+            job_url=item.job_url,
+            cv_filename=item.cv_filename,
+            status=item.status,
+            created_at=item.created_at.isoformat() if item.created_at else "",
+            is_downloadable=item.is_downloadable(),
+            is_expired=item.is_file_expired(),
+            days_until_expiration=item.days_until_expiration()
+        )
+        for item in result["items"]
+    ]
+    
+    return HistoryListResponse(
+        total=result["total"],
+        page=result["page"],
+        per_page=result["per_page"],
+        pages=result["pages"],
+        next_cursor=result["next_cursor"],
+        has_more=result["has_more"],
+        total_is_estimate=result.get("total_is_estimate", False),
+        items=items
+    )
+
+
 class HistoryStatsResponse(BaseModel):
     total: int
     pdf_count: int
@@ -37,6 +71,10 @@ class HistoryStatsResponse(BaseModel):
     unique_companies: int
 
 
+class CompanySuggestionsResponse(BaseModel):
+    items: List[str]
+
+
 class HistoryTextResponse(BaseModel):
     id: str
     text_content: str
@@ -1,28 +1,39 @@
 """
 Routes d'administration
-Endpoints: /admin/stats, /admin/users, /admin/promo-codes, /admin/users/promote, etc.
+Endpoints: /admin/stats, /admin/users, /admin/promo-codes, /admin/promo-codes/generate-bulk,
+/admin/users/promote, etc.
 """
 
-from typing import Optional
+import csv
+import io
+from datetime import datetime
+from typing import Iterator, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from api.dependencies import verify_admin, get_db, get_admin_service, get_promo_code_service
+from api.dependencies import verify_admin, get_db, get_admin_service, get_promo_code_service, get_history_service
 from api.models.admin import (
     DashboardStatsResponse,
     PromoCodeGenerateRequest,
+    PromoCodeBulkGenerateRequest,
     PromoCodeResponse,
     PromoCodeRedeemRequest,
     PromoCodeRedeemResponse,
     UserUpdateCreditsRequest,
-    UserPromoteRequest
+    UserPromoteRequest,
+    UserListResponse
 )
 from api.models.auth import UserResponse
-from domain.entities.user import User
+from api.models.history import HistoryListResponse, history_list_response
+from domain.entities.user import User, UserListFilters, USER_LIST_SORTS
+from domain.entities.promo_code import PromoCode
 from domain.services.admin_service import AdminService
 from domain.services.promo_code_service import PromoCodeService
+from domain.services.generation_history_service import GenerationHistoryService
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import ADMIN_USERS_PAGINATION_DEFAULT
 
 logger = setup_logger(__name__)
 
@@ -58,50 +69,212 @@ async def get_admin_stats(
         raise HTTPException(status_code=500, detail="Erreur lors de la récupération des statistiques")
 
 
-@router.get("/users", response_model=list[UserResponse])
+def _user_filters(
+    email: Optional[str] = None,
+    is_admin: Optional[bool] = None,
+    zero_credits: bool = False,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    sort: str = 'created_desc'
+) -> UserListFilters:
+    """Paramètres de requête communs à la liste et à l'export des utilisateurs"""
+    return UserListFilters(
+        email_prefix=email,
+        is_admin=is_admin,
+        zero_credits=zero_credits,
+        created_from=created_from,
+        created_to=created_to,
+        sort=sort
+    )
+
+
+def _user_response(user: User) -> UserResponse:
+    return UserResponse(
+        id=user.id,
+        email=user.email,
+        name=user.name,
+        picture=user.profile_picture_url,
+        pdf_credits=user.pdf_credits,
+        text_credits=user.text_credits,
+        is_admin=user.is_admin,
+        created_at=user.created_at.isoformat() if user.created_at else ""
+    )
+
+
+@router.get("/users", response_model=UserListResponse)
 async def get_all_users(
+    per_page: int = ADMIN_USERS_PAGINATION_DEFAULT,
+    cursor: Optional[str] = None,
+    filters: UserListFilters = Depends(_user_filters),
     admin: User = Depends(verify_admin),
-    db: Session = Depends(get_db)
+    admin_service: AdminService = Depends(get_admin_service)
 ):
     """
-    Récupère la liste de tous les utilisateurs.
+    Liste paginée des utilisateurs avec filtres et tri.
     
     Args:
+        per_page: Utilisateurs par page (max ADMIN_USERS_PAGINATION_MAX)
+        cursor: Curseur opaque de la page suivante (next_cursor)
+        filters: email (préfixe), is_admin, zero_credits, created_from/created_to,
+                 sort (created_desc, created_asc, email)
         admin: Utilisateur admin connecté (injecté)
-        db: Session de base de données (injectée)
+        admin_service: Service admin (injecté)
     
     Returns:
-        Liste de UserResponse
+        UserListResponse (items, next_cursor, has_more)
     
     Raises:
+        HTTPException 400: Curseur ou tri invalide
         HTTPException 403: Utilisateur non admin
         HTTPException 500: Erreur serveur
     """
     try:
-        user_repo = PostgresUserRepository(db)
-        promo_repo = PostgresPromoCodeRepository(db)
-        admin_service = AdminService(user_repo, promo_repo)
-        
-        users = admin_service.get_all_users()
-        return [
-            UserResponse(
-                id=user.id,
-                email=user.email,
-                name=user.name,
-                picture=user.profile_picture_url,
-                pdf_credits=user.pdf_credits,
-                text_credits=user.text_credits,
-                is_admin=user.is_admin,
-                created_at=user.created_at.isoformat() if user.created_at else ""
-            )
-            for user in users
-        ]
+        result = admin_service.list_users(filters, per_page=per_page, cursor=cursor)
+        return UserListResponse(
+            items=[_user_response(user) for user in result["items"]],
+            next_cursor=result["next_cursor"],
+            has_more=result["has_more"]
+        )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur récupération utilisateurs: {e}")
         raise HTTPException(status_code=500, detail="Erreur lors de la récupération des utilisateurs")
 
 
+@router.get("/users/export")
+async def export_users(
+    format: str = "ndjson",
+    filters: UserListFilters = Depends(_user_filters),
+    admin: User = Depends(verify_admin),
+    admin_service: AdminService = Depends(get_admin_service)
+):
+    """
+    Export complet des utilisateurs filtrés, en streaming (NDJSON ou CSV).
+    
+    Les utilisateurs sont lus par lots de ADMIN_USERS_EXPORT_BATCH_SIZE:
+    la mémoire reste bornée quel que soit le nombre d'utilisateurs.
+    
+    Args:
+        format: 'ndjson' (défaut) ou 'csv'
+        filters: Mêmes filtres que GET /admin/users
+        admin: Utilisateur admin connecté (injecté)
+        admin_service: Service admin (injecté)
+    
+    Returns:
+        StreamingResponse
+    
+    Raises:
+        HTTPException 400: Format ou tri invalide
+        HTTPException 403: Utilisateur non admin
+    """
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Format d'export invalide (ndjson ou csv)")
+    if filters.sort not in USER_LIST_SORTS:
+        raise HTTPException(status_code=400, detail=f"Tri inconnu: {filters.sort}")
+    
+    users = admin_service.iter_users(filters)
+    filename = f"users_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    logger.info(f"Export utilisateurs ({format}) par {admin.email}")
+    
+    if format == "csv":
+        content, media_type = _users_csv(users), "text/csv"
+    else:
+        content, media_type = _users_ndjson(users), "application/x-ndjson"
+    
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def _users_ndjson(users: Iterator[User], chunk_size: int = 1000) -> Iterator[str]:
+    """Une ligne JSON par utilisateur, émise par blocs"""
+    lines = []
+    for user in users:
+        lines.append(_user_response(user).model_dump_json())
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _users_csv(users: Iterator[User], chunk_size: int = 1000) -> Iterator[str]:
+    """Sérialise les utilisateurs en CSV par blocs de lignes"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["id", "email", "name", "pdf_credits", "text_credits", "is_admin", "created_at"])
+    
+    for index, user in enumerate(users, start=1):
+        writer.writerow([
+            user.id,
+            user.email,
+            user.name,
+            user.pdf_credits,
+            user.text_credits,
+            user.is_admin,
+            user.created_at.isoformat() if user.created_at else ""
+        ])
+        if index % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    
+    yield buffer.getvalue()
+
+
+@router.get("/history", response_model=HistoryListResponse)
+async def get_all_history(
+    page: int = 1,
+    per_page: int = 50,
+    user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+    admin: User = Depends(verify_admin),
+    history_service: GenerationHistoryService = Depends(get_history_service)
+):
+    """
+    Parcourt l'historique global des générations (pagination par curseur ou par page).
+    
+    Sans filtre utilisateur, le total est une estimation (total_is_estimate=true).
+    
+    Args:
+        page: Numéro de page (ignoré si cursor est fourni)
+        per_page: Éléments par page (max HISTORY_PAGINATION_MAX)
+        user_id: Filtre optionnel sur un utilisateur
+        cursor: Curseur opaque de la page suivante
+        with_total: Calculer le total
+        admin: Utilisateur admin connecté (injecté)
+        history_service: Service d'historique (injecté)
+    
+    Returns:
+        HistoryListResponse
+    
+    Raises:
+        HTTPException 400: Curseur invalide
+        HTTPException 403: Utilisateur non admin
+        HTTPException 500: Erreur serveur
+    """
+    try:
+        result = history_service.get_all_history(
+            page=page,
+            per_page=per_page,
+            user_filter=user_id,
+            cursor=cursor,
+            with_total=with_total
+        )
+        return history_list_response(result)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erreur récupération historique global: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la récupération de l'historique")
+
+
 @router.get("/promo-codes", response_model=list[PromoCodeResponse])
 async def get_all_promo_codes(
     admin: User = Depends(verify_admin),
@@ -197,11 +370,78 @@ async def generate_promo_code(
         raise HTTPException(status_code=500, detail="Erreur lors de la génération du code")
 
 
+@router.post("/promo-codes/generate-bulk")
+async def generate_promo_codes_bulk(
+    data: PromoCodeBulkGenerateRequest,
+    admin: User = Depends(verify_admin),
+    promo_service: PromoCodeService = Depends(get_promo_code_service)
+):
+    """
+    Génère N codes promo en une requête (campagnes) et les retourne en CSV.
+    
+    Args:
+        data: Requête avec count, pdf_credits, text_credits, max_uses, days_valid, prefix
+        admin: Utilisateur admin connecté (injecté)
+        promo_service: Service codes promo (injecté)
+    
+    Returns:
+        StreamingResponse CSV (code, pdf_credits, text_credits, max_uses, expires_at)
+    
+    Raises:
+        HTTPException 400: Nombre de codes invalide
+        HTTPException 403: Utilisateur non admin
+        HTTPException 500: Erreur serveur
+    """
+    try:
+        promo_codes = promo_service.generate_codes_bulk(
+            count=data.count,
+            pdf_credits=data.pdf_credits,
+            text_credits=data.text_credits,
+            max_uses=data.max_uses,
+            days_valid=data.days_valid,
+            prefix=data.prefix
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erreur génération codes promo en masse: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la génération des codes")
+    
+    filename = f"promo_codes_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
+    return StreamingResponse(
+        _promo_codes_csv(promo_codes),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def _promo_codes_csv(promo_codes: List[PromoCode], chunk_size: int = 1000) -> Iterator[str]:
+    """Sérialise les codes en CSV par blocs de lignes"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["code", "pdf_credits", "text_credits", "max_uses", "expires_at"])
+    
+    for index, promo in enumerate(promo_codes, start=1):
+        writer.writerow([
+            promo.code,
+            promo.pdf_credits,
+            promo.text_credits,
+            promo.max_uses,
+            promo.expires_at.isoformat() if promo.expires_at else ""
+        ])
+        if index % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    
+    yield buffer.getvalue()
+
+
 @router.post("/promo-codes/redeem", response_model=PromoCodeRedeemResponse)
 async def redeem_promo_code(
     data: PromoCodeRedeemRequest,
     admin: User = Depends(verify_admin),
-    db: Session = Depends(get_db)
+    promo_service: PromoCodeService = Depends(get_promo_code_service)
 ):
     """
     Utilise un code promo pour obtenir des crédits (endpoint admin pour tests).
@@ -209,7 +449,7 @@ async def redeem_promo_code(
     Args:
         data: Requête avec le code promo
         admin: Utilisateur admin connecté (injecté)
-        db: Session de base de données (injectée)
+        promo_service: Service codes promo (injecté)
     
     Returns:
         PromoCodeRedeemResponse avec les crédits ajoutés
@@ -220,22 +460,16 @@ async def redeem_promo_code(
         HTTPException 500: Erreur serveur
     """
     try:
-        promo_repo = PostgresPromoCodeRepository(db)
-        user_repo = PostgresUserRepository(db)
-        promo_service = PromoCodeService(promo_repo, user_repo)
-        
+        # Les soldes de admin sont mis à jour depuis le RETURNING (pas de relecture)
         pdf_added, text_added = promo_service.redeem_code(data.code, admin)
         
-        # Rafraîchir l'utilisateur pour avoir les nouveaux crédits
-        refreshed_user = user_repo.get_by_id(admin.id)
-        
         return PromoCodeRedeemResponse(
             status="success",
             message=f"Code promo appliqué ! Vous avez reçu {pdf_added} crédits PDF et {text_added} crédits texte.",
             pdf_credits_added=pdf_added,
             text_credits_added=text_added,
-            new_pdf_credits=refreshed_user.pdf_credits,
-            new_text_credits=refreshed_user.text_credits
+            new_pdf_credits=admin.pdf_credits,
+            new_text_credits=admin.text_credits
         )
         
     except HTTPException:
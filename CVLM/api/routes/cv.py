@@ -1,17 +1,27 @@
 """
 Routes pour la gestion des CVs
 """
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, File, Header, UploadFile, HTTPException
 from sqlalchemy.orm import Session
-from pathlib import Path
+from typing import Optional
 
 from api.models.cv import CvInfo, UploadResponse, CvListResponse
-from api.dependencies import get_current_user, get_upload_cv_use_case
+from api.dependencies import get_current_user, get_upload_cv_use_case, get_idempotency_service
+from api.idempotency import (
+    begin_idempotent_request,
+    complete_idempotent_request,
+    release_idempotent_request
+)
 from domain.entities.user import User
+from domain.ports.async_file_storage import AsyncFileStorage
 from domain.use_cases.upload_cv import UploadCvUseCase, UploadCvInput
+from domain.services.idempotency_service import IdempotencyService
 from infrastructure.database.config import get_db
 from infrastructure.adapters.postgres_cv_repository import PostgresCvRepository
+from infrastructure.adapters.file_storage_factory import get_async_file_storage
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import IDEMPOTENCY_KEY_HEADER
 
 logger = setup_logger(__name__)
 
@@ -21,24 +31,36 @@ router = APIRouter(tags=["CV Management"])
 @router.post("/upload-cv", response_model=UploadResponse)
 async def upload_cv(
     cv_file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
     current_user: User = Depends(get_current_user),
-    use_case: UploadCvUseCase = Depends(get_upload_cv_use_case)
+    use_case: UploadCvUseCase = Depends(get_upload_cv_use_case),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ):
     """
     Upload un CV au format PDF
     
     Args:
         cv_file: Fichier PDF à uploader
+        idempotency_key: Header Idempotency-Key optionnel (évite les doublons au renvoi)
         current_user: Utilisateur authentifié
         use_case: Use Case d'upload de CV
+        idempotency_service: Service d'idempotence
         
     Returns:
         UploadResponse: Informations sur le CV uploadé
     """
+    # Lire le contenu du fichier (nécessaire à l'empreinte de la requête)
+    content = await cv_file.read()
+    
+    replay = begin_idempotent_request(
+        idempotency_service, current_user.id, idempotency_key,
+        "upload-cv", cv_file.filename, content
+    )
+    if replay:
+        return replay
+    
+    completed = False
     try:
-        # Lire le contenu du fichier
-        content = await cv_file.read()
-        
         # Créer l'input du Use Case
         input_data = UploadCvInput(
             file_content=content,
@@ -47,17 +69,20 @@ async def upload_cv(
         )
         
         # Exécuter le Use Case
-        output = use_case.execute(input_data, current_user)
+        output = await use_case.execute(input_data, current_user)
         
         logger.info(f"CV uploadé avec succès: {output.cv_id} pour {current_user.email}")
         
-        return UploadResponse(
+        response = UploadResponse(
             status="success",
             message="CV uploadé avec succès",
             cv_id=output.cv_id,
             filename=output.filename,
             file_size=output.file_size
         )
+        complete_idempotent_request(idempotency_service, current_user.id, idempotency_key, response)
+        completed = True
+        return response
         
     except ValueError as e:
         # Erreur de validation (400 Bad Request)
@@ -73,12 +98,17 @@ async def upload_cv(
         # Erreur inattendue
         logger.error(f"Erreur inattendue: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Erreur lors de l'upload du CV")
+    
+    finally:
+        if not completed:
+            release_idempotent_request(idempotency_service, current_user.id, idempotency_key)
 
 
 @router.get("/list-cvs", response_model=CvListResponse)
 async def list_cvs(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    storage: AsyncFileStorage = Depends(get_async_file_storage)
 ):
     """
     Liste tous les CVs de l'utilisateur connecté
@@ -86,6 +116,7 @@ async def list_cvs(
     Args:
         current_user: Utilisateur authentifié
         db: Session de base de données
+        storage: Stockage des fichiers (injecté)
         
     Returns:
         CvListResponse: Liste des CVs
@@ -94,7 +125,9 @@ async def list_cvs(
         cv_repo = PostgresCvRepository(db)
         
         # Récupérer uniquement les CVs de l'utilisateur connecté
-        cvs = cv_repo.get_by_user_id(current_user.id)
+        cvs = cv_repo.list_summaries(current_user.id)
+        # Fichiers vérifiés en parallèle, hors boucle d'événements (disque ou stockage objet)
+        exists = await asyncio.gather(*(storage.path_exists(cv.file_path) for cv in cvs))
         
         cv_infos = [
             CvInfo(
@@ -103,7 +136,7 @@ async def list_cvs(
                 upload_date=cv.created_at.isoformat(),
                 file_size=cv.file_size
             )
-            for cv in cvs if Path(cv.file_path).exists()
+            for cv, cv_exists in zip(cvs, exists) if cv_exists
         ]
         
         return CvListResponse(status="success", cvs=cv_infos)
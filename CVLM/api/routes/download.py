@@ -5,42 +5,98 @@ Endpoints: /download-letter/{letter_id}, /user/history/{history_id}/download, /c
 
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_current_user, get_db, get_download_history_file_use_case, get_download_letter_use_case, get_delete_cv_use_case
 from domain.entities.user import User
+from domain.ports.async_file_storage import AsyncFileStorage
+from domain.services.filename_builder import FilenameBuilder
 from domain.services.cv_validation_service import CvValidationService
 from infrastructure.adapters.postgres_cv_repository import PostgresCvRepository
 from infrastructure.adapters.postgres_motivational_letter_repository import PostgresMotivationalLetterRepository
 from infrastructure.adapters.postgres_generation_history_repository import PostgresGenerationHistoryRepository
-from infrastructure.adapters.local_file_storage import LocalFileStorage
+from infrastructure.adapters.file_storage_factory import get_async_file_storage
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import DOWNLOAD_CACHE_MAX_AGE_SECONDS
 
 logger = setup_logger(__name__)
 
 
 router = APIRouter(prefix="", tags=["download"])
-file_storage = LocalFileStorage()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match (comparaison faible, RFC 9110): '*' ou l'un des ETags listés"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+async def _file_response(
+    request: Request,
+    storage: AsyncFileStorage,
+    file_path: str,
+    filename: str,
+    media_type: str,
+    etag: Optional[str]
+):
+    """
+    Réponse de téléchargement selon le stockage
+    
+    - Stockage objet avec URLs présignées: redirection, le PDF ne transite pas par l'API
+      (S3 gère lui-même ETag, 304 et Range)
+    - ETag connu du client (If-None-Match): 304 sans corps
+    - Stockage objet sans URLs présignées: relais en flux par morceaux
+    - Fichier local: FileResponse (requêtes Range et If-Range sur l'ETag de contenu)
+    """
+    download_url = await storage.get_download_url(file_path, filename)
+    if download_url:
+        return RedirectResponse(download_url, status_code=307)
+    
+    # Fichier propre à l'utilisateur: cache navigateur uniquement, jamais partagé
+    headers = {"Cache-Control": f"private, max-age={DOWNLOAD_CACHE_MAX_AGE_SECONDS}"}
+    if etag:
+        headers["ETag"] = etag
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+    
+    chunks = await storage.stream_file(file_path)
+    if chunks is not None:
+        headers["Content-Disposition"] = FilenameBuilder.build_content_disposition(filename)
+        return StreamingResponse(chunks, media_type=media_type, headers=headers)
+    
+    # L'ETag fourni remplace celui de Starlette (mtime/taille) et valide If-Range
+    return FileResponse(path=file_path, filename=filename, media_type=media_type, headers=headers)
 
 
 @router.get("/download-letter/{letter_id}")
 async def download_letter(
     letter_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    use_case = Depends(get_download_letter_use_case)
+    use_case = Depends(get_download_letter_use_case),
+    storage: AsyncFileStorage = Depends(get_async_file_storage)
 ):
     """
     Télécharge une lettre de motivation depuis PostgreSQL.
     
     Args:
         letter_id: ID de la lettre à télécharger
+        request: Requête (If-None-Match, Range)
         current_user: Utilisateur connecté (injecté)
         use_case: Use case de téléchargement (injecté)
+        storage: Stockage des fichiers (injecté)
     
     Returns:
-        FileResponse avec le PDF
+        PDF (fichier local, flux, ou redirection vers une URL présignée),
+        304 si le client a déjà cette version (ETag)
     
     Raises:
         HTTPException 403: Accès interdit
@@ -53,32 +109,35 @@ async def download_letter(
     input_data = DownloadLetterInput(letter_id=letter_id)
     
     # Exécuter le use case (orchestration complète)
-    output = use_case.execute(input_data, current_user)
+    output = await use_case.execute(input_data, current_user)
     
-    # Retourner la réponse
-    return FileResponse(
-        path=output.file_path,
-        filename=output.filename,
-        media_type=output.media_type
+    # Retourner la réponse (redirection, flux ou fichier local)
+    return await _file_response(
+        request, storage, output.file_path, output.filename, output.media_type, output.etag
     )
 
 
 @router.get("/user/history/{history_id}/download")
 async def download_history_file(
     history_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    use_case = Depends(get_download_history_file_use_case)
+    use_case = Depends(get_download_history_file_use_case),
+    storage: AsyncFileStorage = Depends(get_async_file_storage)
 ):
     """
     Télécharge un fichier PDF depuis l'historique.
     
     Args:
         history_id: ID de l'entrée historique
+        request: Requête (If-None-Match, Range)
         current_user: Utilisateur connecté (injecté)
         use_case: Use case de téléchargement (injecté)
+        storage: Stockage des fichiers (injecté)
     
     Returns:
-        FileResponse avec le PDF
+        PDF (fichier local, flux, ou redirection vers une URL présignée),
+        304 si le client a déjà cette version (ETag)
     
     Raises:
         HTTPException 403: Accès refusé
@@ -92,13 +151,11 @@ async def download_history_file(
     input_data = DownloadHistoryFileInput(history_id=history_id)
     
     # Exécuter le use case (orchestration complète)
-    output = use_case.execute(input_data, current_user)
+    output = await use_case.execute(input_data, current_user)
     
-    # Retourner la réponse
-    return FileResponse(
-        path=output.file_path,
-        filename=output.filename,
-        media_type=output.media_type
+    # Retourner la réponse (redirection, flux ou fichier local)
+    return await _file_response(
+        request, storage, output.file_path, output.filename, output.media_type, output.etag
     )
 
 
@@ -130,6 +187,6 @@ async def cleanup_files(
     input_data = DeleteCvInput(cv_id=cv_id)
     
     # Exécuter le use case (transaction atomique)
-    output = use_case.execute(input_data, current_user)
+    output = await use_case.execute(input_data, current_user)
     
     return {"status": output.status, "message": output.message}
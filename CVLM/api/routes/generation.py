@@ -1,26 +1,45 @@
 """
 Routes de génération de lettres de motivation et textes
-Endpoints: /generate-cover-letter, /generate-text, /list-letters
+Endpoints: /generate-cover-letter, /generate-text, /list-letters, /preview-letter/{letter_id}
+
+Les endpoints de génération acceptent un header Idempotency-Key optionnel:
+un renvoi de la même requête rejoue la réponse d'origine sans nouveau débit.
 """
 
-from fastapi import APIRouter, Depends, Form, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Form, Header, HTTPException
+from fastapi.responses import HTMLResponse
 
 from api.dependencies import (
     get_current_user,
     get_letter_repository,
-    get_cv_repository,
     get_generate_cover_letter_use_case,
-    get_generate_text_use_case
+    get_generate_text_use_case,
+    get_idempotency_service
+)
+from api.idempotency import (
+    begin_idempotent_request,
+    complete_idempotent_request,
+    release_idempotent_request
 )
 from api.models.generation import GenerationResponse, TextGenerationRequest, TextGenerationResponse
 from domain.entities.user import User
+from domain.exceptions import PdfRenderingBusyError
 from domain.use_cases.generate_cover_letter import (
     GenerateCoverLetterUseCase,
     GenerateCoverLetterInput
 )
 from domain.use_cases.generate_text import GenerateTextUseCase
+from domain.services.idempotency_service import IdempotencyService
 from infrastructure.adapters.postgres_motivational_letter_repository import PostgresMotivationalLetterRepository
+from infrastructure.adapters.letter_template_renderer import LetterTemplateRenderer, get_letter_template_renderer
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import (
+    IDEMPOTENCY_KEY_HEADER,
+    HISTORY_PAGINATION_DEFAULT,
+    HISTORY_PAGINATION_MAX,
+    LETTER_LAYOUT_DEFAULT
+)
 
 logger = setup_logger(__name__)
 
@@ -34,8 +53,11 @@ async def generate_cover_letter(
     job_url: str = Form(...),
     llm_provider: str = Form("openai"),
     pdf_generator: str = Form("fpdf"),
+    layout: str = Form(LETTER_LAYOUT_DEFAULT),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
     current_user: User = Depends(get_current_user),
-    use_case: GenerateCoverLetterUseCase = Depends(get_generate_cover_letter_use_case)
+    use_case: GenerateCoverLetterUseCase = Depends(get_generate_cover_letter_use_case),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ):
     """
     Génère une lettre de motivation en PDF à partir d'un CV et d'une offre d'emploi.
@@ -45,17 +67,37 @@ async def generate_cover_letter(
         job_url: URL de l'offre d'emploi (Welcome to the Jungle)
         llm_provider: Fournisseur LLM (openai ou gemini)
         pdf_generator: Générateur PDF (fpdf ou weasyprint)
+        layout: Mise en page HTML du rendu WeasyPrint (classic, modern, compact)
+        idempotency_key: Header Idempotency-Key optionnel (rejeu sans double débit)
         current_user: Utilisateur connecté (injecté)
         use_case: Use case de génération (injecté)
+        idempotency_service: Service d'idempotence (injecté)
     
     Returns:
         GenerationResponse avec file_id, download_url et letter_text
     
     Raises:
+        HTTPException 400: Mise en page inconnue
         HTTPException 403: Crédits insuffisants
         HTTPException 404: CV introuvable
+        HTTPException 409: Requête identique déjà en cours
+        HTTPException 422: Clé d'idempotence réutilisée pour une autre requête
         HTTPException 500: Erreur de génération
+        HTTPException 503: Rendu PDF saturé, réessayer plus tard
     """
+    try:
+        layout = LetterTemplateRenderer.resolve_layout(layout)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    replay = begin_idempotent_request(
+        idempotency_service, current_user.id, idempotency_key,
+        "generate-cover-letter", cv_id, job_url, llm_provider, pdf_generator, layout
+    )
+    if replay:
+        return replay
+    
+    completed = False
     try:
         # Créer l'input du use case
         input_data = GenerateCoverLetterInput(
@@ -63,44 +105,57 @@ async def generate_cover_letter(
             cv_id=cv_id,
             job_url=job_url,
             llm_provider=llm_provider,
-            pdf_generator=pdf_generator
+            pdf_generator=pdf_generator,
+            layout=layout
         )
         
         # Exécuter le use case (orchestration complète)
-        output = use_case.execute(input_data, current_user)
+        output = await use_case.execute(input_data, current_user)
         
-        # Retourner la réponse
-        return GenerationResponse(
+        # Retourner la réponse (mémorisée pour un éventuel rejeu)
+        response = GenerationResponse(
             status="success",
             file_id=output.letter_id,
             download_url=output.download_url,
             letter_text=output.letter_text
         )
+        complete_idempotent_request(idempotency_service, current_user.id, idempotency_key, response)
+        completed = True
+        return response
         
     except HTTPException:
         # HTTPException déjà formatée, on la propage
         raise
+    except PdfRenderingBusyError as e:
+        raise HTTPException(status_code=503, detail=e.message)
     except Exception as e:
         logger.error(f"Erreur génération lettre: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Erreur lors de la génération: {str(e)}"
         )
+    finally:
+        if not completed:
+            release_idempotent_request(idempotency_service, current_user.id, idempotency_key)
 
 
 @router.post("/generate-text", response_model=TextGenerationResponse)
 async def generate_text(
     data: TextGenerationRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
     current_user: User = Depends(get_current_user),
-    use_case: GenerateTextUseCase = Depends(get_generate_text_use_case)
+    use_case: GenerateTextUseCase = Depends(get_generate_text_use_case),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ):
     """
     Génère un texte de motivation personnalisé sans PDF.
     
     Args:
         data: Requête avec cv_id, job_url, text_type, llm_provider
+        idempotency_key: Header Idempotency-Key optionnel (rejeu sans double débit)
         current_user: Utilisateur connecté (injecté)
         use_case: Use Case de génération texte (injecté)
+        idempotency_service: Service d'idempotence (injecté)
     
     Returns:
         TextGenerationResponse avec le texte généré
@@ -108,8 +163,18 @@ async def generate_text(
     Raises:
         HTTPException 400: CV non sélectionné ou invalide
         HTTPException 403: Crédits insuffisants
+        HTTPException 409: Requête identique déjà en cours
+        HTTPException 422: Clé d'idempotence réutilisée pour une autre requête
         HTTPException 500: Erreur de génération
     """
+    replay = begin_idempotent_request(
+        idempotency_service, current_user.id, idempotency_key,
+        "generate-text", data.cv_id, data.job_url, data.text_type, data.llm_provider
+    )
+    if replay:
+        return replay
+    
+    completed = False
     try:
         # Préparer l'input du use case
         from domain.use_cases.generate_text import GenerateTextInput
@@ -122,9 +187,12 @@ async def generate_text(
         )
         
         # Exécuter le use case
-        output = use_case.execute(input_data, current_user)
+        output = await use_case.execute(input_data, current_user)
         
-        return TextGenerationResponse(status="success", text=output.text)
+        response = TextGenerationResponse(status="success", text=output.text)
+        complete_idempotent_request(idempotency_service, current_user.id, idempotency_key, response)
+        completed = True
+        return response
         
     except ValueError as e:
         # Erreur de validation (CV, etc.)
@@ -142,52 +210,104 @@ async def generate_text(
     except Exception as e:
         logger.error(f"Erreur génération texte: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if not completed:
+            release_idempotent_request(idempotency_service, current_user.id, idempotency_key)
 
 
 @router.get("/list-letters")
 async def list_letters(
+    per_page: int = HISTORY_PAGINATION_DEFAULT,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    letter_repo: PostgresMotivationalLetterRepository = Depends(get_letter_repository),
-    cv_repo = Depends(get_cv_repository)
+    letter_repo: PostgresMotivationalLetterRepository = Depends(get_letter_repository)
 ):
     """
-    Liste toutes les lettres générées par l'utilisateur.
+    Liste les lettres générées par l'utilisateur (plus récentes d'abord).
     
     Args:
+        per_page: Nombre de lettres par page (max HISTORY_PAGINATION_MAX)
+        cursor: Curseur opaque de la page suivante (next_cursor)
         current_user: Utilisateur connecté (injecté)
         letter_repo: Repository lettres (injecté)
-        cv_repo: Repository CVs (injecté)
     
     Returns:
-        Liste des lettres avec metadata (letter_id, filename, cv_filename, etc.)
+        Liste des lettres avec metadata (letter_id, filename, cv_filename, etc.),
+        count (lettres de cette page) et next_cursor/has_more pour la page suivante
     """
     try:
-        # Récupérer toutes les lettres de l'utilisateur
-        letters = letter_repo.get_by_user_id(current_user.id)
+        # Une requête: lettres + nom du CV, triées et paginées en SQL
+        result = letter_repo.list_summaries(
+            current_user.id,
+            per_page=min(max(per_page, 1), HISTORY_PAGINATION_MAX),
+            cursor=cursor
+        )
         
-        letter_infos = []
-        for letter in letters:
-            # Récupérer le CV associé
-            cv = cv_repo.get_by_id(letter.cv_id) if letter.cv_id else None
-            
-            letter_infos.append({
+        letter_infos = [
+            {
                 "letter_id": letter.id,
                 "filename": letter.filename or "lettre_motivation.pdf",
-                "cv_filename": cv.filename if cv else "CV supprimé",
+                "cv_filename": letter.cv_filename or "CV supprimé",
                 "job_offer_url": letter.job_offer_url or "",
                 "created_at": letter.created_at.isoformat(),
                 "file_size": letter.file_size,
                 "llm_provider": letter.llm_provider
-            })
-        
-        # Trier par date décroissante (plus récent en premier)
-        letter_infos.sort(key=lambda x: x["created_at"], reverse=True)
+            }
+            for letter in result["items"]
+        ]
         
         return {
             "status": "success",
             "letters": letter_infos,
-            "total": len(letter_infos)
+            "count": len(letter_infos),
+            "next_cursor": result["next_cursor"],
+            "has_more": result["has_more"]
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur liste lettres: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération des lettres: {str(e)}")
+
+
+@router.get("/preview-letter/{letter_id}", response_class=HTMLResponse)
+async def preview_letter(
+    letter_id: str,
+    layout: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    letter_repo: PostgresMotivationalLetterRepository = Depends(get_letter_repository),
+    renderer: LetterTemplateRenderer = Depends(get_letter_template_renderer)
+):
+    """
+    Aperçu HTML d'une lettre, sans rendu PDF.
+    
+    Args:
+        letter_id: ID de la lettre
+        layout: Mise en page à prévisualiser (défaut: celle de la lettre)
+        current_user: Utilisateur connecté (injecté)
+        letter_repo: Repository lettres (injecté)
+        renderer: Gabarits compilés (injecté)
+    
+    Returns:
+        Page HTML autonome (CSS incluse)
+    
+    Raises:
+        HTTPException 400: Mise en page inconnue
+        HTTPException 403: Accès interdit
+        HTTPException 404: Lettre introuvable ou sans texte
+    """
+    letter = letter_repo.get_by_id(letter_id)
+    
+    if not letter:
+        raise HTTPException(status_code=404, detail="Lettre non trouvée")
+    
+    if letter.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Accès interdit à cette lettre")
+    
+    if not letter.raw_text:
+        raise HTTPException(status_code=404, detail="Texte de la lettre introuvable")
+    
+    try:
+        return HTMLResponse(renderer.render_html(letter.raw_text, layout or letter.layout))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
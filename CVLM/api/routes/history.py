@@ -1,6 +1,6 @@
 """
 Routes de gestion de l'historique utilisateur
-Endpoints: /user/history, /user/history/stats, /user/history/{id}/download, etc.
+Endpoints: /user/history, /user/history/stats, /user/history/companies, /user/history/{id}/download, etc.
 """
 
 from datetime import datetime
@@ -11,7 +11,13 @@ from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_current_user, get_db
-from api.models.history import HistoryListResponse, HistoryStatsResponse, HistoryTextResponse, HistoryEntryResponse
+from api.models.history import (
+    HistoryListResponse,
+    HistoryStatsResponse,
+    HistoryTextResponse,
+    CompanySuggestionsResponse,
+    history_list_response
+)
 from domain.entities.user import User
 from infrastructure.adapters.postgres_generation_history_repository import PostgresGenerationHistoryRepository
 from domain.services.generation_history_service import GenerationHistoryService
@@ -30,18 +36,26 @@ async def get_user_history(
     search: Optional[str] = None,
     type_filter: Optional[str] = None,
     period: Optional[str] = None,  # '7', '30', '90', 'all'
+    cursor: Optional[str] = None,
+    with_total: bool = True,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Récupère l'historique des générations de l'utilisateur avec pagination.
     
+    Deux modes:
+    - Curseur (recommandé): passer next_cursor de la réponse précédente, coût constant
+    - Page/offset (compatibilité): page et per_page
+    
     Args:
-        page: Numéro de page (défaut 1)
-        per_page: Éléments par page (défaut 50)
+        page: Numéro de page (défaut 1, ignoré si cursor est fourni)
+        per_page: Éléments par page (défaut 50, max HISTORY_PAGINATION_MAX)
         search: Recherche textuelle dans job_title/company_name
         type_filter: Filtre par type (pdf ou text)
         period: Période en jours (7, 30, 90, all)
+        cursor: Curseur opaque de la page suivante
+        with_total: Calculer le total (false pour éviter le comptage)
         current_user: Utilisateur connecté (injecté)
         db: Session de base de données (injectée)
     
@@ -49,6 +63,7 @@ async def get_user_history(
         HistoryListResponse avec items paginés et metadata
     
     Raises:
+        HTTPException 400: Curseur invalide
         HTTPException 500: Erreur serveur
     """
     try:
@@ -69,35 +84,15 @@ async def get_user_history(
             per_page=per_page,
             search=search,
             type_filter=type_filter,
-            period_days=period_days
+            period_days=period_days,
+            cursor=cursor,
+            with_total=with_total
         )
         
-        # Formater les items
-        items = [
-            HistoryEntryResponse(
-                id=item.id,
-                type=item.type,
-                job_title=item.job_title,
-                company_name=item.company_name,
-                job_url=item.job_url,
-                cv_filename=item.cv_filename,
-                status=item.status,
-                created_at=item.created_at.isoformat() if item.created_at else "",
-                is_downloadable=item.is_downloadable(),
-                is_expired=item.is_file_expired(),
-                days_until_expiration=item.days_until_expiration()
-            )
-            for item in result["items"]
-        ]
-        
-        return HistoryListResponse(
-            total=result["total"],
-            page=result["page"],
-            per_page=result["per_page"],
-            pages=result["pages"],
-            items=items
-        )
+        return history_list_response(result)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur récupération historique: {e}")
         raise HTTPException(status_code=500, detail="Erreur lors de la récupération de l'historique")
@@ -142,6 +137,41 @@ async def get_user_history_stats(
         raise HTTPException(status_code=500, detail="Erreur lors de la récupération des statistiques")
 
 
+@router.get("/companies", response_model=CompanySuggestionsResponse)
+async def get_company_suggestions(
+    q: str,
+    limit: int = 10,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Autocomplétion des entreprises présentes dans l'historique de l'utilisateur.
+    
+    Args:
+        q: Début (ou partie) du nom d'entreprise, insensible aux accents
+        limit: Nombre maximum de suggestions (max 50)
+        current_user: Utilisateur connecté (injecté)
+        db: Session de base de données (injectée)
+    
+    Returns:
+        CompanySuggestionsResponse triée par pertinence puis fréquence
+    
+    Raises:
+        HTTPException 500: Erreur serveur
+    """
+    try:
+        history_repo = PostgresGenerationHistoryRepository(db)
+        history_service = GenerationHistoryService(history_repo)
+        
+        return CompanySuggestionsResponse(
+            items=history_service.suggest_companies(current_user.id, q, limit)
+        )
+        
+    except Exception as e:
+        logger.error(f"Erreur autocomplétion entreprises: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la recherche des entreprises")
+
+
 @router.get("/{history_id}/text", response_model=HistoryTextResponse)
 async def get_history_text(
     history_id: str,
@@ -219,7 +249,7 @@ async def delete_history_entry(
         history_repo = PostgresGenerationHistoryRepository(db)
         history_service = GenerationHistoryService(history_repo)
         
-        history_service.delete_entry(history_id, current_user.id)
+        await history_service.delete_entry(history_id, current_user.id)
         
         return {
             "status": "success",
@@ -7,6 +7,12 @@ import os
 # Credits
 DEFAULT_PDF_CREDITS = 10
 DEFAULT_TEXT_CREDITS = 10
+CREDIT_RESERVATION_TIMEOUT_MINUTES = 15  # Réservation non confirmée libérée après ce délai
+
+# Promo Codes
+PROMO_CODE_LENGTH = 8
+PROMO_BULK_MAX_COUNT = 50000  # Nombre max de codes par génération en masse
+PROMO_BULK_INSERT_BATCH_SIZE = 5000
 
 # File Upload Validation
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
@@ -17,10 +23,50 @@ ALLOWED_FILE_EXTENSIONS = [".pdf"]
 HISTORY_PAGINATION_DEFAULT = 50
 HISTORY_PAGINATION_MAX = 100
 
+# Admin dashboard
+ADMIN_STATS_CACHE_TTL_SECONDS = 60  # Statistiques agrégées recalculées au plus une fois par minute
+ADMIN_STATS_SERIES_DAYS = 30  # Profondeur des séries temporelles du dashboard
+ADMIN_USERS_PAGINATION_DEFAULT = 50
+ADMIN_USERS_PAGINATION_MAX = 200
+ADMIN_USERS_EXPORT_BATCH_SIZE = 1000  # Utilisateurs chargés par lot pendant un export
+
+# Idempotency (rejeu des requêtes de génération/upload)
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+IDEMPOTENCY_PENDING_TIMEOUT_SECONDS = 600  # Requête en cours considérée abandonnée après 10 min
+
 # File Storage
+FILE_CLEANUP_BATCH_SIZE = 1000  # Entrées expirées verrouillées par transaction
+FILE_CLEANUP_WORKERS = 8  # Suppressions de fichiers en parallèle
 FILE_STORAGE_BASE_PATH = os.getenv("FILE_STORAGE_BASE_PATH", "data/files")
+FILE_STORAGE_LOCAL = "local"  # Répertoires plats cvs/ et letters/
+FILE_STORAGE_SHARDED = "sharded"  # Objets adressés par sha256, dédupliqués (après migrate_file_storage)
+FILE_STORAGE_S3 = "s3"  # Stockage objet partagé entre nœuds (S3 ou compatible)
+FILE_STORAGE_BACKEND = os.getenv("FILE_STORAGE_BACKEND", FILE_STORAGE_LOCAL)
+FILE_STORAGE_PATH_CACHE_SIZE = 10000  # Fichiers dont le hash est gardé en mémoire (références, ETags)
+FILE_STORAGE_IO_WORKERS = int(os.getenv("FILE_STORAGE_IO_WORKERS", "16"))  # Threads dédiés aux I/O fichiers
+
+# Téléchargements (ETag, 304, cache navigateur)
+DOWNLOAD_CACHE_MAX_AGE_SECONDS = 300  # Revalidation par ETag au-delà (304 si inchangé)
+DOWNLOAD_RESOLVE_CACHE_TTL_SECONDS = 60  # Propriété + chemin d'un téléchargement gardés en mémoire
+DOWNLOAD_RESOLVE_CACHE_SIZE = 10000
+
+# Stockage S3 (FILE_STORAGE_BACKEND=s3). S3_ENDPOINT_URL: stockage compatible (moto, MinIO)
+S3_BUCKET = os.getenv("S3_BUCKET", "cvlm-files")
+S3_PREFIX = os.getenv("S3_PREFIX", "")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+# Hôte des URLs présignées vu par le navigateur/l'extension (défaut: S3_ENDPOINT_URL)
+S3_PUBLIC_ENDPOINT_URL = os.getenv("S3_PUBLIC_ENDPOINT_URL") or None
+S3_REGION = os.getenv("S3_REGION") or None
+S3_CREATE_BUCKET = os.getenv("S3_CREATE_BUCKET", "false").lower() == "true"  # Stand-in local uniquement
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))  # >= FILE_STORAGE_IO_WORKERS
+S3_MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+S3_MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+S3_PRESIGNED_DOWNLOADS = os.getenv("S3_PRESIGNED_DOWNLOADS", "true").lower() == "true"
+S3_PRESIGNED_URL_TTL_SECONDS = int(os.getenv("S3_PRESIGNED_URL_TTL_SECONDS", "300"))
+S3_STREAM_CHUNK_BYTES = 64 * 1024
 TEMP_DIR = Path("data/temp")
-OUTPUT_DIR = Path("data/output")
 
 # LLM Providers
 LLM_PROVIDER_OPENAI = "openai"
@@ -29,6 +75,17 @@ LLM_PROVIDER_GEMINI = "gemini"
 # PDF Generators
 PDF_GENERATOR_FPDF = "fpdf"
 PDF_GENERATOR_WEASYPRINT = "weasyprint"
+PDF_RENDERING_LAZY = "lazy"  # PDF rendu au premier téléchargement
+PDF_RENDERING_EAGER = "eager"  # PDF rendu pendant la génération
+PDF_RENDERING_MODE = os.getenv("PDF_RENDERING_MODE", PDF_RENDERING_LAZY)
+LETTER_LAYOUTS = ("classic", "modern", "compact")  # Gabarits HTML (infrastructure/templates/letters)
+LETTER_LAYOUT_DEFAULT = "classic"
+PDF_RENDER_CACHE_DIR = os.getenv("PDF_RENDER_CACHE_DIR", "data/cache/pdf")
+PDF_RENDER_CACHE_MAX_BYTES = int(os.getenv("PDF_RENDER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+WEASYPRINT_POOL_WORKERS = int(os.getenv("WEASYPRINT_POOL_WORKERS", str(min(os.cpu_count() or 1, 4))))
+WEASYPRINT_POOL_QUEUE_SIZE = int(os.getenv("WEASYPRINT_POOL_QUEUE_SIZE", "16"))  # Rendus en attente au-delà des workers occupés
+WEASYPRINT_QUEUE_TIMEOUT_SECONDS = 5  # Attente max d'une place dans la file avant de refuser
+WEASYPRINT_RENDER_TIMEOUT_SECONDS = 30  # Rendu interrompu (worker recyclé) au-delà
 
 # Text Generation Types
 TEXT_TYPE_WHY_JOIN = "why_join"
@@ -0,0 +1,29 @@
+"""
+Entité CreditReservation - Crédit réservé pendant une génération
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class CreditReservation:
+    """
+    Crédit retiré du solde au démarrage d'une génération
+    Confirmé (commit) en cas de succès, restitué (release) en cas d'échec ou d'expiration
+    """
+    id: str
+    user_id: str
+    credit_type: str  # 'pdf' ou 'text'
+    status: str = 'reserved'  # 'reserved', 'committed', 'released', 'expired'
+    balance_after: Optional[int] = None  # Solde restant après réservation
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.now()
+    
+    def is_pending(self) -> bool:
+        """Vérifie si la réservation attend encore sa confirmation"""
+        return self.status == 'reserved'
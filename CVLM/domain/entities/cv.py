@@ -22,3 +22,15 @@ class Cv:
             self.created_at = datetime.now()
         if self.updated_at is None:
             self.updated_at = datetime.now()
+
+
+@dataclass
+class CvSummary:
+    """
+    Projection légère d'un CV pour les listes (sans raw_text)
+    """
+    id: str
+    filename: str
+    file_path: str
+    file_size: int
+    created_at: datetime
@@ -24,7 +24,9 @@ class GenerationHistory:
     # Informations sur la génération
     cv_filename: Optional[str] = None
     cv_id: Optional[str] = None
-    file_path: Optional[str] = None  # Chemin du PDF (NULL si expiré)
+    llm_provider: Optional[str] = None  # 'openai', 'gemini'
+    file_path: Optional[str] = None  # Chemin du PDF (NULL si expiré ou pas encore rendu)
+    letter_id: Optional[str] = None  # Lettre source (PDF re-rendu à la demande)
     text_content: Optional[str] = None  # Contenu texte si type='text'
     
     # Statut
@@ -42,12 +44,12 @@ class GenerationHistory:
         return datetime.now() > self.file_expires_at
     
     def is_downloadable(self) -> bool:
-        """Vérifie si le fichier est téléchargeable"""
-        return (
-            self.type == 'pdf' and 
-            self.file_path is not None and 
-            not self.is_file_expired()
-        )
+        """Vérifie si le fichier est téléchargeable (toujours, s'il peut être re-rendu depuis la lettre)"""
+        if self.type != 'pdf':
+            return False
+        if self.letter_id is not None:
+            return True
+        return self.file_path is not None and not self.is_file_expired()
     
     def days_until_expiration(self) -> Optional[int]:
         """Retourne le nombre de jours avant expiration (si applicable)"""
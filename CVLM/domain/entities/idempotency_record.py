@@ -0,0 +1,35 @@
+"""
+Entité IdempotencyRecord - Réponse mémorisée pour une clé d'idempotence
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class IdempotencyRecord:
+    """
+    Trace d'une requête envoyée avec un header Idempotency-Key
+    Permet de rejouer la réponse d'origine si le client renvoie la même requête
+    """
+    key: str
+    user_id: str
+    endpoint: str
+    request_hash: str  # Empreinte SHA-256 des paramètres de la requête
+    status: str = 'pending'  # 'pending' ou 'completed'
+    status_code: Optional[int] = None
+    response_body: Optional[str] = None  # Réponse JSON sérialisée
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.now()
+
+    def is_completed(self) -> bool:
+        """Vérifie si la réponse d'origine a été mémorisée"""
+        return self.status == 'completed' and self.response_body is not None
+
+    def is_expired(self) -> bool:
+        """Vérifie si la clé a dépassé sa durée de rétention"""
+        return self.expires_at is not None and datetime.now() > self.expires_at
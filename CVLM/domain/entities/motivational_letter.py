@@ -13,10 +13,12 @@ class MotivationalLetter:
     cv_id: Optional[str] = None  # Référence au CV utilisé
     job_offer_url: Optional[str] = None
     filename: str = ""
-    file_path: str = ""  # Chemin de stockage du fichier PDF
+    file_path: str = ""  # Chemin de stockage du fichier PDF ("" tant que non rendu)
     file_size: int = 0
     raw_text: str = ""  # Texte extrait de la lettre
     llm_provider: str = "openai"  # openai, gemini, etc.
+    pdf_generator: str = "fpdf"  # fpdf, weasyprint (utilisé au rendu du PDF)
+    layout: str = "classic"  # Gabarit HTML: classic, modern, compact
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -25,3 +27,18 @@ class MotivationalLetter:
             self.created_at = datetime.now()
         if self.updated_at is None:
             self.updated_at = datetime.now()
+
+
+@dataclass
+class LetterSummary:
+    """
+    Projection légère d'une lettre pour les listes (sans raw_text)
+    """
+    id: str
+    cv_id: Optional[str]
+    job_offer_url: Optional[str]
+    filename: str
+    file_size: int
+    llm_provider: str
+    created_at: datetime
+    cv_filename: Optional[str] = None  # None si le CV a été supprimé
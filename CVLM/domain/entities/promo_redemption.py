@@ -0,0 +1,22 @@
+"""
+Entité PromoRedemption - Utilisation d'un code promo par un utilisateur
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class PromoRedemption:
+    """Résultat d'une utilisation de code promo (un seul usage par utilisateur)"""
+    code: str
+    user_id: str
+    pdf_credits_added: int
+    text_credits_added: int
+    new_pdf_credits: int  # Solde après ajout
+    new_text_credits: int
+    redeemed_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        if self.redeemed_at is None:
+            self.redeemed_at = datetime.utcnow()
@@ -51,3 +51,20 @@ class User:
             self.text_credits -= 1
             return True
         return False
+
+
+USER_LIST_SORTS = ('created_desc', 'created_asc', 'email')
+
+
+@dataclass
+class UserListFilters:
+    """
+    Filtres et tri de la liste des utilisateurs (administration)
+    sort: 'created_desc' (défaut), 'created_asc' ou 'email'
+    """
+    email_prefix: Optional[str] = None
+    is_admin: Optional[bool] = None
+    zero_credits: bool = False  # Aucun crédit PDF ni texte restant
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    sort: str = 'created_desc'
@@ -70,9 +70,40 @@ class PromoCodeMaxUsesReachedError(PromoCodeError):
         super().__init__(self.message)
 
 
+class PromoCodeAlreadyUsedError(PromoCodeError):
+    """Code promo déjà utilisé par cet utilisateur"""
+    def __init__(self, code: str):
+        self.code = code
+        self.message = f"Vous avez déjà utilisé le code promo '{code}'"
+        super().__init__(self.message)
+
+
 class GenerationError(CVLMBusinessError):
     """Erreur lors de la génération de contenu"""
     def __init__(self, generation_type: str, message: str):
         self.generation_type = generation_type
         self.message = f"Erreur génération {generation_type}: {message}"
         super().__init__(self.message)
+
+
+class PdfRenderingBusyError(CVLMBusinessError):
+    """File de rendu PDF saturée"""
+    def __init__(self):
+        self.message = "Le service de rendu PDF est saturé, veuillez réessayer dans quelques instants"
+        super().__init__(self.message)
+
+
+class IdempotencyKeyConflictError(CVLMBusinessError):
+    """Une requête avec la même clé d'idempotence est déjà en cours"""
+    def __init__(self, key: str):
+        self.key = key
+        self.message = f"Une requête avec la clé d'idempotence '{key}' est déjà en cours de traitement"
+        super().__init__(self.message)
+
+
+class IdempotencyKeyMismatchError(CVLMBusinessError):
+    """Clé d'idempotence réutilisée avec une requête différente"""
+    def __init__(self, key: str):
+        self.key = key
+        self.message = f"La clé d'idempotence '{key}' a déjà été utilisée pour une requête différente"
+        super().__init__(self.message)
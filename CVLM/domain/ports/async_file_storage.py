@@ -0,0 +1,94 @@
+"""
+Port asynchrone pour le stockage des fichiers (PDFs)
+Utilisé depuis les routes async: les I/O disque ne bloquent pas la boucle d'événements
+"""
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+
+class AsyncFileStorage(ABC):
+    """
+    Variante asynchrone de FileStorage (mêmes chemins, mêmes conventions)
+    """
+
+    @abstractmethod
+    async def save_file(self, file_content: bytes, filename: str, subfolder: str = "") -> str:
+        """Sauvegarde un fichier et retourne son chemin/URL"""
+        pass
+
+    @abstractmethod
+    async def get_file(self, file_path: str) -> Optional[bytes]:
+        """Contenu d'un fichier, ou None si non trouvé"""
+        pass
+
+    @abstractmethod
+    async def delete_file(self, file_path: str) -> bool:
+        """Supprime un fichier, True si suppression réussie"""
+        pass
+
+    @abstractmethod
+    async def file_exists(self, file_path: str) -> bool:
+        """Vérifie si un fichier existe (chemin relatif au stockage)"""
+        pass
+
+    @abstractmethod
+    async def path_exists(self, path: str) -> bool:
+        """Vérifie si un chemin retourné par save_cv/save_letter existe encore"""
+        pass
+
+    @abstractmethod
+    async def delete_path(self, path: str) -> bool:
+        """Supprime un fichier désigné par un chemin retourné par save_cv/save_letter"""
+        pass
+
+    @abstractmethod
+    async def get_etag(self, path: str) -> Optional[str]:
+        """ETag fort dérivé du contenu, ou None si le fichier n'existe pas"""
+        pass
+
+    @abstractmethod
+    async def get_download_url(self, path: str, filename: str) -> Optional[str]:
+        """URL de téléchargement direct (hors API), ou None si servi par l'API"""
+        pass
+
+    @abstractmethod
+    async def stream_file(self, path: str) -> Optional[AsyncIterator[bytes]]:
+        """Contenu d'un fichier distant par morceaux, ou None si le chemin est local"""
+        pass
+
+    @abstractmethod
+    async def get_file_size(self, file_path: str) -> Optional[int]:
+        """Taille en bytes, ou None si fichier non trouvé"""
+        pass
+
+    # === CVs et lettres ===
+
+    @abstractmethod
+    async def save_cv(self, cv_id: str, content: bytes, filename: str) -> str:
+        """Sauvegarde un CV et retourne son chemin"""
+        pass
+
+    @abstractmethod
+    async def get_cv_path(self, cv_id: str) -> Optional[str]:
+        """Chemin d'un CV, ou None si inexistant"""
+        pass
+
+    @abstractmethod
+    async def delete_cv(self, cv_id: str) -> bool:
+        """Supprime un CV, True si supprimé"""
+        pass
+
+    @abstractmethod
+    async def save_letter(self, letter_id: str, content: bytes, filename: str) -> str:
+        """Sauvegarde une lettre de motivation et retourne son chemin"""
+        pass
+
+    @abstractmethod
+    async def get_letter_path(self, letter_id: str) -> Optional[str]:
+        """Chemin d'une lettre, ou None si inexistant"""
+        pass
+
+    @abstractmethod
+    async def delete_letter(self, letter_id: str) -> bool:
+        """Supprime une lettre, True si supprimée"""
+        pass
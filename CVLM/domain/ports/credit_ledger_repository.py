@@ -0,0 +1,42 @@
+"""
+Port (interface) pour le journal et les réservations de crédits
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+from domain.entities.credit_reservation import CreditReservation
+
+
+class CreditLedgerRepository(ABC):
+    """Interface pour réserver, confirmer et restituer des crédits"""
+    
+    @abstractmethod
+    def reserve(self, user_id: str, credit_type: str, expires_at: datetime) -> Optional[CreditReservation]:
+        """
+        Réserve un crédit (décrément conditionnel + réservation + journal, une transaction)
+        Retourne None si l'utilisateur n'a plus de crédit disponible
+        """
+        pass
+    
+    @abstractmethod
+    def commit(self, reservation_id: str) -> bool:
+        """Confirme une réservation. Retourne False si elle n'est plus en attente"""
+        pass
+    
+    @abstractmethod
+    def release(self, reservation_id: str, reason: str = 'release') -> Optional[int]:
+        """
+        Restitue le crédit d'une réservation en attente
+        Retourne le nouveau solde, ou None si la réservation n'est plus en attente
+        """
+        pass
+    
+    @abstractmethod
+    def release_expired(self, now: datetime, user_id: Optional[str] = None) -> int:
+        """Restitue les réservations expirées (optionnellement pour un seul utilisateur)"""
+        pass
+    
+    @abstractmethod
+    def take_snapshots(self) -> int:
+        """Enregistre un snapshot du solde de chaque utilisateur, retourne le nombre de lignes"""
+        pass
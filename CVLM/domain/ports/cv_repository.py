@@ -3,7 +3,7 @@ Port pour la gestion des CVs
 """
 from abc import ABC, abstractmethod
 from typing import Optional, List
-from domain.entities.cv import Cv
+from domain.entities.cv import Cv, CvSummary
 
 
 class CvRepository(ABC):
@@ -26,6 +26,11 @@ class CvRepository(ABC):
         """Récupère tous les CVs d'un utilisateur"""
         pass
     
+    @abstractmethod
+    def list_summaries(self, user_id: str) -> List[CvSummary]:
+        """Liste les CVs d'un utilisateur sans leur texte (affichage en liste)"""
+        pass
+    
     @abstractmethod
     def update(self, cv: Cv) -> Cv:
         """Met à jour un CV"""
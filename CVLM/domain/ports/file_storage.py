@@ -1,8 +1,9 @@
 """
 Port pour le stockage des fichiers (PDFs)
 """
+import os
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 from pathlib import Path
 
 
@@ -78,3 +79,78 @@ class FileStorage(ABC):
             Taille en bytes, ou None si fichier non trouvé
         """
         pass
+    
+    # === CVs et lettres (chemins retournés utilisables tels quels par FileResponse) ===
+    
+    @abstractmethod
+    def save_cv(self, cv_id: str, content: bytes, filename: str) -> str:
+        """Sauvegarde un CV et retourne son chemin"""
+        pass
+    
+    @abstractmethod
+    def get_cv_path(self, cv_id: str) -> Optional[str]:
+        """Chemin d'un CV, ou None si inexistant"""
+        pass
+    
+    @abstractmethod
+    def delete_cv(self, cv_id: str) -> bool:
+        """Supprime un CV, True si supprimé"""
+        pass
+    
+    @abstractmethod
+    def save_letter(self, letter_id: str, content: bytes, filename: str) -> str:
+        """Sauvegarde une lettre de motivation et retourne son chemin"""
+        pass
+    
+    @abstractmethod
+    def get_letter_path(self, letter_id: str) -> Optional[str]:
+        """Chemin d'une lettre, ou None si inexistant"""
+        pass
+    
+    @abstractmethod
+    def delete_letter(self, letter_id: str) -> bool:
+        """Supprime une lettre, True si supprimée"""
+        pass
+    
+    # === Chemins retournés par save_cv/save_letter (stockés en base) ===
+    # Par défaut des chemins locaux; un stockage distant (S3) les surcharge
+    
+    def path_exists(self, path: str) -> bool:
+        """Vérifie qu'un chemin retourné par save_cv/save_letter existe encore"""
+        return os.path.exists(path)
+    
+    def delete_path(self, path: str) -> bool:
+        """
+        Supprime le fichier d'un chemin retourné par save_cv/save_letter
+        
+        Returns:
+            True si supprimé, False si déjà absent
+        
+        Raises:
+            OSError: Suppression impossible
+        """
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def get_etag(self, path: str) -> Optional[str]:
+        """
+        ETag fort (entre guillemets) dérivé du contenu, ou None si le fichier
+        n'existe pas ou si le stockage n'en fournit pas
+        """
+        return None
+    
+    def get_download_url(self, path: str, filename: str) -> Optional[str]:
+        """
+        URL de téléchargement direct (hors API), ou None si le fichier est servi par l'API
+        """
+        return None
+    
+    def stream_file(self, path: str, chunk_size: int = 64 * 1024) -> Optional[Iterator[bytes]]:
+        """
+        Contenu d'un fichier distant par morceaux, ou None si le chemin est local
+        (servi directement depuis le disque)
+        """
+        return None
@@ -3,6 +3,7 @@ Port (interface) pour le repository d'historique des générations
 """
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict
+from datetime import datetime
 from domain.entities.generation_history import GenerationHistory
 
 
@@ -27,11 +28,16 @@ class GenerationHistoryRepository(ABC):
         per_page: int = 50,
         search: Optional[str] = None,
         type_filter: Optional[str] = None,
-        period_days: Optional[int] = None
+        period_days: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+        with_content: bool = False
     ) -> Dict:
         """
         Récupère l'historique d'un utilisateur avec pagination et filtres
-        Retourne: {total, page, per_page, pages, items}
+        Pagination par curseur (keyset) si cursor est fourni, sinon par page
+        text_content/error_message ne sont chargés que si with_content
+        Retourne: {total, page, per_page, pages, next_cursor, has_more, items}
         """
         pass
     
@@ -40,6 +46,26 @@ class GenerationHistoryRepository(ABC):
         """Récupère les statistiques d'un utilisateur"""
         pass
     
+    @abstractmethod
+    def count_all(self) -> int:
+        """Nombre total de générations (tous utilisateurs)"""
+        pass
+    
+    @abstractmethod
+    def get_daily_generation_stats(self, since: datetime) -> List[Dict]:
+        """Générations par jour et par provider depuis une date: [{day, llm_provider, total, success}]"""
+        pass
+    
+    @abstractmethod
+    def get_company_suggestions(self, user_id: str, prefix: str, limit: int = 10) -> List[str]:
+        """Entreprises de l'historique d'un utilisateur correspondant au préfixe, par pertinence"""
+        pass
+    
+    @abstractmethod
+    def rebuild_user_stats(self, user_id: Optional[str] = None) -> int:
+        """Reconstruit les statistiques depuis l'historique (tous les utilisateurs si None)"""
+        pass
+    
     @abstractmethod
     def update(self, history: GenerationHistory) -> GenerationHistory:
         """Met à jour une entrée (pour régénération)"""
@@ -55,12 +81,35 @@ class GenerationHistoryRepository(ABC):
         """Récupère les entrées avec fichiers expirés (pour cleanup)"""
         pass
     
+    @abstractmethod
+    def lock_expired_files(self, limit: int, exclude_ids: Optional[List[str]] = None) -> List[GenerationHistory]:
+        """
+        Verrouille un lot d'entrées à fichier expiré (FOR UPDATE SKIP LOCKED)
+        Les verrous sont tenus jusqu'à clear_file_paths ou rollback
+        """
+        pass
+    
+    @abstractmethod
+    def clear_file_paths(self, history_ids: List[str]) -> int:
+        """Efface file_path des entrées en un UPDATE et valide la transaction du lot"""
+        pass
+    
+    @abstractmethod
+    def rollback(self) -> None:
+        """Annule la transaction en cours (libère les verrous d'un lot)"""
+        pass
+    
     @abstractmethod
     def get_all_with_pagination(
         self,
         page: int = 1,
         per_page: int = 50,
-        user_filter: Optional[str] = None
+        user_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True
     ) -> Dict:
-        """Récupère tout l'historique (admin) avec pagination"""
+        """
+        Récupère tout l'historique (admin) avec pagination
+        Retourne en plus total_is_estimate (total global estimé)
+        """
         pass
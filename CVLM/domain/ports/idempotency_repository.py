@@ -0,0 +1,39 @@
+"""
+Port (interface) pour le repository des clés d'idempotence
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+from domain.entities.idempotency_record import IdempotencyRecord
+
+
+class IdempotencyRepository(ABC):
+    """Interface pour la persistance des réponses idempotentes"""
+
+    @abstractmethod
+    def create_pending(self, record: IdempotencyRecord) -> bool:
+        """
+        Réserve une clé (statut 'pending')
+        Retourne False si la clé existe déjà pour cet utilisateur
+        """
+        pass
+
+    @abstractmethod
+    def get(self, user_id: str, key: str) -> Optional[IdempotencyRecord]:
+        """Récupère l'enregistrement d'une clé"""
+        pass
+
+    @abstractmethod
+    def mark_completed(self, user_id: str, key: str, status_code: int, response_body: str) -> None:
+        """Mémorise la réponse finale associée à la clé"""
+        pass
+
+    @abstractmethod
+    def delete(self, user_id: str, key: str) -> None:
+        """Libère une clé (échec ou expiration)"""
+        pass
+
+    @abstractmethod
+    def delete_expired(self, now: datetime) -> int:
+        """Supprime les clés expirées, retourne le nombre supprimé"""
+        pass
@@ -2,7 +2,7 @@
 Port pour la gestion des lettres de motivation
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict
 from domain.entities.motivational_letter import MotivationalLetter
 
 
@@ -26,6 +26,15 @@ class MotivationalLetterRepository(ABC):
         """Récupère toutes les lettres d'un utilisateur"""
         pass
     
+    @abstractmethod
+    def list_summaries(self, user_id: str, per_page: int = 50, cursor: Optional[str] = None) -> Dict:
+        """
+        Liste paginée (plus récentes d'abord) des lettres d'un utilisateur,
+        sans leur texte, avec le nom du CV associé
+        Retourne: {items: List[LetterSummary], next_cursor, has_more}
+        """
+        pass
+    
     @abstractmethod
     def get_by_cv_id(self, cv_id: str) -> List[MotivationalLetter]:
         """Récupère toutes les lettres générées à partir d'un CV"""
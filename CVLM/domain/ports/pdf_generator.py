@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import BinaryIO, Protocol
 
 
 class Document(Protocol):
@@ -10,6 +11,25 @@ class Document(Protocol):
 class PdfGenerator(ABC):
     """Interface pour générer des PDFs à partir de documents"""
     
+    # Identifient le rendu dans le cache: changer le gabarit => incrémenter la version
+    name: str = "pdf"
+    template_version: str = "1"
+
     @abstractmethod
-    def create_pdf(self, document: Document, output_path: str) -> str:
+    def render_pdf(self, document: Document) -> bytes:
+        """Génère le PDF en mémoire et retourne son contenu"""
         pass
+
+    async def render_pdf_async(self, document: Document) -> bytes:
+        """Génère le PDF sans bloquer la boucle d'événements (par défaut: render_pdf dans un thread)"""
+        return await asyncio.to_thread(self.render_pdf, document)
+
+    def write_pdf(self, document: Document, sink: BinaryIO) -> None:
+        """Écrit le PDF dans un flux binaire ouvert en écriture"""
+        sink.write(self.render_pdf(document))
+
+    def create_pdf(self, document: Document, output_path: str) -> str:
+        """Écrit le PDF dans un fichier et retourne son chemin"""
+        with open(output_path, 'wb') as f:
+            self.write_pdf(document, f)
+        return output_path
@@ -2,8 +2,9 @@
 Port (interface) pour le repository des codes promo
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Set, Dict
 from domain.entities.promo_code import PromoCode
+from domain.entities.promo_redemption import PromoRedemption
 
 
 class PromoCodeRepository(ABC):
@@ -14,16 +15,34 @@ class PromoCodeRepository(ABC):
         """Crée un nouveau code promo"""
         pass
     
+    @abstractmethod
+    def create_many(self, promo_codes: List[PromoCode]) -> int:
+        """Crée plusieurs codes promo en insertion multi-lignes, retourne le nombre créé"""
+        pass
+    
     @abstractmethod
     def get_by_code(self, code: str) -> Optional[PromoCode]:
         """Récupère un code promo par son code"""
         pass
     
+    @abstractmethod
+    def find_existing_codes(self, codes: List[str]) -> Set[str]:
+        """Retourne les codes de la liste déjà présents en base (une seule requête)"""
+        pass
+    
     @abstractmethod
     def get_all_active(self) -> List[PromoCode]:
         """Récupère tous les codes promo actifs"""
         pass
     
+    @abstractmethod
+    def get_aggregate_stats(self) -> Dict:
+        """
+        Agrégats sur les codes promo en une requête
+        Retourne: {total_promo_codes, active_promo_codes, total_promo_redemptions}
+        """
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[PromoCode]:
         """Récupère tous les codes promo (actifs et inactifs)"""
@@ -34,6 +53,20 @@ class PromoCodeRepository(ABC):
         """Met à jour un code promo"""
         pass
     
+    @abstractmethod
+    def redeem(self, code: str, user_id: str) -> Optional[PromoRedemption]:
+        """
+        Utilise un code promo en une seule transaction
+        (incrément conditionnel du code + trace d'utilisation + ajout des crédits)
+        
+        Returns:
+            PromoRedemption, ou None si le code est inexistant, inactif, expiré ou épuisé
+        
+        Raises:
+            PromoCodeAlreadyUsedError: Si l'utilisateur a déjà utilisé ce code
+        """
+        pass
+    
     @abstractmethod
     def delete(self, code: str) -> None:
         """Supprime un code promo"""
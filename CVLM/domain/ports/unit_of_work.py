@@ -0,0 +1,43 @@
+"""
+Port (interface) pour l'unité de travail transactionnelle
+"""
+from abc import ABC, abstractmethod
+
+
+class UnitOfWork(ABC):
+    """
+    Regroupe les écritures de plusieurs repositories dans une seule transaction
+
+    Usage:
+        with unit_of_work:
+            letter_repo.create(...)
+            history_service.record_generation(...)
+        # un seul COMMIT à la sortie du bloc, ROLLBACK si exception
+
+    Les blocs imbriqués sont absorbés par le bloc le plus externe.
+    """
+
+    def __enter__(self) -> "UnitOfWork":
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    @abstractmethod
+    def begin(self) -> None:
+        """Ouvre l'unité de travail: les commits des repositories sont différés"""
+        pass
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Valide toutes les écritures de l'unité de travail"""
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """Annule toutes les écritures de l'unité de travail"""
+        pass
@@ -2,8 +2,9 @@
 Port pour la gestion des utilisateurs
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from domain.entities.user import User
+from typing import Optional, List, Dict, Iterator
+from datetime import datetime
+from domain.entities.user import User, UserListFilters
 
 
 class UserRepository(ABC):
@@ -36,6 +37,14 @@ class UserRepository(ABC):
         """Met à jour un utilisateur"""
         pass
     
+    @abstractmethod
+    def decrement_credit(self, user_id: str, credit_type: str) -> Optional[int]:
+        """
+        Décrémente atomiquement un crédit ('pdf' ou 'text')
+        Retourne le solde restant, ou None si aucun crédit disponible
+        """
+        pass
+    
     @abstractmethod
     def delete(self, user_id: str) -> bool:
         """Supprime un utilisateur"""
@@ -50,3 +59,29 @@ class UserRepository(ABC):
     def get_all(self) -> List[User]:
         """Récupère tous les utilisateurs (alias de list_all)"""
         pass
+    
+    @abstractmethod
+    def get_aggregate_stats(self) -> Dict:
+        """
+        Agrégats sur tous les utilisateurs en une requête
+        Retourne: {total_users, total_admins, total_pdf_credits, total_text_credits}
+        """
+        pass
+    
+    @abstractmethod
+    def count_signups_per_day(self, since: datetime) -> List[Dict]:
+        """Inscriptions par jour depuis une date: [{day, count}]"""
+        pass
+    
+    @abstractmethod
+    def list_page(self, filters: UserListFilters, per_page: int = 50, cursor: Optional[str] = None) -> Dict:
+        """
+        Page d'utilisateurs filtrée et triée (pagination par curseur)
+        Retourne: {items: List[User], next_cursor, has_more}
+        """
+        pass
+    
+    @abstractmethod
+    def iter_all(self, filters: UserListFilters, batch_size: int = 1000) -> Iterator[User]:
+        """Parcourt tous les utilisateurs filtrés par lots (mémoire bornée, export)"""
+        pass
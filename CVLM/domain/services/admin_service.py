@@ -1,23 +1,41 @@
 """
 Service d'administration pour gérer les utilisateurs et codes promo
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from datetime import datetime, timedelta
-from domain.entities.user import User
+from cachetools import TTLCache
+from domain.entities.user import User, UserListFilters
 from domain.entities.promo_code import PromoCode
 from domain.ports.user_repository import UserRepository
 from domain.ports.promo_code_repository import PromoCodeRepository
+from domain.ports.generation_history_repository import GenerationHistoryRepository
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import (
+    ADMIN_STATS_CACHE_TTL_SECONDS,
+    ADMIN_STATS_SERIES_DAYS,
+    ADMIN_USERS_PAGINATION_DEFAULT,
+    ADMIN_USERS_PAGINATION_MAX,
+    ADMIN_USERS_EXPORT_BATCH_SIZE
+)
 
 logger = setup_logger(__name__)
 
+# Cache partagé par le processus (AdminService est instancié à chaque requête)
+_dashboard_cache = TTLCache(maxsize=1, ttl=ADMIN_STATS_CACHE_TTL_SECONDS)
+
 
 class AdminService:
     """Service pour les opérations d'administration"""
     
-    def __init__(self, user_repo: UserRepository, promo_code_repo: PromoCodeRepository):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        promo_code_repo: PromoCodeRepository,
+        history_repo: Optional[GenerationHistoryRepository] = None
+    ):
         self.user_repo = user_repo
         self.promo_code_repo = promo_code_repo
+        self.history_repo = history_repo
     
     # === Gestion des utilisateurs ===
     
@@ -26,6 +44,25 @@ class AdminService:
         logger.info("Récupération de tous les utilisateurs")
         return self.user_repo.get_all()
     
+    def list_users(
+        self,
+        filters: UserListFilters,
+        per_page: int = ADMIN_USERS_PAGINATION_DEFAULT,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        Page d'utilisateurs filtrée (pagination par curseur)
+        
+        Raises:
+            ValueError: Curseur ou tri invalide
+        """
+        per_page = min(max(per_page, 1), ADMIN_USERS_PAGINATION_MAX)
+        return self.user_repo.list_page(filters, per_page=per_page, cursor=cursor)
+    
+    def iter_users(self, filters: UserListFilters) -> Iterator[User]:
+        """Tous les utilisateurs filtrés, chargés par lots (export)"""
+        return self.user_repo.iter_all(filters, batch_size=ADMIN_USERS_EXPORT_BATCH_SIZE)
+    
     def promote_to_admin(self, user_id: str) -> User:
         """Donne les droits admin à un utilisateur"""
         user = self.user_repo.get_by_id(user_id)
@@ -34,6 +71,7 @@ class AdminService:
         
         user.is_admin = True
         self.user_repo.update(user)
+        _dashboard_cache.clear()
         logger.info(f"Utilisateur {user.email} promu admin")
         return user
     
@@ -45,6 +83,7 @@ class AdminService:
         
         user.is_admin = False
         self.user_repo.update(user)
+        _dashboard_cache.clear()
         logger.info(f"Droits admin retirés pour {user.email}")
         return user
     
@@ -57,6 +96,7 @@ class AdminService:
         user.pdf_credits += pdf_credits
         user.text_credits += text_credits
         self.user_repo.update(user)
+        _dashboard_cache.clear()
         logger.info(f"Crédits ajoutés à {user.email}: +{pdf_credits} PDF, +{text_credits} texte")
         return user
     
@@ -69,6 +109,7 @@ class AdminService:
         user.pdf_credits = pdf_credits
         user.text_credits = text_credits
         self.user_repo.update(user)
+        _dashboard_cache.clear()
         logger.info(f"Crédits définis pour {user.email}: {pdf_credits} PDF, {text_credits} texte")
         return user
     
@@ -92,6 +133,7 @@ class AdminService:
         
         promo_code.is_active = False
         self.promo_code_repo.update(promo_code)
+        _dashboard_cache.clear()
         logger.info(f"Code promo {code} désactivé")
         return promo_code
     
@@ -103,35 +145,78 @@ class AdminService:
         
         promo_code.is_active = True
         self.promo_code_repo.update(promo_code)
+        _dashboard_cache.clear()
         logger.info(f"Code promo {code} réactivé")
         return promo_code
     
     def delete_promo_code(self, code: str) -> None:
         """Supprime définitivement un code promo"""
         self.promo_code_repo.delete(code.upper())
+        _dashboard_cache.clear()
         logger.info(f"Code promo {code} supprimé")
     
     # === Statistiques ===
     
     def get_dashboard_stats(self) -> Dict:
-        """Récupère les statistiques pour le dashboard admin"""
-        users = self.user_repo.get_all()
-        promo_codes = self.promo_code_repo.get_all()
-        active_promos = self.promo_code_repo.get_all_active()
+        """
+        Récupère les statistiques pour le dashboard admin
         
-        total_pdf_credits = sum(user.pdf_credits for user in users)
-        total_text_credits = sum(user.text_credits for user in users)
-        total_promo_uses = sum(promo.current_uses for promo in promo_codes)
+        Agrégats calculés en SQL (une requête par table) et mis en cache
+        ADMIN_STATS_CACHE_TTL_SECONDS: les ouvertures répétées du panneau admin
+        ne relancent pas les requêtes.
+        """
+        stats = _dashboard_cache.get("stats")
+        if stats is not None:
+            return stats
         
         stats = {
-            "total_users": len(users),
-            "total_admins": sum(1 for user in users if user.is_admin),
-            "total_pdf_credits": total_pdf_credits,
-            "total_text_credits": total_text_credits,
-            "total_promo_codes": len(promo_codes),
-            "active_promo_codes": len(active_promos),
-            "total_promo_redemptions": total_promo_uses,
+            **self.user_repo.get_aggregate_stats(),
+            **self.promo_code_repo.get_aggregate_stats(),
         }
+        stats.update(self._get_generation_stats())
         
-        logger.info(f"Statistiques dashboard: {stats}")
+        _dashboard_cache["stats"] = stats
+        logger.info(
+            f"Statistiques dashboard recalculées: {stats['total_users']} utilisateurs, "
+            f"{stats['total_generations']} générations"
+        )
         return stats
+    
+    def _get_generation_stats(self) -> Dict:
+        """Séries temporelles sur ADMIN_STATS_SERIES_DAYS jours"""
+        since = datetime.combine(
+            datetime.now().date() - timedelta(days=ADMIN_STATS_SERIES_DAYS - 1),
+            datetime.min.time()
+        )
+        
+        signups_per_day = [
+            {"day": row["day"].isoformat(), "count": row["count"]}
+            for row in self.user_repo.count_signups_per_day(since)
+        ]
+        
+        if not self.history_repo:
+            return {
+                "total_generations": 0,
+                "success_rate": 0.0,
+                "signups_per_day": signups_per_day,
+                "generations_per_day": [],
+            }
+        
+        daily = self.history_repo.get_daily_generation_stats(since)
+        total = sum(row["total"] for row in daily)
+        success = sum(row["success"] for row in daily)
+        
+        return {
+            "total_generations": self.history_repo.count_all(),
+            "success_rate": round(success / total * 100, 1) if total > 0 else 0.0,
+            "signups_per_day": signups_per_day,
+            "generations_per_day": [
+                {
+                    "day": row["day"].isoformat(),
+                    "llm_provider": row["llm_provider"],
+                    "total": row["total"],
+                    "success": row["success"],
+                }
+                for row in daily
+            ],
+        }
@@ -1,20 +1,39 @@
 """
 Service de gestion des crédits utilisateur
 """
+from datetime import datetime, timedelta
+from typing import Optional
+
 from domain.entities.user import User
+from domain.entities.credit_reservation import CreditReservation
 from domain.ports.user_repository import UserRepository
+from domain.ports.credit_ledger_repository import CreditLedgerRepository
 from domain.exceptions import InsufficientCreditsError
 from infrastructure.adapters.logger_config import setup_logger
-from config.constants import ERROR_NO_PDF_CREDITS, ERROR_NO_TEXT_CREDITS
+from config.constants import (
+    ERROR_NO_PDF_CREDITS,
+    ERROR_NO_TEXT_CREDITS,
+    CREDIT_RESERVATION_TIMEOUT_MINUTES
+)
 
 logger = setup_logger(__name__)
 
 
 class CreditService:
-    """Service pour gérer les crédits utilisateur"""
+    """
+    Service pour gérer les crédits utilisateur
+    
+    Générations longues (LLM): reserve_credit() au démarrage,
+    commit_reservation() si succès, release_reservation() si échec.
+    """
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        credit_ledger_repository: Optional[CreditLedgerRepository] = None
+    ):
         self.user_repository = user_repository
+        self.credit_ledger_repository = credit_ledger_repository
     
     def has_credits(self, user: User, credit_type: str = "pdf") -> bool:
         """
@@ -46,8 +65,7 @@ class CreditService:
             logger.warning(f"Utilisateur {user.email} sans crédits PDF")
             raise InsufficientCreditsError("PDF", ERROR_NO_PDF_CREDITS)
         
-        user.use_pdf_credit()
-        self.user_repository.update(user)
+        user.pdf_credits = self._decrement(user, "pdf", ERROR_NO_PDF_CREDITS)
         logger.info(f"Crédit PDF utilisé pour {user.email}. Restants: {user.pdf_credits}")
     
     def has_text_credits(self, user: User) -> bool:
@@ -70,9 +88,11 @@ class CreditService:
         
         Args:
             user: Utilisateur dont décompter le crédit
+        
+        Raises:
+            InsufficientCreditsError: Si le solde a été épuisé entre-temps (requête concurrente)
         """
-        user.use_text_credit()
-        self.user_repository.update(user)
+        user.text_credits = self._decrement(user, "text", ERROR_NO_TEXT_CREDITS)
         logger.info(f"Crédit texte déduit pour {user.email}. Restants: {user.text_credits}")
     
     def check_and_use_text_credit(self, user: User) -> None:
@@ -86,8 +106,92 @@ class CreditService:
             logger.warning(f"Utilisateur {user.email} sans crédits texte")
             raise InsufficientCreditsError("text", ERROR_NO_TEXT_CREDITS)
         
-        user.use_text_credit()
-        self.user_repository.update(user)
+        user.text_credits = self._decrement(user, "text", ERROR_NO_TEXT_CREDITS)
         logger.info(f"Crédit texte utilisé pour {user.email}. Restants: {user.text_credits}")
-
-
+    
+    def _decrement(self, user: User, credit_type: str, error_message: str) -> int:
+        """
+        Décrémente le crédit en base (UPDATE conditionnel atomique)
+        
+        Returns:
+            Solde restant lu depuis la base (RETURNING)
+        
+        Raises:
+            InsufficientCreditsError: Si le solde en base est à 0
+        """
+        remaining = self.user_repository.decrement_credit(user.id, credit_type)
+        if remaining is None:
+            logger.warning(f"Utilisateur {user.email} sans crédits {credit_type} (solde en base)")
+            setattr(user, f"{credit_type}_credits", 0)
+            raise InsufficientCreditsError(credit_type, error_message)
+        return remaining
+    
+    # === Réservations (générations longues) ===
+    
+    def reserve_credit(self, user: User, credit_type: str) -> CreditReservation:
+        """
+        Réserve atomiquement un crédit avant une génération
+        
+        Les générations parallèles sur le dernier crédit échouent dès le démarrage
+        (avant l'appel LLM). Les réservations expirées de l'utilisateur sont
+        restituées avant d'abandonner.
+        
+        Raises:
+            InsufficientCreditsError: Si aucun crédit n'est disponible
+        """
+        expires_at = datetime.now() + timedelta(minutes=CREDIT_RESERVATION_TIMEOUT_MINUTES)
+        reservation = self.credit_ledger_repository.reserve(user.id, credit_type, expires_at)
+        
+        if reservation is None and self.credit_ledger_repository.release_expired(datetime.now(), user.id):
+            reservation = self.credit_ledger_repository.reserve(user.id, credit_type, expires_at)
+        
+        if reservation is None:
+            logger.warning(f"Utilisateur {user.email} sans crédits {credit_type} disponibles")
+            setattr(user, f"{credit_type}_credits", 0)
+            error_message = ERROR_NO_PDF_CREDITS if credit_type == "pdf" else ERROR_NO_TEXT_CREDITS
+            raise InsufficientCreditsError(credit_type, error_message)
+        
+        setattr(user, f"{credit_type}_credits", reservation.balance_after)
+        logger.info(f"Crédit {credit_type} réservé pour {user.email}: {reservation.id}")
+        return reservation
+    
+    def commit_reservation(self, reservation: CreditReservation) -> None:
+        """Confirme la consommation d'un crédit réservé (génération réussie)"""
+        if not self.credit_ledger_repository.commit(reservation.id):
+            # Réservation expirée et restituée pendant la génération: on la laisse gratuite
+            logger.warning(f"Réservation {reservation.id} déjà résolue, confirmation ignorée")
+            return
+        reservation.status = 'committed'
+        logger.info(f"Réservation {reservation.id} confirmée")
+    
+    def release_reservation(self, reservation: CreditReservation, user: Optional[User] = None) -> None:
+        """
+        Restitue un crédit réservé (génération échouée)
+        
+        Ne lève jamais: en cas d'erreur, le job de maintenance restituera
+        la réservation à son expiration.
+        """
+        try:
+            balance = self.credit_ledger_repository.release(reservation.id)
+        except Exception as e:
+            logger.error(f"Erreur restitution réservation {reservation.id}: {e}")
+            return
+        
+        if balance is None:
+            return
+        
+        reservation.status = 'released'
+        if user is not None:
+            setattr(user, f"{reservation.credit_type}_credits", balance)
+        logger.info(f"Réservation {reservation.id} restituée. Solde: {balance}")
+    
+    def release_expired_reservations(self) -> int:
+        """
+        Restitue toutes les réservations expirées
+        À appeler via un cron job (infrastructure.jobs.credit_maintenance)
+        """
+        return self.credit_ledger_repository.release_expired(datetime.now())
+    
+    def take_balance_snapshots(self) -> int:
+        """Enregistre un snapshot des soldes (cron job)"""
+        return self.credit_ledger_repository.take_snapshots()
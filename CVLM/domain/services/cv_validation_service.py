@@ -1,12 +1,15 @@
 """
 Service de validation et récupération de CV
 """
-from pathlib import Path
+from typing import Optional
+
 from fastapi import HTTPException
 
 from domain.entities.cv import Cv
 from domain.entities.user import User
 from domain.ports.cv_repository import CvRepository
+from domain.ports.async_file_storage import AsyncFileStorage
+from infrastructure.adapters.file_storage_factory import get_async_file_storage
 from infrastructure.adapters.logger_config import setup_logger
 from config.constants import ERROR_CV_NOT_FOUND, ERROR_CV_FILE_NOT_FOUND, ERROR_CV_ACCESS_DENIED
 
@@ -16,10 +19,12 @@ logger = setup_logger(__name__)
 class CvValidationService:
     """Service pour valider et récupérer les CVs"""
     
-    def __init__(self, cv_repository: CvRepository):
+    def __init__(self, cv_repository: CvRepository, file_storage: Optional[AsyncFileStorage] = None):
         self.cv_repository = cv_repository
+        # Vérification d'existence du fichier hors de la boucle d'événements
+        self.file_storage = file_storage or get_async_file_storage()
     
-    def get_and_validate_cv(self, cv_id: str, user: User) -> Cv:
+    async def get_and_validate_cv(self, cv_id: str, user: User) -> Cv:
         """
         Récupère et valide un CV
         
@@ -44,9 +49,8 @@ class CvValidationService:
             logger.warning(f"Tentative d'accès non autorisé au CV {cv_id} par {user.email}")
             raise HTTPException(status_code=403, detail=ERROR_CV_ACCESS_DENIED)
         
-        cv_path = Path(cv.file_path)
-        if not cv_path.exists():
-            logger.error(f"Fichier CV introuvable: {cv_path}")
+        if not await self.file_storage.path_exists(cv.file_path):
+            logger.error(f"Fichier CV introuvable: {cv.file_path}")
             raise HTTPException(status_code=404, detail=ERROR_CV_FILE_NOT_FOUND)
         
         logger.debug(f"CV validé: {cv_id} pour {user.email}")
@@ -4,6 +4,7 @@ Centralise la logique de nettoyage et formatage des noms de fichiers
 """
 
 from typing import Optional
+from urllib.parse import quote
 
 
 class FilenameBuilder:
@@ -68,6 +69,23 @@ class FilenameBuilder:
         # Phase 4: Ajouter extension
         return f"{filename}.pdf"
     
+    @staticmethod
+    def build_content_disposition(filename: str) -> str:
+        """
+        En-tête Content-Disposition d'un téléchargement (RFC 6266).
+        
+        Le nom peut contenir des accents (entreprise, poste): version ASCII
+        pour les anciens clients, version UTF-8 encodée (filename*) sinon.
+        
+        Args:
+            filename: Nom de fichier propre
+        
+        Returns:
+            Valeur de l'en-tête, ex: attachment; filename="Societe.pdf"; filename*=UTF-8''Soci%C3%A9t%C3%A9.pdf
+        """
+        fallback = filename.encode('ascii', 'ignore').decode('ascii').replace('"', '').replace('\\', '')
+        return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+    
     def _clean_filename(self, filename: str) -> str:
         """
         Nettoie un nom de fichier des caractères problématiques.
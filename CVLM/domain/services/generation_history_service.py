@@ -1,12 +1,16 @@
 """
 Service pour gérer l'historique des générations
 """
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-import os
+from concurrent.futures import ThreadPoolExecutor
 
+from config.constants import HISTORY_PAGINATION_MAX, FILE_CLEANUP_BATCH_SIZE, FILE_CLEANUP_WORKERS
 from domain.entities.generation_history import GenerationHistory
+from domain.ports.async_file_storage import AsyncFileStorage
+from domain.ports.file_storage import FileStorage
 from domain.ports.generation_history_repository import GenerationHistoryRepository
+from infrastructure.adapters.file_storage_factory import get_async_file_storage, get_file_storage
 from infrastructure.adapters.logger_config import setup_logger
 
 logger = setup_logger(__name__)
@@ -15,8 +19,17 @@ logger = setup_logger(__name__)
 class GenerationHistoryService:
     """Service métier pour l'historique des générations"""
     
-    def __init__(self, history_repo: GenerationHistoryRepository):
+    def __init__(
+        self,
+        history_repo: GenerationHistoryRepository,
+        file_storage: Optional[FileStorage] = None,
+        async_file_storage: Optional[AsyncFileStorage] = None
+    ):
         self.history_repo = history_repo
+        # Les fichiers de l'historique sont ceux des lettres: supprimés via leur stockage (local ou S3).
+        # Synchrone pour le cron de nettoyage, asynchrone depuis les routes
+        self.file_storage = file_storage or get_file_storage()
+        self.async_file_storage = async_file_storage or get_async_file_storage()
     
     def record_generation(
         self,
@@ -30,7 +43,9 @@ class GenerationHistoryService:
         file_path: Optional[str] = None,
         text_content: Optional[str] = None,
         status: str = 'success',
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        llm_provider: Optional[str] = None,
+        letter_id: Optional[str] = None
     ) -> GenerationHistory:
         """
         Enregistre une nouvelle génération dans l'historique
@@ -45,7 +60,9 @@ class GenerationHistoryService:
             job_url=job_url,
             cv_filename=cv_filename,
             cv_id=cv_id,
+            llm_provider=llm_provider,
             file_path=file_path,
+            letter_id=letter_id,
             text_content=text_content,
             status=status,
             error_message=error_message,
@@ -64,23 +81,73 @@ class GenerationHistoryService:
         per_page: int = 50,
         search: Optional[str] = None,
         type_filter: Optional[str] = None,
-        period_days: Optional[int] = None
+        period_days: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True
     ) -> Dict:
-        """Récupère l'historique paginé d'un utilisateur"""
+        """
+        Récupère l'historique paginé d'un utilisateur
+        
+        Raises:
+            ValueError: Curseur invalide
+        """
         return self.history_repo.get_user_history(
             user_id=user_id,
-            page=page,
-            per_page=per_page,
+            page=max(page, 1),
+            per_page=self._clamp_per_page(per_page),
             search=search,
             type_filter=type_filter,
-            period_days=period_days
+            period_days=period_days,
+            cursor=cursor,
+            with_total=with_total
         )
     
+    def get_all_history(
+        self,
+        page: int = 1,
+        per_page: int = 50,
+        user_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Dict:
+        """
+        Récupère l'historique global (admin) paginé
+        
+        Raises:
+            ValueError: Curseur invalide
+        """
+        return self.history_repo.get_all_with_pagination(
+            page=max(page, 1),
+            per_page=self._clamp_per_page(per_page),
+            user_filter=user_filter,
+            cursor=cursor,
+            with_total=with_total
+        )
+    
+    @staticmethod
+    def _clamp_per_page(per_page: int) -> int:
+        """Borne la taille de page à HISTORY_PAGINATION_MAX"""
+        return min(max(per_page, 1), HISTORY_PAGINATION_MAX)
+    
     def get_user_stats(self, user_id: str) -> Dict:
         """Récupère les statistiques d'un utilisateur"""
         return self.history_repo.get_user_stats(user_id)
     
-    def delete_entry(self, history_id: str, user_id: str) -> None:
+    def suggest_companies(self, user_id: str, prefix: str, limit: int = 10) -> List[str]:
+        """Autocomplétion des noms d'entreprises de l'historique"""
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        return self.history_repo.get_company_suggestions(user_id, prefix, min(max(limit, 1), 50))
+    
+    def rebuild_stats(self, user_id: Optional[str] = None) -> int:
+        """
+        Reconstruit les statistiques incrémentales depuis l'historique
+        À appeler via un cron job (infrastructure.jobs.rebuild_history_stats)
+        """
+        return self.history_repo.rebuild_user_stats(user_id)
+    
+    async def delete_entry(self, history_id: str, user_id: str) -> None:
         """
         Supprime une entrée de l'historique
         Vérifie que l'entrée appartient bien à l'utilisateur
@@ -94,10 +161,10 @@ class GenerationHistoryService:
             raise PermissionError(f"Accès refusé : cette entrée ne vous appartient pas")
         
         # Supprimer le fichier physique si existe
-        if history.file_path and os.path.exists(history.file_path):
+        if history.file_path:
             try:
-                os.remove(history.file_path)
-                logger.info(f"Fichier supprimé: {history.file_path}")
+                if await self.async_file_storage.delete_path(history.file_path):
+                    logger.info(f"Fichier supprimé: {history.file_path}")
             except Exception as e:
                 logger.warning(f"Erreur suppression fichier: {e}")
         
@@ -130,30 +197,55 @@ class GenerationHistoryService:
         logger.info(f"PDF régénéré pour historique {history_id}")
         return updated
     
-    def cleanup_expired_files(self) -> int:
+    def cleanup_expired_files(
+        self,
+        batch_size: int = FILE_CLEANUP_BATCH_SIZE,
+        max_workers: int = FILE_CLEANUP_WORKERS
+    ) -> int:
         """
-        Nettoie les fichiers expirés (>90 jours)
-        À appeler via un cron job quotidien
+        Nettoie les fichiers expirés (>90 jours) par lots
+        À appeler via un cron job quotidien (infrastructure.jobs.cleanup_expired_files)
+        
+        Chaque lot est verrouillé (SKIP LOCKED), ses fichiers supprimés en parallèle,
+        puis les chemins effacés en un seul UPDATE. Reprenable et exécutable
+        depuis plusieurs nœuds: une entrée traitée n'a plus de file_path.
         """
-        expired_entries = self.history_repo.get_expired_files()
         cleaned = 0
+        failed_ids: List[str] = []
         
-        for entry in expired_entries:
-            if entry.file_path and os.path.exists(entry.file_path):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                entries = self.history_repo.lock_expired_files(batch_size, exclude_ids=failed_ids)
+                if not entries:
+                    break
+                
                 try:
-                    os.remove(entry.file_path)
-                    cleaned += 1
-                    logger.info(f"Fichier expiré supprimé: {entry.file_path}")
-                except Exception as e:
-                    logger.error(f"Erreur suppression {entry.file_path}: {e}")
-            
-            # Mettre à jour l'entrée (garder métadonnées, effacer path)
-            entry.file_path = None
-            self.history_repo.update(entry)
+                    results = list(executor.map(self._remove_file, [entry.file_path for entry in entries]))
+                    done_ids = [entry.id for entry, removed in zip(entries, results) if removed is not None]
+                    failed_ids.extend(entry.id for entry, removed in zip(entries, results) if removed is None)
+                    
+                    # Garder les métadonnées, effacer le chemin (fichier supprimé ou déjà absent)
+                    self.history_repo.clear_file_paths(done_ids)
+                except Exception:
+                    self.history_repo.rollback()
+                    raise
+                
+                cleaned += sum(1 for removed in results if removed)
+                logger.info(f"Cleanup: lot de {len(entries)} entrées traité ({cleaned} fichiers supprimés)")
         
+        if failed_ids:
+            logger.warning(f"Cleanup: {len(failed_ids)} fichiers non supprimés, réessayés au prochain passage")
         logger.info(f"Cleanup terminé: {cleaned} fichiers supprimés")
         return cleaned
     
+    def _remove_file(self, file_path: str) -> Optional[bool]:
+        """True si supprimé, False si déjà absent, None en cas d'erreur"""
+        try:
+            return self.file_storage.delete_path(file_path)
+        except Exception as e:
+            logger.error(f"Erreur suppression {file_path}: {e}")
+            return None
+    
     def export_user_history(self, user_id: str) -> Dict:
         """
         Exporte tout l'historique d'un utilisateur en JSON
@@ -165,14 +257,16 @@ class GenerationHistoryService:
             per_page=10000,  # Tout récupérer
             search=None,
             type_filter=None,
-            period_days=None
+            period_days=None,
+            with_total=False,
+            with_content=True
         )
         
         # Formater pour export
         export_data = {
             "export_date": datetime.now().isoformat(),
             "user_id": user_id,
-            "total_generations": result["total"],
+            "total_generations": len(result["items"]),
             "generations": [
                 {
                     "id": item.id,
@@ -191,5 +285,5 @@ class GenerationHistoryService:
             ]
         }
         
-        logger.info(f"Export historique pour user {user_id}: {result['total']} entrées")
+        logger.info(f"Export historique pour user {user_id}: {len(result['items'])} entrées")
         return export_data
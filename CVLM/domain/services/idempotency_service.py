@@ -0,0 +1,137 @@
+"""
+Service de gestion des clés d'idempotence (header Idempotency-Key)
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+
+from domain.entities.idempotency_record import IdempotencyRecord
+from domain.ports.idempotency_repository import IdempotencyRepository
+from domain.exceptions import IdempotencyKeyConflictError, IdempotencyKeyMismatchError
+from infrastructure.adapters.logger_config import setup_logger
+from config.constants import (
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_KEY_TTL_HOURS,
+    IDEMPOTENCY_PENDING_TIMEOUT_SECONDS
+)
+
+logger = setup_logger(__name__)
+
+
+class IdempotencyService:
+    """
+    Service pour rejouer les réponses des endpoints coûteux.
+
+    Workflow:
+    1. begin(): réserve la clé, ou retourne la réponse mémorisée
+    2. complete(): mémorise la réponse après succès
+    3. release(): libère la clé après échec (le client peut réessayer)
+    """
+
+    def __init__(self, idempotency_repository: IdempotencyRepository):
+        self.idempotency_repo = idempotency_repository
+
+    @staticmethod
+    def compute_request_hash(*parts: Union[str, bytes, None]) -> str:
+        """
+        Calcule l'empreinte des paramètres de la requête
+
+        Permet de détecter la réutilisation d'une clé avec une requête différente.
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if part is None:
+                part = b""
+            elif isinstance(part, str):
+                part = part.encode("utf-8")
+            digest.update(part)
+            digest.update(b"\x1f")  # Séparateur pour éviter les collisions de concaténation
+        return digest.hexdigest()
+
+    def begin(
+        self,
+        user_id: str,
+        key: str,
+        endpoint: str,
+        request_hash: str
+    ) -> Optional[IdempotencyRecord]:
+        """
+        Démarre une requête idempotente
+
+        Returns:
+            L'enregistrement complété à rejouer, ou None si la requête doit être exécutée
+            (la clé est alors réservée pour cet utilisateur)
+
+        Raises:
+            ValueError: Clé vide ou trop longue
+            IdempotencyKeyMismatchError: Clé déjà utilisée pour une autre requête
+            IdempotencyKeyConflictError: Requête identique encore en cours
+        """
+        key = key.strip()
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ValueError(
+                f"Clé d'idempotence invalide (1 à {IDEMPOTENCY_KEY_MAX_LENGTH} caractères)"
+            )
+
+        # Deux tentatives: la seconde après libération d'une clé expirée ou abandonnée
+        for _ in range(2):
+            now = datetime.now()
+            record = IdempotencyRecord(
+                key=key,
+                user_id=user_id,
+                endpoint=endpoint,
+                request_hash=request_hash,
+                created_at=now,
+                expires_at=now + timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+            )
+
+            if self.idempotency_repo.create_pending(record):
+                return None
+
+            existing = self.idempotency_repo.get(user_id, key)
+            if existing is None:
+                continue  # Libérée entre-temps
+
+            if existing.is_expired() or self._is_abandoned(existing):
+                self.idempotency_repo.delete(user_id, key)
+                continue
+
+            if existing.endpoint != endpoint or existing.request_hash != request_hash:
+                logger.warning(f"Clé d'idempotence réutilisée pour une autre requête: user={user_id}")
+                raise IdempotencyKeyMismatchError(key)
+
+            if existing.is_completed():
+                logger.info(f"Rejeu de la réponse mémorisée: user={user_id}, endpoint={endpoint}")
+                return existing
+
+            raise IdempotencyKeyConflictError(key)
+
+        raise IdempotencyKeyConflictError(key)
+
+    def complete(self, user_id: str, key: str, status_code: int, body: Dict) -> None:
+        """Mémorise la réponse d'une requête réussie"""
+        self.idempotency_repo.mark_completed(
+            user_id=user_id,
+            key=key.strip(),
+            status_code=status_code,
+            response_body=json.dumps(body, default=str, separators=(",", ":"))
+        )
+
+    def release(self, user_id: str, key: str) -> None:
+        """Libère la clé après un échec pour autoriser un nouvel essai"""
+        self.idempotency_repo.delete(user_id, key.strip())
+
+    def cleanup_expired(self) -> int:
+        """
+        Supprime les clés expirées
+        À appeler via un cron job (infrastructure.jobs.cleanup_idempotency_keys)
+        """
+        return self.idempotency_repo.delete_expired(datetime.now())
+
+    def _is_abandoned(self, record: IdempotencyRecord) -> bool:
+        """Requête 'pending' trop ancienne (worker arrêté en cours de traitement)"""
+        if record.status != 'pending' or not record.created_at:
+            return False
+        age = datetime.now() - record.created_at
+        return age > timedelta(seconds=IDEMPOTENCY_PENDING_TIMEOUT_SECONDS)
@@ -3,26 +3,26 @@ Service de génération de lettres de motivation
 Encapsule la logique métier complexe
 """
 import uuid
-from pathlib import Path
-from typing import Tuple
+from datetime import datetime
+from typing import Optional, Tuple
 
 from domain.entities.motivational_letter import MotivationalLetter
 from domain.entities.user import User
 from domain.entities.cv import Cv
 
-from infrastructure.adapters.pypdf_parse import PyPdfParser
 from infrastructure.adapters.google_gemini_api import GoogleGeminiLlm
 from infrastructure.adapters.fpdf_generator import FpdfGenerator
 from infrastructure.adapters.welcome_to_jungle_scraper import WelcomeToTheJungleFetcher
 from infrastructure.adapters.open_ai_api import OpenAiLlm
 from infrastructure.adapters.weasyprint_generator import WeasyPrintGenerator
-from infrastructure.adapters.local_file_storage import LocalFileStorage
+from infrastructure.adapters.pdf_render_cache import CachedPdfGenerator, get_pdf_render_cache
+from infrastructure.adapters.file_storage_factory import get_async_file_storage, get_file_io_executor
 from infrastructure.adapters.logger_config import setup_logger
 
 from config.constants import (
     LLM_PROVIDER_GEMINI,
     PDF_GENERATOR_WEASYPRINT,
-    OUTPUT_DIR
+    LETTER_LAYOUT_DEFAULT
 )
 
 logger = setup_logger(__name__)
@@ -32,8 +32,8 @@ class LetterGenerationService:
     """Service pour la génération de lettres de motivation"""
     
     def __init__(self):
-        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        self.file_storage = LocalFileStorage()
+        # I/O fichiers hors de la boucle d'événements (pool de threads dédié)
+        self.file_storage = get_async_file_storage()
     
     def _create_llm_service(self, provider: str):
         """Crée le service LLM approprié"""
@@ -41,38 +41,41 @@ class LetterGenerationService:
             return GoogleGeminiLlm()
         return OpenAiLlm()
     
-    def _create_pdf_generator(self, generator_type: str):
-        """Crée le générateur PDF approprié"""
+    def _create_pdf_generator(self, generator_type: str, layout: str = LETTER_LAYOUT_DEFAULT):
+        """Crée le générateur PDF approprié, derrière le cache de rendus"""
         if generator_type.lower() == PDF_GENERATOR_WEASYPRINT:
-            return WeasyPrintGenerator()
-        return FpdfGenerator()
+            # Rendu soumis au pool de processus WeasyPrint partagé (gabarit HTML)
+            generator = WeasyPrintGenerator(layout=layout)
+        else:
+            # FPDF n'a qu'une mise en page: un seul rendu en cache par texte
+            generator = FpdfGenerator()
+            layout = ""
+        return CachedPdfGenerator(
+            generator, get_pdf_render_cache(), layout=layout, executor=get_file_io_executor()
+        )
     
-    def generate_letter_pdf(
+    def generate_letter_text(
         self,
         cv: Cv,
         job_url: str,
         llm_provider: str,
-        pdf_generator: str,
         user: User
-    ) -> Tuple[str, str, str]:
+    ) -> Tuple[str, str]:
         """
-        Génère une lettre de motivation en PDF
+        Génère le texte d'une lettre de motivation (sans PDF)
         
         Args:
             cv: Entité CV
             job_url: URL de l'offre d'emploi
             llm_provider: Provider LLM (openai/gemini)
-            pdf_generator: Type de générateur PDF (fpdf/weasyprint)
             user: Utilisateur courant
         
         Returns:
-            Tuple (letter_id, file_path, letter_text)
+            Tuple (letter_id, letter_text)
         """
         # Instancier les adapters
-        document_parser = PyPdfParser()
         job_fetcher = WelcomeToTheJungleFetcher()
         llm = self._create_llm_service(llm_provider)
-        pdf_gen = self._create_pdf_generator(pdf_generator)
         
         # === PHASE 1: Extraction CV ===
         cv_text = cv.raw_text  # On a déjà le texte du CV depuis l'entité
@@ -84,20 +87,82 @@ class LetterGenerationService:
         prompt = self._build_letter_prompt(cv_text, job_offer_text)
         letter_text = llm.send_to_llm(prompt)
         
-        # === PHASE 4: Génération PDF ===
         letter_id = str(uuid.uuid4())
-        output_path = OUTPUT_DIR / f"lettre_{letter_id}.pdf"
+        logger.info(f"Lettre générée: {letter_id} pour l'utilisateur {user.email}")
         
-        # Créer l'entité MotivationalLetter temporaire pour le PDF
-        from domain.entities.motivational_letter import MotivationalLetter
-        temp_letter = MotivationalLetter(raw_text=letter_text)
+        return letter_id, letter_text
+    
+    async def generate_letter_pdf(
+        self,
+        cv: Cv,
+        job_url: str,
+        llm_provider: str,
+        pdf_generator: str,
+        user: User,
+        layout: str = LETTER_LAYOUT_DEFAULT
+    ) -> Tuple[str, bytes, str]:
+        """
+        Génère une lettre de motivation en PDF (en mémoire, rien n'est écrit sur disque)
         
-        # Générer le PDF
-        pdf_path = pdf_gen.create_pdf(temp_letter, str(output_path))
+        Args:
+            cv: Entité CV
+            job_url: URL de l'offre d'emploi
+            llm_provider: Provider LLM (openai/gemini)
+            pdf_generator: Type de générateur PDF (fpdf/weasyprint)
+            user: Utilisateur courant
+            layout: Gabarit HTML (WeasyPrint uniquement)
         
-        logger.info(f"Lettre générée: {letter_id} pour l'utilisateur {user.email}")
+        Returns:
+            Tuple (letter_id, pdf_content, letter_text)
+        """
+        letter_id, letter_text = self.generate_letter_text(cv, job_url, llm_provider, user)
         
-        return letter_id, pdf_path, letter_text
+        # === PHASE 4: Génération PDF ===
+        # Rendu en mémoire: le PDF sera écrit une seule fois par le stockage
+        pdf_content = await self.render_pdf(letter_text, pdf_generator, layout)
+        
+        return letter_id, pdf_content, letter_text
+    
+    async def render_pdf(self, letter_text: str, pdf_generator: str, layout: str = LETTER_LAYOUT_DEFAULT) -> bytes:
+        """
+        Rend le texte d'une lettre en PDF (en mémoire), hors de la boucle d'événements:
+        pool de processus WeasyPrint, ou thread pour FPDF
+        """
+        pdf_gen = self._create_pdf_generator(pdf_generator, layout)
+        return await pdf_gen.render_pdf_async(MotivationalLetter(raw_text=letter_text))
+    
+    async def ensure_letter_pdf(self, letter: MotivationalLetter) -> bool:
+        """
+        Rend le PDF d'une lettre s'il n'est pas sur disque (rendu différé,
+        ou fichier supprimé à l'expiration), puis le garde en cache dans le stockage
+        
+        Appelé sur le chemin de téléchargement: le rendu est attendu sans bloquer
+        la boucle d'événements (render_pdf), les autres requêtes continuent d'être servies.
+        Met à jour file_path/file_size de l'entité: à persister par l'appelant.
+        
+        Returns:
+            True si le PDF vient d'être rendu, False s'il existait déjà
+        
+        Raises:
+            ValueError: Lettre sans texte, impossible à rendre
+        """
+        if letter.file_path and await self.file_storage.path_exists(letter.file_path):
+            return False
+        
+        if not letter.raw_text:
+            raise ValueError(f"Lettre {letter.id} sans texte, PDF impossible à rendre")
+        
+        pdf_content = await self.render_pdf(letter.raw_text, letter.pdf_generator, letter.layout)
+        letter.file_path = await self.file_storage.save_letter(
+            letter_id=letter.id,
+            content=pdf_content,
+            filename=letter.filename
+        )
+        letter.file_size = len(pdf_content)
+        letter.updated_at = datetime.now()
+        
+        logger.info(f"PDF de la lettre {letter.id} rendu à la demande: {letter.file_size} bytes")
+        return True
     
     def _build_letter_prompt(self, cv_text: str, job_offer_text: str) -> str:
         """
@@ -134,32 +199,35 @@ adaptée à l'offre d'emploi et au CV ci-dessous.
 🪶 Rédige maintenant la lettre de motivation finale :
         """.strip()
     
-    def save_letter_to_storage(
+    async def save_letter_to_storage(
         self,
         letter_id: str,
-        pdf_path: str,
+        pdf_content: Optional[bytes],
         cv_id: str,
         job_url: str,
         letter_text: str,
         llm_provider: str,
-        user: User
+        user: User,
+        pdf_generator: str = "fpdf",
+        layout: str = LETTER_LAYOUT_DEFAULT
     ) -> MotivationalLetter:
         """
-        Sauvegarde la lettre générée dans le stockage
+        Sauvegarde la lettre générée dans le stockage (unique écriture du PDF)
+        
+        Sans pdf_content (rendu différé), seul le texte est conservé: le PDF
+        sera rendu au premier téléchargement (ensure_letter_pdf).
         
         Returns:
             Entité MotivationalLetter créée
         """
-        # Lire le PDF
-        with open(pdf_path, 'rb') as f:
-            pdf_content = f.read()
-        
-        # Sauvegarder via file storage
-        file_path = self.file_storage.save_letter(
-            letter_id=letter_id,
-            content=pdf_content,
-            filename=f"lettre_{letter_id}.pdf"
-        )
+        file_path = ""
+        if pdf_content is not None:
+            # Sauvegarder via file storage
+            file_path = await self.file_storage.save_letter(
+                letter_id=letter_id,
+                content=pdf_content,
+                filename=f"lettre_{letter_id}.pdf"
+            )
         
         # Créer l'entité
         letter = MotivationalLetter(
@@ -169,12 +237,17 @@ adaptée à l'offre d'emploi et au CV ci-dessous.
             job_offer_url=job_url,
             filename=f"lettre_{letter_id}.pdf",
             file_path=file_path,
-            file_size=len(pdf_content),
+            file_size=len(pdf_content) if pdf_content is not None else 0,
             raw_text=letter_text,
-            llm_provider=llm_provider
+            llm_provider=llm_provider,
+            pdf_generator=pdf_generator,
+            layout=layout
         )
         
-        logger.info(f"Lettre sauvegardée: {letter_id}, taille: {len(pdf_content)} bytes")
+        if pdf_content is not None:
+            logger.info(f"Lettre sauvegardée: {letter_id}, taille: {len(pdf_content)} bytes")
+        else:
+            logger.info(f"Lettre sauvegardée sans PDF (rendu différé): {letter_id}")
         
         return letter
     
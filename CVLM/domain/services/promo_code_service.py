@@ -4,17 +4,25 @@ Service de gestion des codes promotionnels
 import secrets
 import string
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List
 from fastapi import HTTPException
 
 from domain.entities.promo_code import PromoCode
 from domain.entities.user import User
 from domain.ports.promo_code_repository import PromoCodeRepository
 from domain.ports.user_repository import UserRepository
+from domain.exceptions import PromoCodeAlreadyUsedError
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import PROMO_CODE_LENGTH, PROMO_BULK_MAX_COUNT
 
 logger = setup_logger(__name__)
 
+# Lettres majuscules et chiffres (éviter confusion 0/O, 1/I)
+CODE_ALPHABET = (
+    string.ascii_uppercase.replace('O', '').replace('I', '')
+    + string.digits.replace('0', '').replace('1', '')
+)
+
 
 class PromoCodeService:
     """Service pour gérer les codes promotionnels"""
@@ -85,53 +93,138 @@ class PromoCodeService:
         """
         Utilise un code promo pour un utilisateur
         
+        Chemin rapide: une seule transaction (UPDATE conditionnel ... RETURNING),
+        sûre face aux utilisations concurrentes. Le code n'est relu que pour
+        expliquer un refus.
+        
         Args:
             code: Code promo à utiliser
-            user: Utilisateur qui utilise le code
+            user: Utilisateur qui utilise le code (soldes mis à jour en place)
         
         Returns:
             Tuple (crédits PDF ajoutés, crédits texte ajoutés)
         
         Raises:
-            HTTPException: Si le code est invalide, expiré ou épuisé
+            HTTPException: Si le code est invalide, expiré, épuisé ou déjà utilisé
         """
-        # Récupérer le code
+        try:
+            redemption = self.promo_code_repo.redeem(code, user.id)
+        except PromoCodeAlreadyUsedError as e:
+            logger.warning(f"Code promo {code} déjà utilisé par {user.email}")
+            raise HTTPException(status_code=400, detail=e.message)
+        
+        if redemption is None:
+            self._raise_unavailable(code, user)
+        
+        user.pdf_credits = redemption.new_pdf_credits
+        user.text_credits = redemption.new_text_credits
+        
+        logger.info(
+            f"Code promo {code} utilisé par {user.email} "
+            f"(+{redemption.pdf_credits_added} PDF, +{redemption.text_credits_added} text)"
+        )
+        
+        return (redemption.pdf_credits_added, redemption.text_credits_added)
+    
+    def _raise_unavailable(self, code: str, user: User) -> None:
+        """Relit le code pour expliquer le refus (chemin lent, échecs uniquement)"""
         promo_code = self.promo_code_repo.get_by_code(code.upper())
         
         if not promo_code:
             logger.warning(f"Code promo inexistant: {code}")
             raise HTTPException(status_code=404, detail="Code promo invalide")
         
-        # Vérifier si le code peut être utilisé
-        if not promo_code.can_be_used():
-            if not promo_code.is_active:
-                reason = "désactivé"
-            elif promo_code.expires_at and datetime.utcnow() > promo_code.expires_at:
-                reason = "expiré"
-            else:
-                reason = "épuisé"
+        if not promo_code.is_active:
+            reason = "désactivé"
+        elif promo_code.expires_at and datetime.utcnow() > promo_code.expires_at:
+            reason = "expiré"
+        else:
+            reason = "épuisé"
+        
+        logger.warning(f"Code promo {code} {reason} pour {user.email}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ce code promo est {reason}"
+        )
+    
+    def generate_codes_bulk(
+        self,
+        count: int,
+        pdf_credits: int = 0,
+        text_credits: int = 0,
+        max_uses: int = 1,
+        days_valid: Optional[int] = None,
+        prefix: Optional[str] = None
+    ) -> List[PromoCode]:
+        """
+        Génère N codes promo en une seule opération (campagnes)
+        
+        Les candidats sont générés en mémoire, les collisions vérifiées en une
+        seule requête, puis les codes insérés en insertion multi-lignes.
+        
+        Args:
+            count: Nombre de codes à générer (1 à PROMO_BULK_MAX_COUNT)
+            pdf_credits: Nombre de crédits PDF par code
+            text_credits: Nombre de crédits texte par code
+            max_uses: Nombre max d'utilisations par code (0 = illimité)
+            days_valid: Nombre de jours de validité (None = illimité)
+            prefix: Préfixe commun aux codes (ex: "NOEL-")
+        
+        Returns:
+            Liste des PromoCode créés
+        
+        Raises:
+            ValueError: Si count est hors limites
+        """
+        if count < 1 or count > PROMO_BULK_MAX_COUNT:
+            raise ValueError(f"Le nombre de codes doit être compris entre 1 et {PROMO_BULK_MAX_COUNT}")
+        
+        prefix = (prefix or "").upper().strip()
+        codes = set()
+        
+        # Quelques tours suffisent: les collisions sont rares avec 32^8 combinaisons
+        for _ in range(5):
+            missing = count - len(codes)
+            if missing == 0:
+                break
             
-            logger.warning(f"Code promo {code} {reason} pour {user.email}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Ce code promo est {reason}"
-            )
+            candidates = set()
+            while len(candidates) < missing:
+                candidate = prefix + self._random_code()
+                if candidate not in codes:
+                    candidates.add(candidate)
+            
+            existing = self.promo_code_repo.find_existing_codes(list(candidates))
+            codes |= candidates - existing
         
-        # Ajouter les crédits à l'utilisateur
-        user.pdf_credits += promo_code.pdf_credits
-        user.text_credits += promo_code.text_credits
-        self.user_repo.update(user)
+        if len(codes) < count:
+            raise ValueError("Impossible de générer suffisamment de codes uniques")
         
-        # Incrémenter l'utilisation du code
-        promo_code.increment_usage()
-        self.promo_code_repo.update(promo_code)
+        expires_at = None
+        if days_valid:
+            expires_at = datetime.utcnow() + timedelta(days=days_valid)
+        
+        created_at = datetime.utcnow()
+        promo_codes = [
+            PromoCode(
+                code=code,
+                pdf_credits=pdf_credits,
+                text_credits=text_credits,
+                max_uses=max_uses,
+                current_uses=0,
+                is_active=True,
+                created_at=created_at,
+                expires_at=expires_at
+            )
+            for code in sorted(codes)
+        ]
         
+        self.promo_code_repo.create_many(promo_codes)
         logger.info(
-            f"Code promo {code} utilisé par {user.email} "
-            f"(+{promo_code.pdf_credits} PDF, +{promo_code.text_credits} text)"
+            f"{count} codes promo générés "
+            f"(PDF: {pdf_credits}, Text: {text_credits}, Max: {max_uses})"
         )
-        
-        return (promo_code.pdf_credits, promo_code.text_credits)
+        return promo_codes
     
     def deactivate_code(self, code: str) -> None:
         """Désactive un code promo"""
@@ -144,14 +237,17 @@ class PromoCodeService:
         self.promo_code_repo.update(promo_code)
         logger.info(f"Code promo désactivé: {code}")
     
-    def _generate_random_code(self, length: int = 8) -> str:
+    def _generate_random_code(self, length: int = PROMO_CODE_LENGTH) -> str:
         """Génère un code aléatoire"""
-        # Utiliser lettres majuscules et chiffres (éviter confusion 0/O, 1/I)
-        alphabet = string.ascii_uppercase.replace('O', '').replace('I', '') + string.digits.replace('0', '').replace('1', '')
-        code = ''.join(secrets.choice(alphabet) for _ in range(length))
+        code = self._random_code(length)
         
         # Vérifier unicité
         if self.promo_code_repo.get_by_code(code):
             return self._generate_random_code(length)  # Retry
         
         return code
+    
+    @staticmethod
+    def _random_code(length: int = PROMO_CODE_LENGTH) -> str:
+        """Tire un code aléatoire (sans vérification en base)"""
+        return ''.join(secrets.choice(CODE_ALPHABET) for _ in range(length))
@@ -51,7 +51,7 @@ class UseCaseValidator:
         
         logger.debug("[UseCaseValidator] Service initialisé")
     
-    def validate_cv_and_credits(
+    async def validate_cv_and_credits(
         self,
         cv_id: str,
         user: User,
@@ -81,7 +81,7 @@ class UseCaseValidator:
         
         Example:
             >>> validator = UseCaseValidator(cv_service, credit_service)
-            >>> cv = validator.validate_cv_and_credits(
+            >>> cv = await validator.validate_cv_and_credits(
             ...     cv_id="123",
             ...     user=current_user,
             ...     credit_type="pdf"
@@ -94,7 +94,7 @@ class UseCaseValidator:
         )
         
         # 1. Valider le CV (existence, appartenance)
-        cv = self._cv_validation.get_and_validate_cv(cv_id, user)
+        cv = await self._cv_validation.get_and_validate_cv(cv_id, user)
         logger.debug(f"[UseCaseValidator] ✓ CV validé: {cv.filename}")
         
         # 2. Vérifier les crédits disponibles (SANS décompter)
@@ -9,7 +9,7 @@ from fastapi import HTTPException
 
 from domain.entities.user import User
 from domain.ports.cv_repository import CvRepository
-from domain.ports.file_storage import FileStorage
+from domain.ports.async_file_storage import AsyncFileStorage
 from domain.services.cv_validation_service import CvValidationService
 from infrastructure.adapters.logger_config import setup_logger
 
@@ -53,7 +53,7 @@ class DeleteCvUseCase:
     
     Phases:
     1. Validate CV + ownership
-    2. Delete file (LocalFileStorage)
+    2. Delete file (AsyncFileStorage)
     3. Delete DB record (CvRepository)
     4. Rollback DB if file deletion fails (transaction atomique)
     
@@ -72,7 +72,7 @@ class DeleteCvUseCase:
     def __init__(
         self,
         cv_repository: CvRepository,
-        file_storage: FileStorage,
+        file_storage: AsyncFileStorage,
         cv_validation_service: CvValidationService
     ):
         """
@@ -87,7 +87,7 @@ class DeleteCvUseCase:
         self.file_storage = file_storage
         self.cv_validation_service = cv_validation_service
     
-    def execute(
+    async def execute(
         self,
         input_data: DeleteCvInput,
         user: User
@@ -113,11 +113,11 @@ class DeleteCvUseCase:
         """
         try:
             # Phase 1: Valider CV et ownership
-            cv = self._validate_cv_and_ownership(input_data.cv_id, user)
+            cv = await self._validate_cv_and_ownership(input_data.cv_id, user)
             
             # Phase 2: Supprimer le fichier physique AVANT la DB
             # Si cette étape échoue, la DB n'est pas touchée (pas encore de delete DB)
-            self._delete_file(input_data.cv_id)
+            await self._delete_file(input_data.cv_id)
             
             # Phase 3: Supprimer l'enregistrement DB
             # SQLAlchemy rollback automatique si exception après ce point
@@ -145,7 +145,7 @@ class DeleteCvUseCase:
                 detail=f"Erreur lors de la suppression: {str(e)}"
             )
     
-    def _validate_cv_and_ownership(self, cv_id: str, user: User):
+    async def _validate_cv_and_ownership(self, cv_id: str, user: User):
         """
         Phase 1: Valide que le CV existe et appartient à l'utilisateur.
         
@@ -161,10 +161,10 @@ class DeleteCvUseCase:
             HTTPException 404: CV introuvable
         """
         # CvValidationService lève HTTPException si ownership invalide
-        cv = self.cv_validation_service.get_and_validate_cv(cv_id, user)
+        cv = await self.cv_validation_service.get_and_validate_cv(cv_id, user)
         return cv
     
-    def _delete_file(self, cv_id: str):
+    async def _delete_file(self, cv_id: str):
         """
         Phase 2: Supprime le fichier physique du CV.
         
@@ -178,7 +178,7 @@ class DeleteCvUseCase:
             Exception: Si erreur suppression fichier
         """
         try:
-            self.file_storage.delete_cv(cv_id)
+            await self.file_storage.delete_cv(cv_id)
         except Exception as e:
             logger.error(f"Erreur suppression fichier: cv_id={cv_id}, error={e}")
             raise Exception(f"Impossible de supprimer le fichier: {str(e)}")
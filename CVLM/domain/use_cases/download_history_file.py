@@ -3,20 +3,31 @@ Use Case: Télécharger un fichier PDF depuis l'historique
 Workflow 4: Download History File avec validation ownership + expiration
 """
 
-import os
 from dataclasses import dataclass
 from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import HTTPException
 
 from domain.entities.user import User
+from domain.entities.generation_history import GenerationHistory
+from domain.exceptions import PdfRenderingBusyError
+from domain.ports.async_file_storage import AsyncFileStorage
 from domain.ports.generation_history_repository import GenerationHistoryRepository
+from domain.ports.motivational_letter_repository import MotivationalLetterRepository
 from domain.services.filename_builder import FilenameBuilder
+from domain.services.generation_history_service import GenerationHistoryService
+from domain.services.letter_generation_service import LetterGenerationService
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import DOWNLOAD_RESOLVE_CACHE_TTL_SECONDS, DOWNLOAD_RESOLVE_CACHE_SIZE
 
 
 logger = setup_logger(__name__)
 
+# (user_id, history_id) -> (file_path, filename): téléchargements répétés servis
+# sans relire l'historique ni revérifier propriété et expiration
+_resolved_history_files = TTLCache(maxsize=DOWNLOAD_RESOLVE_CACHE_SIZE, ttl=DOWNLOAD_RESOLVE_CACHE_TTL_SECONDS)
+
 
 @dataclass
 class DownloadHistoryFileInput:
@@ -38,10 +49,12 @@ class DownloadHistoryFileOutput:
         file_path: Chemin absolu du fichier PDF
         filename: Nom de fichier propre (company_job.pdf)
         media_type: Type MIME (application/pdf)
+        etag: ETag fort dérivé du contenu (None si le stockage n'en fournit pas)
     """
     file_path: str
     filename: str
     media_type: str = "application/pdf"
+    etag: Optional[str] = None
 
 
 class DownloadHistoryFileUseCase:
@@ -53,28 +66,35 @@ class DownloadHistoryFileUseCase:
     - Valider ownership (user_id)
     - Vérifier téléchargeable (expiration, statut)
     - Construire filename propre
-    - Vérifier existence fichier physique
+    - Vérifier existence fichier physique, re-rendre le PDF depuis la lettre
+      source s'il n'a jamais été rendu ou a expiré
     - Retourner file path pour FileResponse
     
     Phases:
+    0. Resolved download cache (same user, same entry, < 60s): skip 1-5
     1. Get history entry
     2. Validate ownership
     3. Check downloadable (expiration)
     4. Build clean filename
-    5. Check file exists
-    6. Return file path + filename
+    5. Check file exists (render from the source letter if missing or expired)
+    6. Return file path + filename + ETag
     
     Errors:
     - HTTPException 403: Accès refusé (ownership)
     - HTTPException 404: Entrée ou fichier introuvable
     - HTTPException 410: Fichier expiré ou indisponible
     - HTTPException 500: Erreur serveur
+    - HTTPException 503: Rendu PDF saturé
     """
     
     def __init__(
         self,
         history_repository: GenerationHistoryRepository,
-        filename_builder: FilenameBuilder
+        filename_builder: FilenameBuilder,
+        history_service: GenerationHistoryService,
+        letter_repository: MotivationalLetterRepository,
+        letter_generation_service: LetterGenerationService,
+        file_storage: AsyncFileStorage
     ):
         """
         Initialise le Use Case avec ses dépendances.
@@ -82,11 +102,19 @@ class DownloadHistoryFileUseCase:
         Args:
             history_repository: Repository pour accès historique
             filename_builder: Service de construction filename propre
+            history_service: Service historique (regenerate_pdf)
+            letter_repository: Repository des lettres sources
+            letter_generation_service: Service de rendu PDF
+            file_storage: Stockage fichiers (vérifications d'existence hors boucle)
         """
         self.history_repository = history_repository
         self.filename_builder = filename_builder
+        self.history_service = history_service
+        self.letter_repository = letter_repository
+        self.letter_service = letter_generation_service
+        self.file_storage = file_storage
     
-    def execute(
+    async def execute(
         self,
         input_data: DownloadHistoryFileInput,
         user: User
@@ -104,7 +132,14 @@ class DownloadHistoryFileUseCase:
         Raises:
             HTTPException: Selon le type d'erreur (403/404/410/500)
         """
+        cache_key = (user.id, input_data.history_id)
+        
         try:
+            # Phase 0: Téléchargement déjà résolu (propriété et expiration vérifiées)
+            cached = await self._from_cache(cache_key)
+            if cached:
+                return cached
+            
             # Phase 1: Récupérer l'entrée historique
             history = self._get_history_entry(input_data.history_id)
             
@@ -120,8 +155,8 @@ class DownloadHistoryFileUseCase:
                 job_title=history.job_title
             )
             
-            # Phase 5: Vérifier existence fichier physique
-            file_path = self._check_file_exists(history.file_path)
+            # Phase 5: Vérifier existence fichier physique (re-rendu si besoin)
+            file_path = await self._resolve_file(history, user)
             
             # Phase 6: Logger et retourner
             logger.info(
@@ -131,14 +166,18 @@ class DownloadHistoryFileUseCase:
                 f"job='{history.job_title}'"
             )
             
+            _resolved_history_files[cache_key] = (file_path, filename)
             return DownloadHistoryFileOutput(
                 file_path=file_path,
-                filename=filename
+                filename=filename,
+                etag=await self.file_storage.get_etag(file_path)
             )
         
         except HTTPException:
             # HTTPException déjà formatée, on la propage
             raise
+        except PdfRenderingBusyError as e:
+            raise HTTPException(status_code=503, detail=e.message)
         except Exception as e:
             logger.error(
                 f"Erreur téléchargement historique: "
@@ -149,6 +188,28 @@ class DownloadHistoryFileUseCase:
                 detail="Erreur lors du téléchargement"
             )
     
+    async def _from_cache(self, cache_key) -> Optional[DownloadHistoryFileOutput]:
+        """
+        Phase 0: Sortie d'un téléchargement résolu récemment par le même utilisateur.
+        
+        L'ETag sert aussi de vérification d'existence: fichier supprimé entre-temps
+        → entrée oubliée, workflow complet.
+        
+        Returns:
+            DownloadHistoryFileOutput, ou None si absent du cache ou fichier disparu
+        """
+        resolved = _resolved_history_files.get(cache_key)
+        if not resolved:
+            return None
+        
+        file_path, filename = resolved
+        etag = await self.file_storage.get_etag(file_path)
+        if etag is None:
+            _resolved_history_files.pop(cache_key, None)
+            return None
+        
+        return DownloadHistoryFileOutput(file_path=file_path, filename=filename, etag=etag)
+    
     def _get_history_entry(self, history_id: str):
         """
         Phase 1: Récupère l'entrée historique.
@@ -226,7 +287,55 @@ class DownloadHistoryFileUseCase:
             job_title=job_title
         )
     
-    def _check_file_exists(self, file_path: str) -> str:
+    async def _resolve_file(self, history: GenerationHistory, user: User) -> str:
+        """
+        Phase 5: Retourne le PDF de l'entrée, re-rendu si nécessaire.
+        
+        Un fichier présent et non expiré est servi tel quel. Sinon, si l'entrée
+        est liée à une lettre, le PDF est rendu depuis son texte (ou le fichier
+        existant réutilisé) et l'entrée repart pour 90 jours (regenerate_pdf).
+        
+        Args:
+            history: GenerationHistory entity
+            user: Utilisateur demandant le téléchargement
+        
+        Returns:
+            Chemin du fichier PDF
+        
+        Raises:
+            HTTPException 404: Fichier physique introuvable
+            HTTPException 410: Lettre source supprimée
+        """
+        if (
+            history.file_path
+            and not history.is_file_expired()
+            and await self.file_storage.path_exists(history.file_path)
+        ):
+            return history.file_path
+        
+        if not history.letter_id:
+            return await self._check_file_exists(history.file_path)
+        
+        letter = self.letter_repository.get_by_id(history.letter_id)
+        if not letter or letter.user_id != user.id:
+            raise HTTPException(
+                status_code=410,
+                detail="Fichier expiré ou indisponible"
+            )
+        
+        try:
+            if await self.letter_service.ensure_letter_pdf(letter):
+                self.letter_repository.update(letter)
+        except ValueError:
+            raise HTTPException(
+                status_code=404,
+                detail="Fichier physique introuvable"
+            )
+        
+        self.history_service.regenerate_pdf(history.id, user.id, letter.file_path)
+        return letter.file_path
+    
+    async def _check_file_exists(self, file_path: Optional[str]) -> str:
         """
         Phase 5: Vérifie que le fichier physique existe.
         
@@ -239,7 +348,7 @@ class DownloadHistoryFileUseCase:
         Raises:
             HTTPException 404: Fichier physique introuvable
         """
-        if not os.path.exists(file_path):
+        if not file_path or not await self.file_storage.path_exists(file_path):
             raise HTTPException(
                 status_code=404,
                 detail="Fichier physique introuvable"
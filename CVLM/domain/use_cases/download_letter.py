@@ -4,20 +4,28 @@ Workflow 5: Download Letter avec validation ownership simplifiée
 """
 
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import HTTPException
 
 from domain.entities.user import User
+from domain.entities.motivational_letter import MotivationalLetter
+from domain.exceptions import PdfRenderingBusyError
 from domain.ports.motivational_letter_repository import MotivationalLetterRepository
-from domain.ports.file_storage import FileStorage
+from domain.ports.async_file_storage import AsyncFileStorage
 from domain.services.filename_builder import FilenameBuilder
+from domain.services.letter_generation_service import LetterGenerationService
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import DOWNLOAD_RESOLVE_CACHE_TTL_SECONDS, DOWNLOAD_RESOLVE_CACHE_SIZE
 
 
 logger = setup_logger(__name__)
 
+# (user_id, letter_id) -> (file_path, filename): téléchargements répétés (extension,
+# lecteurs PDF en requêtes Range) servis sans relire la lettre en base
+_resolved_letters = TTLCache(maxsize=DOWNLOAD_RESOLVE_CACHE_SIZE, ttl=DOWNLOAD_RESOLVE_CACHE_TTL_SECONDS)
+
 
 @dataclass
 class DownloadLetterInput:
@@ -39,10 +47,12 @@ class DownloadLetterOutput:
         file_path: Chemin absolu du fichier PDF
         filename: Nom de fichier propre (ou fallback lettre_{id}.pdf)
         media_type: Type MIME (application/pdf)
+        etag: ETag fort dérivé du contenu (None si le stockage n'en fournit pas)
     """
     file_path: str
     filename: str
     media_type: str = "application/pdf"
+    etag: Optional[str] = None
 
 
 class DownloadLetterUseCase:
@@ -52,17 +62,18 @@ class DownloadLetterUseCase:
     Responsabilités:
     - Récupérer la lettre depuis repository
     - Valider ownership (user_id)
-    - Récupérer file path depuis file storage
+    - Récupérer file path depuis file storage (PDF rendu à la demande si absent)
     - Vérifier existence fichier physique
     - Construire filename propre (ou utiliser letter.filename)
     - Retourner file path pour FileResponse
     
     Phases:
+    0. Resolved download cache (same user, same letter, < 60s): skip 1-4
     1. Get letter entity
     2. Validate ownership
-    3. Get file path from storage
+    3. Get file path from storage (render from raw_text if missing)
     4. Check file exists
-    5. Return file path + filename
+    5. Return file path + filename + ETag
     
     Note: Plus simple que DownloadHistoryFileUseCase car:
     - Pas de vérification expiration (lettres permanentes)
@@ -72,13 +83,15 @@ class DownloadLetterUseCase:
     - HTTPException 403: Accès interdit (ownership)
     - HTTPException 404: Lettre ou fichier introuvable
     - HTTPException 500: Erreur serveur
+    - HTTPException 503: Rendu PDF saturé
     """
     
     def __init__(
         self,
         letter_repository: MotivationalLetterRepository,
-        file_storage: FileStorage,
-        filename_builder: FilenameBuilder
+        file_storage: AsyncFileStorage,
+        filename_builder: FilenameBuilder,
+        letter_generation_service: LetterGenerationService
     ):
         """
         Initialise le Use Case avec ses dépendances.
@@ -87,12 +100,14 @@ class DownloadLetterUseCase:
             letter_repository: Repository pour accès lettres
             file_storage: Service de stockage fichiers
             filename_builder: Service de construction filename propre
+            letter_generation_service: Service de rendu PDF (rendu différé)
         """
         self.letter_repository = letter_repository
         self.file_storage = file_storage
         self.filename_builder = filename_builder
+        self.letter_service = letter_generation_service
     
-    def execute(
+    async def execute(
         self,
         input_data: DownloadLetterInput,
         user: User
@@ -110,18 +125,25 @@ class DownloadLetterUseCase:
         Raises:
             HTTPException: Selon le type d'erreur (403/404/500)
         """
+        cache_key = (user.id, input_data.letter_id)
+        
         try:
+            # Phase 0: Téléchargement déjà résolu (propriété vérifiée, fichier connu)
+            cached = await self._from_cache(cache_key)
+            if cached:
+                return cached
+            
             # Phase 1: Récupérer la lettre
             letter = self._get_letter(input_data.letter_id)
             
             # Phase 2: Valider ownership
             self._validate_ownership(letter.user_id, user.id)
             
-            # Phase 3: Récupérer file path depuis storage
-            file_path = self._get_file_path(input_data.letter_id)
+            # Phase 3: Récupérer file path depuis storage (rendu si pas encore fait)
+            file_path = await self._get_file_path(letter)
             
             # Phase 4: Vérifier existence fichier physique
-            self._check_file_exists(file_path)
+            await self._check_file_exists(file_path)
             
             # Phase 5: Construire filename (utilise letter.filename ou fallback)
             filename = self._build_filename(letter, input_data.letter_id)
@@ -133,14 +155,18 @@ class DownloadLetterUseCase:
                 f"filename='{filename}'"
             )
             
+            _resolved_letters[cache_key] = (file_path, filename)
             return DownloadLetterOutput(
                 file_path=file_path,
-                filename=filename
+                filename=filename,
+                etag=await self.file_storage.get_etag(file_path)
             )
         
         except HTTPException:
             # HTTPException déjà formatée, on la propage
             raise
+        except PdfRenderingBusyError as e:
+            raise HTTPException(status_code=503, detail=e.message)
         except Exception as e:
             logger.error(
                 f"Erreur téléchargement lettre: "
@@ -151,6 +177,28 @@ class DownloadLetterUseCase:
                 detail=f"Erreur lors du téléchargement: {str(e)}"
             )
     
+    async def _from_cache(self, cache_key) -> Optional[DownloadLetterOutput]:
+        """
+        Phase 0: Sortie d'un téléchargement résolu récemment par le même utilisateur.
+        
+        L'ETag sert aussi de vérification d'existence: fichier disparu entre-temps
+        (expiration) → entrée oubliée, workflow complet (re-rendu).
+        
+        Returns:
+            DownloadLetterOutput, ou None si absent du cache ou fichier disparu
+        """
+        resolved = _resolved_letters.get(cache_key)
+        if not resolved:
+            return None
+        
+        file_path, filename = resolved
+        etag = await self.file_storage.get_etag(file_path)
+        if etag is None:
+            _resolved_letters.pop(cache_key, None)
+            return None
+        
+        return DownloadLetterOutput(file_path=file_path, filename=filename, etag=etag)
+    
     def _get_letter(self, letter_id: str):
         """
         Phase 1: Récupère la lettre depuis repository.
@@ -191,30 +239,40 @@ class DownloadLetterUseCase:
                 detail="Accès interdit à cette lettre"
             )
     
-    def _get_file_path(self, letter_id: str) -> str:
+    async def _get_file_path(self, letter: MotivationalLetter) -> str:
         """
         Phase 3: Récupère le chemin du fichier depuis file storage.
         
+        Si le PDF n'existe pas (rendu différé à la génération, ou fichier
+        supprimé à l'expiration), il est rendu depuis raw_text puis gardé
+        en cache: les téléchargements suivants lisent le fichier.
+        
         Args:
-            letter_id: ID de la lettre
+            letter: MotivationalLetter entity
         
         Returns:
             Chemin absolu du fichier
         
         Raises:
-            HTTPException 404: Fichier PDF introuvable
+            HTTPException 404: Fichier PDF introuvable et lettre sans texte
         """
-        file_path = self.file_storage.get_letter_path(letter_id)
+        file_path = await self.file_storage.get_letter_path(letter.id)
         
-        if not file_path:
+        if file_path:
+            return file_path
+        
+        try:
+            if await self.letter_service.ensure_letter_pdf(letter):
+                self.letter_repository.update(letter)
+        except ValueError:
             raise HTTPException(
                 status_code=404,
                 detail="Fichier PDF introuvable"
             )
         
-        return file_path
+        return letter.file_path
     
-    def _check_file_exists(self, file_path: str):
+    async def _check_file_exists(self, file_path: str):
         """
         Phase 4: Vérifie que le fichier physique existe.
         
@@ -224,7 +282,7 @@ class DownloadLetterUseCase:
         Raises:
             HTTPException 404: Fichier PDF introuvable
         """
-        if not Path(file_path).exists():
+        if not await self.file_storage.path_exists(file_path):
             raise HTTPException(
                 status_code=404,
                 detail="Fichier PDF introuvable"
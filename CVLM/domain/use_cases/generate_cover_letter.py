@@ -4,24 +4,24 @@ Orchestre toute la logique métier avec gestion transactionnelle
 """
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
 from typing import Tuple
 
 from domain.entities.cv import Cv
 from domain.entities.user import User
 from domain.entities.motivational_letter import MotivationalLetter
 from domain.ports.cv_repository import CvRepository
-from domain.ports.user_repository import UserRepository
 from domain.ports.motivational_letter_repository import MotivationalLetterRepository
 from domain.ports.generation_history_repository import GenerationHistoryRepository
+from domain.ports.unit_of_work import UnitOfWork
 from domain.services.cv_validation_service import CvValidationService
 from domain.services.credit_service import CreditService
 from domain.services.letter_generation_service import LetterGenerationService
 from domain.services.generation_history_service import GenerationHistoryService
 from domain.services.use_case_validator import UseCaseValidator
 from domain.services.job_info_extractor import JobInfoExtractor
-from domain.exceptions import InsufficientCreditsError, ResourceNotFoundError
+from domain.exceptions import InsufficientCreditsError, ResourceNotFoundError, PdfRenderingBusyError
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import PDF_RENDERING_MODE, PDF_RENDERING_LAZY
 
 logger = setup_logger(__name__)
 
@@ -34,6 +34,7 @@ class GenerateCoverLetterInput:
     job_url: str
     llm_provider: str = "openai"
     pdf_generator: str = "fpdf"
+    layout: str = "classic"
 
 
 @dataclass
@@ -52,11 +53,11 @@ class GenerateCoverLetterUseCase:
     
     Responsabilités:
     1. Valider le CV et l'accès utilisateur
-    2. Vérifier les crédits (avec gestion transactionnelle)
-    3. Orchestrer la génération (LLM + PDF)
+    2. Réserver un crédit (avec gestion transactionnelle)
+    3. Orchestrer la génération (LLM + PDF, ou LLM seul si le rendu est différé)
     4. Sauvegarder la lettre en base
     5. Enregistrer dans l'historique
-    6. Décompter les crédits SEULEMENT si tout réussit
+    6. Confirmer le crédit réservé SEULEMENT si tout réussit
     """
     
     def __init__(
@@ -67,7 +68,8 @@ class GenerateCoverLetterUseCase:
         letter_generation_service: LetterGenerationService,
         history_service: GenerationHistoryService,
         letter_repository: MotivationalLetterRepository,
-        user_repository: UserRepository
+        unit_of_work: UnitOfWork,
+        lazy_pdf_rendering: bool = PDF_RENDERING_MODE == PDF_RENDERING_LAZY
     ):
         self.validator = use_case_validator
         self.job_extractor = job_info_extractor
@@ -75,9 +77,11 @@ class GenerateCoverLetterUseCase:
         self.letter_service = letter_generation_service
         self.history_service = history_service
         self.letter_repo = letter_repository
-        self.user_repo = user_repository
+        self.unit_of_work = unit_of_work
+        # Rendu différé: le PDF est rendu au premier téléchargement, hors du chemin critique
+        self.lazy_pdf_rendering = lazy_pdf_rendering
     
-    def execute(
+    async def execute(
         self,
         input_data: GenerateCoverLetterInput,
         current_user: User
@@ -86,10 +90,10 @@ class GenerateCoverLetterUseCase:
         Exécute le use case avec gestion transactionnelle
         
         Stratégie:
-        1. Vérifier AVANT (CV existe, crédits suffisants)
+        1. Vérifier AVANT (CV existe) et réserver un crédit
         2. Générer (LLM + PDF)
         3. Sauvegarder (DB + historique)
-        4. Décompter crédits SEULEMENT si 1-3 réussissent
+        4. Confirmer le crédit SEULEMENT si 1-3 réussissent, sinon le restituer
         
         Raises:
             ResourceNotFoundError: CV introuvable ou accès refusé
@@ -98,13 +102,14 @@ class GenerateCoverLetterUseCase:
         """
         letter_id = None
         pdf_path = None
+        reservation = None
         
         try:
             # === PHASE 1: VALIDATION (pas de side effect) ===
             logger.info(f"[Use Case] Génération lettre pour user={current_user.email}, cv={input_data.cv_id}")
             
             # Validation CV + crédits (centralisée via helper)
-            cv = self.validator.validate_cv_and_credits(
+            cv = await self.validator.validate_cv_and_credits(
                 cv_id=input_data.cv_id,
                 user=current_user,
                 credit_type="pdf"
@@ -112,71 +117,95 @@ class GenerateCoverLetterUseCase:
             
             logger.debug(f"[Use Case] ✓ Validation OK: CV={cv.filename}, crédits={current_user.pdf_credits}")
             
-            # === PHASE 2: GÉNÉRATION (création de fichier) ===
+            # Réservation atomique: les générations parallèles sur le dernier crédit
+            # échouent ici, avant l'appel LLM
+            reservation = self.credit_service.reserve_credit(current_user, "pdf")
+            
+            # === PHASE 2: GÉNÉRATION (texte, puis PDF en mémoire si rendu immédiat) ===
             logger.info(f"[Use Case] Démarrage génération avec {input_data.llm_provider}")
             
-            letter_id, pdf_path, letter_text = self.letter_service.generate_letter_pdf(
-                cv=cv,
-                job_url=input_data.job_url,
-                llm_provider=input_data.llm_provider,
-                pdf_generator=input_data.pdf_generator,
-                user=current_user
-            )
+            if self.lazy_pdf_rendering:
+                letter_id, letter_text = self.letter_service.generate_letter_text(
+                    cv=cv,
+                    job_url=input_data.job_url,
+                    llm_provider=input_data.llm_provider,
+                    user=current_user
+                )
+                pdf_content = None
+            else:
+                letter_id, pdf_content, letter_text = await self.letter_service.generate_letter_pdf(
+                    cv=cv,
+                    job_url=input_data.job_url,
+                    llm_provider=input_data.llm_provider,
+                    pdf_generator=input_data.pdf_generator,
+                    user=current_user,
+                    layout=input_data.layout
+                )
             
             logger.info(f"[Use Case] Lettre générée: {letter_id}, taille: {len(letter_text)} chars")
             
-            # === PHASE 3: SAUVEGARDE (transaction DB) ===
+            # === PHASE 3: SAUVEGARDE + CONFIRMATION CRÉDIT (une seule transaction) ===
+            # Lettre, historique et confirmation du crédit sont validés ensemble:
+            # un échec annule les trois et le crédit réservé est restitué
             
-            # 3.1 Créer l'entité MotivationalLetter
-            letter_entity = self.letter_service.save_letter_to_storage(
+            # 3.1 Écrire le PDF (une seule fois, s'il est rendu) et créer l'entité MotivationalLetter
+            letter_entity = await self.letter_service.save_letter_to_storage(
                 letter_id=letter_id,
-                pdf_path=pdf_path,
+                pdf_content=pdf_content,
                 cv_id=input_data.cv_id,
                 job_url=input_data.job_url,
                 letter_text=letter_text,
                 llm_provider=input_data.llm_provider,
-                user=current_user
+                user=current_user,
+                pdf_generator=input_data.pdf_generator,
+                layout=input_data.layout
             )
-            
-            # 3.2 Sauvegarder en DB
-            saved_letter = self.letter_repo.create(letter_entity)
-            logger.debug(f"[Use Case] Lettre sauvegardée en DB: {saved_letter.id}")
-            
-            # 3.3 Enregistrer dans l'historique
+            pdf_path = letter_entity.file_path or None
             company_name, job_title = self.job_extractor.extract_from_url(input_data.job_url)
             
-            self.history_service.record_generation(
-                user_id=current_user.id,
-                gen_type='pdf',
-                job_title=job_title,
-                company_name=company_name,
-                job_url=input_data.job_url,
-                cv_filename=cv.filename,
-                cv_id=input_data.cv_id,
-                file_path=pdf_path,
-                status='success'
-            )
-            
-            logger.debug(f"[Use Case] Historique enregistré pour {current_user.email}")
-            
-            # === PHASE 4: DÉCOMPTE CRÉDITS (seulement si tout a réussi) ===
-            self.credit_service.check_and_use_pdf_credit(current_user)
-            
-            # Recharger l'utilisateur pour avoir les crédits à jour
-            updated_user = self.user_repo.get_by_id(current_user.id)
+            try:
+                with self.unit_of_work:
+                    # 3.2 Sauvegarder en DB
+                    saved_letter = self.letter_repo.create(letter_entity)
+                    logger.debug(f"[Use Case] Lettre sauvegardée en DB: {saved_letter.id}")
+                
+                    # 3.3 Enregistrer dans l'historique
+                    self.history_service.record_generation(
+                        user_id=current_user.id,
+                        gen_type='pdf',
+                        job_title=job_title,
+                        company_name=company_name,
+                        job_url=input_data.job_url,
+                        cv_filename=cv.filename,
+                        cv_id=input_data.cv_id,
+                        llm_provider=input_data.llm_provider,
+                        file_path=pdf_path,
+                        letter_id=letter_id,
+                        status='success'
+                    )
+                    logger.debug(f"[Use Case] Historique enregistré pour {current_user.email}")
+                
+                    # 3.4 Confirmation du crédit (seulement si tout a réussi)
+                    # Le solde a été décrémenté à la réservation: current_user.pdf_credits est à jour
+                    self.credit_service.commit_reservation(reservation)
+            except Exception:
+                # Transaction annulée: la réservation est toujours en attente en base
+                if reservation.status == 'committed':
+                    reservation.status = 'reserved'
+                raise
             
             logger.info(
                 f"[Use Case] ✅ Génération réussie: letter={letter_id}, "
-                f"crédits restants={updated_user.pdf_credits}"
+                f"crédits restants={current_user.pdf_credits}"
             )
             
             # === SUCCÈS: Retourner le résultat ===
             return GenerateCoverLetterOutput(
                 letter_id=saved_letter.id,
-                pdf_path=pdf_path,
+                pdf_path=pdf_path or "",
                 letter_text=letter_text,
                 download_url=f"/download-letter/{saved_letter.id}",
-                credits_remaining=updated_user.pdf_credits
+                credits_remaining=current_user.pdf_credits
             )
             
         except InsufficientCreditsError:
@@ -187,14 +216,18 @@ class GenerateCoverLetterUseCase:
             # Erreur attendue, on la propage
             raise
             
+        except PdfRenderingBusyError:
+            # File de rendu pleine: rien n'a été produit, le crédit est restitué
+            raise
+            
         except Exception as e:
             # Erreur inattendue: on log et on nettoie
             logger.error(f"[Use Case] ❌ Erreur génération: {str(e)}", exc_info=True)
             
             # Nettoyage: supprimer le fichier PDF si créé
-            if pdf_path and Path(pdf_path).exists():
+            if pdf_path:
                 try:
-                    Path(pdf_path).unlink()
+                    await self.letter_service.file_storage.delete_letter(letter_id)
                     logger.debug(f"[Use Case] Fichier PDF nettoyé: {pdf_path}")
                 except Exception as cleanup_error:
                     logger.warning(f"[Use Case] Erreur nettoyage PDF: {cleanup_error}")
@@ -212,6 +245,7 @@ class GenerateCoverLetterUseCase:
                         job_url=input_data.job_url,
                         cv_filename=cv.filename if cv else None,
                         cv_id=input_data.cv_id,
+                        llm_provider=input_data.llm_provider,
                         file_path=None,
                         status='failed',
                         error_message=str(e)
@@ -221,3 +255,8 @@ class GenerateCoverLetterUseCase:
             
             # Propager l'erreur
             raise Exception(f"Erreur lors de la génération de la lettre: {str(e)}") from e
+        
+        finally:
+            # Échec après réservation: restituer le crédit
+            if reservation and reservation.is_pending():
+                self.credit_service.release_reservation(reservation, current_user)
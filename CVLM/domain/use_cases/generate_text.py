@@ -56,12 +56,12 @@ class GenerateTextUseCase:
     - Extraction du contenu CV et récupération de l'offre d'emploi
     - Génération du texte via LLM
     - Enregistrement dans l'historique
-    - Décompte des crédits (UNIQUEMENT si succès complet)
+    - Confirmation du crédit réservé (UNIQUEMENT si succès complet)
     
     Gestion transactionnelle:
-    - Vérification crédits AVANT génération
-    - Décompte crédits APRÈS génération réussie
-    - Pas de perte de crédit en cas d'erreur
+    - Réservation atomique d'un crédit AVANT génération
+    - Confirmation APRÈS génération réussie
+    - Restitution du crédit en cas d'erreur
     
     Pattern: Use Case orchestrant plusieurs services domain
     """
@@ -98,17 +98,17 @@ class GenerateTextUseCase:
         
         logger.info("[Use Case] GenerateTextUseCase initialisé")
     
-    def execute(self, input_data: GenerateTextInput, current_user: User) -> GenerateTextOutput:
+    async def execute(self, input_data: GenerateTextInput, current_user: User) -> GenerateTextOutput:
         """
         Exécute le workflow complet de génération de texte.
         
         Workflow:
-        1. Validation CV et crédits
+        1. Validation CV et réservation d'un crédit
         2. Extraction contenu CV
         3. Récupération offre d'emploi (best effort)
         4. Génération texte via LLM
         5. Enregistrement historique
-        6. Décompte crédits (si tout OK)
+        6. Confirmation du crédit (si tout OK, sinon restitution)
         
         Args:
             input_data: Données d'entrée (cv_id, job_url, text_type, llm_provider)
@@ -125,16 +125,21 @@ class GenerateTextUseCase:
         logger.info(f"[Use Case] Input: cv_id={input_data.cv_id}, job_url={input_data.job_url}, "
                    f"text_type={input_data.text_type}, llm={input_data.llm_provider}")
         
+        reservation = None
+        
         try:
             # ==================== PHASE 1: VALIDATION ====================
             # Validation centralisée via helper
-            cv = self._validator.validate_cv_and_credits(
+            cv = await self._validator.validate_cv_and_credits(
                 cv_id=input_data.cv_id,
                 user=current_user,
                 credit_type='text'
             )
             logger.info(f"[Use Case] ✓ Validation OK - CV: {cv.filename}")
             
+            reservation = self._credit_service.reserve_credit(current_user, 'text')
+            logger.info(f"[Use Case] ✓ Crédit réservé - Crédits restants: {current_user.text_credits}")
+            
             # ==================== PHASE 2: EXTRACTION CV ====================
             cv_text = self._extract_cv_content(cv.file_path)
             logger.info(f"[Use Case] ✓ CV extrait - {len(cv_text)} caractères")
@@ -159,14 +164,15 @@ class GenerateTextUseCase:
                 cv_filename=cv.filename,
                 job_url=input_data.job_url,
                 text_content=generated_text,
-                status='success'
+                status='success',
+                llm_provider=input_data.llm_provider
             )
             logger.info(f"[Use Case] ✓ Historique enregistré")
             
-            # ==================== PHASE 6: DÉCOMPTE CRÉDITS ====================
-            # ⚠️ IMPORTANT: Décompter uniquement si TOUT a réussi
-            self._credit_service.use_text_credit(current_user)
-            logger.info(f"[Use Case] ✓ Crédit déduit - Crédits restants: {current_user.text_credits}")
+            # ==================== PHASE 6: CONFIRMATION CRÉDIT ====================
+            # ⚠️ IMPORTANT: Confirmer uniquement si TOUT a réussi
+            self._credit_service.commit_reservation(reservation)
+            logger.info(f"[Use Case] ✓ Crédit confirmé - Crédits restants: {current_user.text_credits}")
             
             # ==================== SUCCÈS ====================
             logger.info(f"[Use Case] ✅ Génération texte réussie pour {current_user.email}")
@@ -189,6 +195,10 @@ class GenerateTextUseCase:
             # Erreur technique inattendue
             logger.error(f"[Use Case] ❌ Erreur inattendue: {e}", exc_info=True)
             raise RuntimeError(f"Erreur lors de la génération du texte: {str(e)}")
+        finally:
+            # Échec après réservation: restituer le crédit
+            if reservation and reservation.is_pending():
+                self._credit_service.release_reservation(reservation, current_user)
     
     # ==================== MÉTHODES PRIVÉES ====================
     
@@ -307,7 +317,8 @@ class GenerateTextUseCase:
         cv_filename: str,
         job_url: str,
         text_content: str,
-        status: str
+        status: str,
+        llm_provider: str
     ) -> None:
         """
         Enregistre la génération dans l'historique (best effort).
@@ -319,6 +330,7 @@ class GenerateTextUseCase:
             job_url: URL de l'offre d'emploi
             text_content: Texte généré
             status: Statut de la génération
+            llm_provider: Provider LLM utilisé
         """
         try:
             # Extraction infos job centralisée via helper
@@ -334,7 +346,8 @@ class GenerateTextUseCase:
                 cv_filename=cv_filename,
                 cv_id=cv_id,
                 text_content=text_content,
-                status=status
+                status=status,
+                llm_provider=llm_provider
             )
             
         except Exception as e:
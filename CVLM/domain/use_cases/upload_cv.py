@@ -22,7 +22,7 @@ from domain.entities.user import User
 from domain.entities.cv import Cv
 from domain.ports.cv_repository import CvRepository
 from domain.ports.document_parser import DocumentParser
-from domain.ports.file_storage import FileStorage
+from domain.ports.async_file_storage import AsyncFileStorage
 from infrastructure.adapters.logger_config import setup_logger
 
 logger = setup_logger(__name__)
@@ -74,7 +74,7 @@ class UploadCvUseCase:
         self,
         cv_repository: CvRepository,
         document_parser: DocumentParser,
-        file_storage: FileStorage,
+        file_storage: AsyncFileStorage,
         max_file_size: int,
         allowed_extensions: list[str]
     ):
@@ -96,7 +96,7 @@ class UploadCvUseCase:
         
         logger.info("[Use Case] UploadCvUseCase initialisé")
     
-    def execute(
+    async def execute(
         self,
         input_data: UploadCvInput,
         current_user: User
@@ -139,7 +139,7 @@ class UploadCvUseCase:
             
             # ==================== PHASE 3: SAUVEGARDE STORAGE ====================
             cv_id = str(uuid.uuid4())
-            file_path = self._save_to_storage(cv_id, input_data)
+            file_path = await self._save_to_storage(cv_id, input_data)
             logger.info(f"[Use Case] ✓ Fichier sauvegardé: {file_path}")
             
             # ==================== PHASE 4: SAUVEGARDE DB ====================
@@ -176,9 +176,9 @@ class UploadCvUseCase:
             logger.error(f"[Use Case] ❌ Erreur upload CV: {e}", exc_info=True)
             
             # Cleanup: supprimer le fichier si créé
-            if file_path and Path(file_path).exists():
+            if file_path:
                 try:
-                    Path(file_path).unlink()
+                    await self._storage.delete_cv(cv_id)
                     logger.debug(f"[Use Case] Fichier nettoyé: {file_path}")
                 except Exception as cleanup_error:
                     logger.warning(f"[Use Case] Erreur nettoyage: {cleanup_error}")
@@ -243,7 +243,7 @@ class UploadCvUseCase:
             logger.warning(f"[Use Case] ⚠️  Erreur extraction texte (non bloquant): {e}")
             return ""  # Best effort: continuer même si extraction échoue
     
-    def _save_to_storage(self, cv_id: str, input_data: UploadCvInput) -> str:
+    async def _save_to_storage(self, cv_id: str, input_data: UploadCvInput) -> str:
         """
         Sauvegarde le fichier en storage.
         
@@ -258,7 +258,7 @@ class UploadCvUseCase:
             RuntimeError: Si erreur de sauvegarde
         """
         try:
-            file_path = self._storage.save_cv(
+            file_path = await self._storage.save_cv(
                 cv_id=cv_id,
                 content=input_data.file_content,
                 filename=input_data.filename
@@ -4,6 +4,7 @@ const API_URL = 'http://localhost:8000';
 // État global
 let currentUser = null;
 let allUsers = [];
+let usersNextCursor = null;
 let allPromoCodes = [];
 
 // Initialisation
@@ -100,24 +101,45 @@ async function loadStats() {
         document.getElementById('stat-admins').textContent = stats.total_admins;
         document.getElementById('stat-promo-codes').textContent = stats.total_promo_codes;
         document.getElementById('stat-redemptions').textContent = stats.total_promo_redemptions;
+        document.getElementById('stat-generations').textContent = stats.total_generations;
+        document.getElementById('stat-success-rate').textContent = `${stats.success_rate}%`;
         
     } catch (error) {
         console.error('Erreur stats:', error);
     }
 }
 
-// Chargement des utilisateurs
-async function loadUsers() {
+// Filtres de la liste des utilisateurs (paramètres de requête)
+function getUsersFilterParams() {
+    const params = new URLSearchParams();
+    const email = document.getElementById('users-email-filter').value.trim();
+    const role = document.getElementById('users-role-filter').value;
+    if (email) params.append('email', email);
+    if (role) params.append('is_admin', role);
+    return params;
+}
+
+// Chargement des utilisateurs (append = page suivante)
+async function loadUsers(append = false) {
     const tbody = document.getElementById('users-tbody');
     
     try {
-        const response = await fetch(`${API_URL}/admin/users`, {
+        const params = getUsersFilterParams();
+        params.append('per_page', 50);
+        if (append && usersNextCursor) {
+            params.append('cursor', usersNextCursor);
+        }
+        
+        const response = await fetch(`${API_URL}/admin/users?${params}`, {
             headers: { 'Authorization': `Bearer ${currentUser.token}` }
         });
         
         if (!response.ok) throw new Error('Erreur chargement utilisateurs');
         
-        allUsers = await response.json();
+        const data = await response.json();
+        allUsers = append ? allUsers.concat(data.items) : data.items;
+        usersNextCursor = data.next_cursor;
+        document.getElementById('users-load-more').style.display = data.has_more ? 'inline-block' : 'none';
         renderUsers();
         
     } catch (error) {
@@ -126,6 +148,28 @@ async function loadUsers() {
     }
 }
 
+// Export CSV des utilisateurs filtrés (streaming côté serveur)
+async function exportUsers() {
+    try {
+        const params = getUsersFilterParams();
+        params.append('format', 'csv');
+        const response = await fetch(`${API_URL}/admin/users/export?${params}`, {
+            headers: { 'Authorization': `Bearer ${currentUser.token}` }
+        });
+        if (!response.ok) throw new Error('Erreur export utilisateurs');
+        
+        const blob = await response.blob();
+        const url = URL.createObjectURL(blob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = `utilisateurs_${new Date().toISOString().slice(0, 10)}.csv`;
+        link.click();
+        URL.revokeObjectURL(url);
+    } catch (error) {
+        console.error('Erreur export:', error);
+    }
+}
+
 // Affichage des utilisateurs
 function renderUsers() {
     const tbody = document.getElementById('users-tbody');
@@ -211,6 +255,16 @@ function renderPromoCodes() {
 
 // Event listeners
 function setupEventListeners() {
+    // Liste des utilisateurs: filtres, pagination, export
+    let usersFilterTimeout;
+    document.getElementById('users-email-filter').addEventListener('input', () => {
+        clearTimeout(usersFilterTimeout);
+        usersFilterTimeout = setTimeout(() => loadUsers(), 400);
+    });
+    document.getElementById('users-role-filter').addEventListener('change', () => loadUsers());
+    document.getElementById('users-load-more').addEventListener('click', () => loadUsers(true));
+    document.getElementById('users-export-btn').addEventListener('click', exportUsers);
+    
     // Gestion des onglets
     document.querySelectorAll('.tab').forEach(tab => {
         tab.addEventListener('click', () => {
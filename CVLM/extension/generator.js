@@ -338,74 +338,115 @@ async function loadCvList() {
 
 // === Liste des lettres générées ===
 
-async function loadLettersList() {
+// Curseur de la page suivante (null: toutes les lettres sont affichées)
+let lettersNextCursor = null;
+
+function renderLetterItem(letter) {
+    const jobTitle = extractJobTitle(letter.job_offer_url);
+    return `
+        <div class="letter-item">
+            <div class="letter-header">
+                <div>
+                    <div class="letter-title">${jobTitle}</div>
+                    <div class="letter-meta">
+                        <span>📄 ${letter.cv_filename}</span>
+                        <span>📅 ${formatDate(letter.created_at)}</span>
+                        ${letter.job_offer_url ? `<span title="${letter.job_offer_url}" style="cursor: help;">🔗 Offre en ligne</span>` : ''}
+                    </div>
+                </div>
+                <button class="letter-download" data-letter-id="${letter.letter_id}">
+                    ⬇️ PDF
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+function bindLetterItems(container) {
+    // Ajouter les event listeners pour télécharger
+    container.querySelectorAll('.letter-download').forEach(btn => {
+        btn.addEventListener('click', async (e) => {
+            const letterId = e.target.dataset.letterId;
+            await downloadLetter(letterId);
+        });
+    });
+
+    // Event listener pour afficher l'URL complète au clic
+    container.querySelectorAll('.letter-item').forEach(item => {
+        item.addEventListener('click', (e) => {
+            if (!e.target.classList.contains('letter-download')) {
+                const url = item.querySelector('[title]')?.getAttribute('title');
+                if (url) {
+                    chrome.tabs.create({ url });
+                }
+            }
+        });
+    });
+}
+
+async function loadLettersList(append = false) {
     const lettersListContainer = document.getElementById('letters-list');
     
     try {
         const headers = authToken ? { 'Authorization': `Bearer ${authToken}` } : {};
         
+        // L'API pagine par curseur: chaque page suivante part de next_cursor
+        const params = new URLSearchParams();
+        if (append && lettersNextCursor) {
+            params.set('cursor', lettersNextCursor);
+        }
+        
         console.log('🔍 Chargement des lettres...');
-        const response = await fetch(`${API_URL}/list-letters`, { headers });
+        const response = await fetch(`${API_URL}/list-letters?${params}`, { headers });
         const data = await response.json();
         
         console.log('📬 Réponse API:', data);
         
         if (!response.ok || !data.letters) {
             console.error('❌ Erreur réponse:', response.status, data);
-            lettersListContainer.innerHTML = '<div class="letters-empty">Aucune lettre générée</div>';
+            if (!append) {
+                lettersListContainer.innerHTML = '<div class="letters-empty">Aucune lettre générée</div>';
+            }
             return;
         }
 
-        if (data.letters.length === 0) {
+        if (!append && data.letters.length === 0) {
             console.log('ℹ️ Aucune lettre trouvée');
             lettersListContainer.innerHTML = '<div class="letters-empty">📝 Vous n\'avez pas encore généré de lettre.<br>Commencez dès maintenant !</div>';
+            lettersNextCursor = null;
             return;
         }
 
         console.log(`✅ ${data.letters.length} lettre(s) trouvée(s)`);
-        lettersListContainer.innerHTML = data.letters.map(letter => {
-            const jobTitle = extractJobTitle(letter.job_offer_url);
-            return `
-                <div class="letter-item">
-                    <div class="letter-header">
-                        <div>
-                            <div class="letter-title">${jobTitle}</div>
-                            <div class="letter-meta">
-                                <span>📄 ${letter.cv_filename}</span>
-                                <span>📅 ${formatDate(letter.created_at)}</span>
-                                ${letter.job_offer_url ? `<span title="${letter.job_offer_url}" style="cursor: help;">🔗 Offre en ligne</span>` : ''}
-                            </div>
-                        </div>
-                        <button class="letter-download" data-letter-id="${letter.letter_id}">
-                            ⬇️ PDF
-                        </button>
-                    </div>
-                </div>
-            `;
-        }).join('');
+        lettersNextCursor = data.has_more ? data.next_cursor : null;
 
-        // Ajouter les event listeners pour télécharger
-        lettersListContainer.querySelectorAll('.letter-download').forEach(btn => {
-            btn.addEventListener('click', async (e) => {
-                const letterId = e.target.dataset.letterId;
-                await downloadLetter(letterId);
-            });
-        });
+        // Page rendue à part: seuls ses éléments reçoivent les event listeners
+        const page = document.createElement('div');
+        page.innerHTML = data.letters.map(renderLetterItem).join('');
+        bindLetterItems(page);
 
-        // Event listener pour afficher l'URL complète au clic
-        lettersListContainer.querySelectorAll('.letter-item').forEach(item => {
-            item.addEventListener('click', (e) => {
-                if (!e.target.classList.contains('letter-download')) {
-                    const url = item.querySelector('[title]')?.getAttribute('title');
-                    if (url) {
-                        chrome.tabs.create({ url });
-                    }
-                }
+        if (!append) {
+            lettersListContainer.innerHTML = '';
+        }
+        lettersListContainer.querySelector('.letters-more')?.remove();
+        lettersListContainer.append(...page.children);
+
+        if (lettersNextCursor) {
+            const moreBtn = document.createElement('button');
+            moreBtn.className = 'letters-more';
+            moreBtn.textContent = 'Afficher plus de lettres';
+            moreBtn.addEventListener('click', async () => {
+                moreBtn.disabled = true;
+                await loadLettersList(true);
+                moreBtn.disabled = false;
             });
-        });
+            lettersListContainer.appendChild(moreBtn);
+        }
     } catch (error) {
         console.error('Erreur chargement lettres:', error);
-        lettersListContainer.innerHTML = '<div class="letters-empty" style="color: var(--error);">❌ Erreur de chargement</div>';
+        if (!append) {
+            lettersListContainer.innerHTML = '<div class="letters-empty" style="color: var(--error);">❌ Erreur de chargement</div>';
+        }
     }
 }
 
@@ -491,6 +532,17 @@ async function deleteCv(cvId) {
 
 // === Génération de lettre ===
 
+// Clé d'idempotence conservée tant que la requête n'a pas abouti:
+// un nouvel essai après coupure réseau rejoue la réponse sans nouveau débit
+let pendingGeneration = null;
+
+function getGenerationIdempotencyKey(signature) {
+    if (!pendingGeneration || pendingGeneration.signature !== signature) {
+        pendingGeneration = { signature, key: crypto.randomUUID() };
+    }
+    return pendingGeneration.key;
+}
+
 if (insertBtn) {
     insertBtn.addEventListener('click', async () => {
         if (!currentUrl) {
@@ -515,6 +567,8 @@ if (insertBtn) {
             form.append('pdf_generator', pdfSelect.value || 'fpdf');
 
             const headers = authToken ? { 'Authorization': `Bearer ${authToken}` } : {};
+            const signature = [selectedCvId, currentUrl, pdfSelect.value || 'fpdf'].join('|');
+            headers['Idempotency-Key'] = getGenerationIdempotencyKey(signature);
 
             const response = await fetch(`${API_URL}/generate-cover-letter`, {
                 method: 'POST',
@@ -522,6 +576,12 @@ if (insertBtn) {
                 body: form
             });
 
+            // Réponse reçue du serveur: la clé ne doit plus être réutilisée
+            // (sauf 409: la requête d'origine est encore en cours)
+            if (response.status !== 409) {
+                pendingGeneration = null;
+            }
+
             if (!response.ok) {
                 const err = await response.json().catch(() => ({}));
                 throw new Error(err.detail || `Erreur serveur ${response.status}`);
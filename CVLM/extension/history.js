@@ -1,6 +1,9 @@
 // Configuration
 const API_BASE_URL = 'http://localhost:8000';
 let currentPage = 1;
+// Curseurs de pagination: pageCursors[i] = curseur de la page i + 1 (page 1 sans curseur)
+let pageCursors = [null];
+let totalPages = null;
 let currentFilters = {
     search: '',
     type: '',
@@ -31,21 +34,22 @@ function setupEventListeners() {
         clearTimeout(searchTimeout);
         searchTimeout = setTimeout(() => {
             currentFilters.search = e.target.value;
-            currentPage = 1;
+            resetPagination();
             loadHistory();
+            loadCompanySuggestions(e.target.value);
         }, 500);
     });
 
     // Filtres
     document.getElementById('periodFilter').addEventListener('change', (e) => {
         currentFilters.period = e.target.value;
-        currentPage = 1;
+        resetPagination();
         loadHistory();
     });
 
     document.getElementById('typeFilter').addEventListener('change', (e) => {
         currentFilters.type = e.target.value;
-        currentPage = 1;
+        resetPagination();
         loadHistory();
     });
 
@@ -61,8 +65,10 @@ function setupEventListeners() {
     });
 
     document.getElementById('nextBtn').addEventListener('click', () => {
-        currentPage++;
-        loadHistory();
+        if (pageCursors[currentPage] !== undefined) {
+            currentPage++;
+            loadHistory();
+        }
     });
 
     // Modal
@@ -146,11 +152,20 @@ async function loadHistory() {
         const token = await getAuthToken();
         
         // Construire l'URL avec les paramètres
+        // Le total n'est calculé que pour la première page, les suivantes passent par le curseur
         const params = new URLSearchParams({
-            page: currentPage,
-            per_page: 50
+            per_page: 50,
+            with_total: currentPage === 1
         });
 
+        // Recherche: résultats triés par pertinence, pagination par page
+        const cursor = pageCursors[currentPage - 1];
+        if (currentFilters.search) {
+            params.append('page', currentPage);
+        } else if (cursor) {
+            params.append('cursor', cursor);
+        }
+
         if (currentFilters.search) {
             params.append('search', currentFilters.search);
         }
@@ -181,7 +196,13 @@ async function loadHistory() {
 
         loadingState.style.display = 'none';
 
-        if (data.total === 0) {
+        if (currentPage === 1) {
+            totalPages = data.pages;
+        }
+        // null = page suivante sans curseur (recherche), undefined = dernière page
+        pageCursors[currentPage] = data.has_more ? data.next_cursor : undefined;
+
+        if (data.items.length === 0 && currentPage === 1) {
             emptyState.style.display = 'block';
             return;
         }
@@ -191,9 +212,9 @@ async function loadHistory() {
         renderHistoryTable(data.items);
 
         // Afficher la pagination si nécessaire
-        if (data.pages > 1) {
+        if (currentPage > 1 || data.has_more) {
             pagination.style.display = 'flex';
-            updatePagination(data.page, data.pages);
+            updatePagination(currentPage, data.has_more);
         }
 
     } catch (error) {
@@ -275,11 +296,53 @@ function renderHistoryTable(items) {
     });
 }
 
+// Autocomplétion des entreprises
+async function loadCompanySuggestions(query) {
+    const datalist = document.getElementById('companySuggestions');
+    if (!query || query.trim().length < 2) {
+        datalist.innerHTML = '';
+        return;
+    }
+
+    try {
+        const token = await getAuthToken();
+        const params = new URLSearchParams({ q: query, limit: 10 });
+        const response = await fetch(`${API_BASE_URL}/user/history/companies?${params}`, {
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+
+        if (!response.ok) {
+            return;
+        }
+
+        const data = await response.json();
+        datalist.innerHTML = '';
+        data.items.forEach(company => {
+            const option = document.createElement('option');
+            option.value = company;
+            datalist.appendChild(option);
+        });
+    } catch (error) {
+        console.error('Erreur autocomplétion:', error);
+    }
+}
+
+// Retour à la première page (changement de filtre)
+function resetPagination() {
+    currentPage = 1;
+    pageCursors = [null];
+    totalPages = null;
+}
+
 // Mise à jour de la pagination
-function updatePagination(page, totalPages) {
-    document.getElementById('pageInfo').textContent = `Page ${page} sur ${totalPages}`;
+function updatePagination(page, hasMore) {
+    document.getElementById('pageInfo').textContent = totalPages
+        ? `Page ${page} sur ${totalPages}`
+        : `Page ${page}`;
     document.getElementById('prevBtn').disabled = page === 1;
-    document.getElementById('nextBtn').disabled = page === totalPages;
+    document.getElementById('nextBtn').disabled = !hasMore;
 }
 
 // Télécharger un fichier
@@ -0,0 +1,72 @@
+"""
+Cache des hash de contenu de fichiers locaux
+
+sha256 d'un fichier gardé en mémoire tant que le fichier (inode, taille, mtime)
+n'a pas changé: un fichier déjà connu n'est jamais relu, une simple stat suffit.
+Utilisé pour retrouver l'objet d'une référence (stockage partitionné) et pour
+les ETags des téléchargements.
+"""
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from cachetools import LRUCache
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ContentDigestCache:
+    """Chemin -> sha256 du contenu, validé par l'identité du fichier"""
+
+    def __init__(self, maxsize: int):
+        self._digests = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _identity(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def remember(self, path: Path, digest: str) -> None:
+        """Enregistre le hash d'un fichier qui vient d'être écrit (évite de le relire)"""
+        identity = self._identity(path)
+        if identity:
+            with self._lock:
+                self._digests[str(path)] = (identity, digest)
+
+    def forget(self, path: Path) -> None:
+        with self._lock:
+            self._digests.pop(str(path), None)
+
+    def get(self, path: Path) -> Optional[str]:
+        """
+        sha256 du contenu du fichier, None s'il n'existe pas
+
+        Servi depuis le cache tant que le fichier n'a pas changé, sinon
+        recalculé en relisant le fichier.
+        """
+        identity = self._identity(path)
+        if identity is None:
+            return None
+
+        key = str(path)
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached and cached[0] == identity:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            self._digests[key] = (identity, digest.hexdigest())
+        return digest.hexdigest()
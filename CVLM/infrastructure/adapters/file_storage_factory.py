@@ -0,0 +1,58 @@
+"""
+Sélection du backend de stockage des fichiers (FILE_STORAGE_BACKEND)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from domain.ports.async_file_storage import AsyncFileStorage
+from domain.ports.file_storage import FileStorage
+from config.constants import (
+    FILE_STORAGE_BACKEND,
+    FILE_STORAGE_BASE_PATH,
+    FILE_STORAGE_LOCAL,
+    FILE_STORAGE_SHARDED,
+    FILE_STORAGE_S3,
+    FILE_STORAGE_IO_WORKERS
+)
+
+
+def create_file_storage(backend: str = FILE_STORAGE_BACKEND) -> FileStorage:
+    """
+    Crée le stockage configuré
+
+    Raises:
+        ValueError: Backend inconnu
+    """
+    if backend == FILE_STORAGE_LOCAL:
+        from infrastructure.adapters.local_file_storage import LocalFileStorage
+        return LocalFileStorage(base_path=FILE_STORAGE_BASE_PATH)
+
+    if backend == FILE_STORAGE_SHARDED:
+        from infrastructure.adapters.sharded_file_storage import ShardedFileStorage
+        return ShardedFileStorage(base_path=FILE_STORAGE_BASE_PATH)
+
+    if backend == FILE_STORAGE_S3:
+        # boto3 requis uniquement pour ce backend
+        from infrastructure.adapters.s3_file_storage import S3FileStorage
+        return S3FileStorage()
+
+    raise ValueError(f"Backend de stockage inconnu: {backend}")
+
+
+@lru_cache(maxsize=None)
+def get_file_storage() -> FileStorage:
+    """Stockage partagé par le processus (cache des chemins commun à toutes les requêtes)"""
+    return create_file_storage()
+
+
+@lru_cache(maxsize=None)
+def get_file_io_executor() -> ThreadPoolExecutor:
+    """Pool de threads dédié aux I/O disque et réseau (stockage, cache de rendus PDF)"""
+    return ThreadPoolExecutor(max_workers=FILE_STORAGE_IO_WORKERS, thread_name_prefix="file-io")
+
+
+@lru_cache(maxsize=None)
+def get_async_file_storage() -> AsyncFileStorage:
+    """Stockage partagé en version asynchrone (I/O dans le pool de threads dédié)"""
+    from infrastructure.adapters.threaded_file_storage import ThreadedFileStorage
+    return ThreadedFileStorage(get_file_storage(), executor=get_file_io_executor())
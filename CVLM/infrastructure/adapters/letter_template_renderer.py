@@ -0,0 +1,89 @@
+"""
+Gabarits HTML des lettres (Jinja2)
+
+Les gabarits (infrastructure/templates/letters/<layout>.html) et leurs feuilles
+de style (<layout>.css) sont chargés et compilés une seule fois par processus.
+Utilisés pour l'aperçu HTML et pour le rendu PDF WeasyPrint.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+from config.constants import LETTER_LAYOUTS, LETTER_LAYOUT_DEFAULT
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "letters"
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+def split_paragraphs(text: str) -> List[List[str]]:
+    """Découpe la lettre en paragraphes (lignes vides), chacun en lignes non vides"""
+    normalized = text.replace("\r\n", "\n").replace("\r", "\n").strip()
+    paragraphs = []
+    for block in _BLANK_LINES.split(normalized):
+        lines = [line.strip() for line in block.split("\n") if line.strip()]
+        if lines:
+            paragraphs.append(lines)
+    return paragraphs
+
+
+class LetterTemplateRenderer:
+    """Gabarits compilés et CSS chargées une fois, rendus HTML à la demande"""
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR):
+        environment = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self._templates: Dict[str, Template] = {
+            layout: environment.get_template(f"{layout}.html") for layout in LETTER_LAYOUTS
+        }
+        self._css: Dict[str, str] = {
+            layout: (template_dir / f"{layout}.css").read_text(encoding="utf-8") for layout in LETTER_LAYOUTS
+        }
+
+    @staticmethod
+    def resolve_layout(layout: str) -> str:
+        """
+        Valide un nom de gabarit
+
+        Raises:
+            ValueError: Gabarit inconnu
+        """
+        layout = (layout or LETTER_LAYOUT_DEFAULT).lower()
+        if layout not in LETTER_LAYOUTS:
+            raise ValueError(f"Mise en page inconnue: {layout} (disponibles: {', '.join(LETTER_LAYOUTS)})")
+        return layout
+
+    def css(self, layout: str) -> str:
+        return self._css[self.resolve_layout(layout)]
+
+    def render_html(self, text: str, layout: str = LETTER_LAYOUT_DEFAULT, inline_css: bool = True) -> str:
+        """
+        Rend la lettre en page HTML
+
+        Args:
+            text: Texte brut de la lettre (échappé, jamais interprété comme du HTML)
+            layout: Nom du gabarit
+            inline_css: Inclure la feuille de style dans la page (aperçu). Pour le PDF,
+                la CSS est passée pré-parsée à WeasyPrint.
+        """
+        layout = self.resolve_layout(layout)
+        return self._templates[layout].render(
+            layout=layout,
+            paragraphs=split_paragraphs(text),
+            inline_css=inline_css,
+            css=self._css[layout]
+        )
+
+
+@lru_cache(maxsize=None)
+def get_letter_template_renderer() -> LetterTemplateRenderer:
+    """Renderer partagé par le processus"""
+    return LetterTemplateRenderer()
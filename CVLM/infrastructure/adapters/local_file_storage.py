@@ -4,11 +4,15 @@ Stocke les fichiers sur le système de fichiers local
 """
 from pathlib import Path
 from typing import Optional
+import hashlib
 import os
 import shutil
+import threading
 
 from domain.ports.file_storage import FileStorage
+from infrastructure.adapters.content_digest_cache import ContentDigestCache
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import FILE_STORAGE_PATH_CACHE_SIZE
 
 logger = setup_logger(__name__)
 
@@ -25,6 +29,8 @@ class LocalFileStorage(FileStorage):
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Hash des fichiers servis (ETags): calculé une fois par version de fichier
+        self._digests = ContentDigestCache(FILE_STORAGE_PATH_CACHE_SIZE)
     
     def save_file(self, file_content: bytes, filename: str, subfolder: str = "") -> str:
         """
@@ -123,6 +129,7 @@ class LocalFileStorage(FileStorage):
         
         with open(file_path, 'wb') as f:
             f.write(content)
+        self._digests.remember(file_path, hashlib.sha256(content).hexdigest())
         
         return str(file_path)
     
@@ -185,8 +192,12 @@ class LocalFileStorage(FileStorage):
         # Nom du fichier : letter_{id}.pdf
         file_path = letter_dir / f"letter_{letter_id}.pdf"
         
-        with open(file_path, 'wb') as f:
+        # Écriture atomique: un rendu à la demande concurrent ne lit jamais un PDF partiel
+        tmp_path = letter_dir / f".letter_{letter_id}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
             f.write(content)
+        os.replace(tmp_path, file_path)
+        self._digests.remember(file_path, hashlib.sha256(content).hexdigest())
         
         return str(file_path)
     
@@ -230,6 +241,19 @@ class LocalFileStorage(FileStorage):
             return False
 
     
+    def get_etag(self, path: str) -> Optional[str]:
+        """
+        ETag fort: sha256 du contenu, relu seulement si le fichier a changé
+        
+        Args:
+            path: Chemin retourné par save_cv/save_letter
+        
+        Returns:
+            ETag entre guillemets, ou None si le fichier n'existe pas
+        """
+        digest = self._digests.get(Path(path))
+        return f'"{digest}"' if digest else None
+    
     def get_absolute_path(self, file_path: str) -> str:
         """
         Récupère le chemin absolu d'un fichier
@@ -0,0 +1,185 @@
+"""
+Cache des rendus PDF adressé par contenu
+
+Clé = sha256(générateur, version du gabarit, mise en page, texte): un même
+texte rendu avec le même générateur et le même gabarit donne le même PDF, relu depuis
+le disque au lieu d'être re-rendu. Fichiers rangés par préfixe de hash
+(ab/abcdef….pdf), éviction LRU (date d'accès = mtime) au-delà de max_bytes.
+
+En asynchrone, lectures, écritures et évictions passent par le pool d'I/O
+fichiers: seul le rendu lui-même (pool WeasyPrint, thread FPDF) reste à attendre.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import Executor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from domain.ports.pdf_generator import PdfGenerator, Document
+from infrastructure.adapters.logger_config import setup_logger
+from config.constants import PDF_RENDER_CACHE_DIR, PDF_RENDER_CACHE_MAX_BYTES
+
+logger = setup_logger(__name__)
+
+
+class PdfRenderCache:
+    """Répertoire de PDFs adressés par hash, borné en taille"""
+
+    def __init__(self, base_path: str = PDF_RENDER_CACHE_DIR, max_bytes: int = PDF_RENDER_CACHE_MAX_BYTES):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Taille suivie en mémoire, recalculée au démarrage et à chaque éviction
+        self._size = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def make_key(generator: str, template_version: str, text: str, layout: str = "") -> str:
+        digest = hashlib.sha256()
+        for part in (generator, template_version, layout, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.base_path / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Lecture cache PDF impossible {key}: {e}")
+            return None
+
+        try:
+            # Marque l'entrée comme récemment utilisée pour l'éviction LRU
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(content)
+        except OSError as e:
+            logger.warning(f"Écriture cache PDF impossible {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            try:
+                # Entrée déjà présente (rendus concurrents du même texte): seul l'écart de taille compte
+                try:
+                    previous_size = path.stat().st_size
+                except FileNotFoundError:
+                    previous_size = 0
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Écriture cache PDF impossible {key}: {e}")
+                tmp_path.unlink(missing_ok=True)
+                return
+
+            self._size += len(content) - previous_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """(chemin, taille, date d'accès) de chaque PDF en cache"""
+        for path in self.base_path.glob("*/*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self) -> None:
+        """Supprime les PDFs les moins récemment utilisés jusqu'à 90% de max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Éviction cache PDF impossible {path.name}: {e}")
+                continue
+            size -= entry_size
+            removed += 1
+
+        self._size = size
+        logger.info(f"Cache PDF: {removed} rendu(s) évincé(s), {size} bytes conservés")
+
+
+class CachedPdfGenerator(PdfGenerator):
+    """Générateur placé derrière le cache: un rendu déjà fait est relu depuis le disque"""
+
+    def __init__(
+        self,
+        generator: PdfGenerator,
+        cache: PdfRenderCache,
+        layout: str = "",
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            generator: Générateur réel, appelé seulement si le rendu n'est pas en cache
+            cache: Cache des rendus
+            layout: Mise en page rendue par le générateur ("" s'il n'en a qu'une)
+            executor: Pool d'I/O des accès au cache en asynchrone (défaut: pool de la boucle)
+        """
+        self.generator = generator
+        self.cache = cache
+        self.layout = layout
+        self.executor = executor
+
+    def _key(self, document: Document) -> str:
+        return self.cache.make_key(
+            self.generator.name, self.generator.template_version, document.raw_text, self.layout
+        )
+
+    def render_pdf(self, document: Document) -> bytes:
+        key = self._key(document)
+
+        content = self.cache.get(key)
+        if content is not None:
+            logger.debug(f"Rendu PDF servi depuis le cache: {key[:12]}")
+            return content
+
+        content = self.generator.render_pdf(document)
+        self.cache.put(key, content)
+        return content
+
+    async def render_pdf_async(self, document: Document) -> bytes:
+        loop = asyncio.get_running_loop()
+        key = self._key(document)
+
+        content = await loop.run_in_executor(self.executor, self.cache.get, key)
+        if content is not None:
+            logger.debug(f"Rendu PDF servi depuis le cache: {key[:12]}")
+            return content
+
+        content = await self.generator.render_pdf_async(document)
+        # Écriture et éventuelle éviction (parcours du cache) hors de la boucle d'événements
+        await loop.run_in_executor(self.executor, self.cache.put, key, content)
+        return content
+
+
+@lru_cache(maxsize=None)
+def get_pdf_render_cache() -> PdfRenderCache:
+    """Cache partagé par le processus"""
+    return PdfRenderCache()
@@ -0,0 +1,213 @@
+"""
+Implémentation PostgreSQL du journal et des réservations de crédits
+"""
+from typing import Optional
+from datetime import datetime
+import uuid
+from sqlalchemy import update, select, func, literal
+from sqlalchemy.orm import Session
+
+from domain.entities.credit_reservation import CreditReservation
+from domain.ports.credit_ledger_repository import CreditLedgerRepository
+from infrastructure.database.models import (
+    UserModel,
+    CreditLedgerModel,
+    CreditReservationModel,
+    CreditBalanceSnapshotModel
+)
+from infrastructure.adapters.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PostgresCreditLedgerRepository(CreditLedgerRepository):
+    """
+    Repository PostgreSQL pour les réservations de crédits
+
+    Le solde disponible reste sur users.<type>_credits (lecture O(1)),
+    chaque mouvement est tracé dans credit_ledger dans la même transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _credit_column(credit_type: str):
+        """Colonne de solde correspondant au type de crédit"""
+        if credit_type == "pdf":
+            return UserModel.pdf_credits
+        if credit_type == "text":
+            return UserModel.text_credits
+        raise ValueError(f"Type de crédit inconnu: {credit_type}")
+
+    def reserve(self, user_id: str, credit_type: str, expires_at: datetime) -> Optional[CreditReservation]:
+        """Réserve un crédit: UPDATE conditionnel + réservation + journal en une transaction"""
+        column = self._credit_column(credit_type)
+        now = datetime.now()
+
+        try:
+            remaining = self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == user_id, column > 0)
+                .values({column: column - 1, UserModel.updated_at: now})
+                .returning(column)
+            ).scalar_one_or_none()
+
+            if remaining is None:
+                self.db.rollback()
+                return None
+
+            reservation_id = str(uuid.uuid4())
+            self.db.add(CreditReservationModel(
+                id=reservation_id,
+                user_id=user_id,
+                credit_type=credit_type,
+                status='reserved',
+                created_at=now,
+                expires_at=expires_at
+            ))
+            self.db.add(CreditLedgerModel(
+                user_id=user_id,
+                credit_type=credit_type,
+                delta=-1,
+                reason='reserve',
+                reservation_id=reservation_id,
+                balance_after=remaining,
+                created_at=now
+            ))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+        return CreditReservation(
+            id=reservation_id,
+            user_id=user_id,
+            credit_type=credit_type,
+            status='reserved',
+            balance_after=remaining,
+            created_at=now,
+            expires_at=expires_at
+        )
+
+    def commit(self, reservation_id: str) -> bool:
+        """Confirme une réservation en attente"""
+        now = datetime.now()
+
+        try:
+            row = self.db.execute(
+                update(CreditReservationModel)
+                .where(
+                    CreditReservationModel.id == reservation_id,
+                    CreditReservationModel.status == 'reserved'
+                )
+                .values(status='committed', resolved_at=now)
+                .returning(CreditReservationModel.user_id, CreditReservationModel.credit_type)
+            ).first()
+
+            if row is None:
+                # Aucune écriture: pas de rollback (annulerait l'unité de travail englobante)
+                return False
+
+            self.db.add(CreditLedgerModel(
+                user_id=row.user_id,
+                credit_type=row.credit_type,
+                delta=0,
+                reason='commit',
+                reservation_id=reservation_id,
+                created_at=now
+            ))
+            self.db.commit()
+            return True
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    def release(self, reservation_id: str, reason: str = 'release') -> Optional[int]:
+        """Restitue le crédit: statut conditionnel + incrément du solde + journal"""
+        now = datetime.now()
+        status = 'expired' if reason == 'expire' else 'released'
+
+        try:
+            row = self.db.execute(
+                update(CreditReservationModel)
+                .where(
+                    CreditReservationModel.id == reservation_id,
+                    CreditReservationModel.status == 'reserved'
+                )
+                .values(status=status, resolved_at=now)
+                .returning(CreditReservationModel.user_id, CreditReservationModel.credit_type)
+            ).first()
+
+            if row is None:
+                self.db.rollback()
+                return None
+
+            column = self._credit_column(row.credit_type)
+            balance = self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == row.user_id)
+                .values({column: column + 1, UserModel.updated_at: now})
+                .returning(column)
+            ).scalar_one_or_none()
+
+            self.db.add(CreditLedgerModel(
+                user_id=row.user_id,
+                credit_type=row.credit_type,
+                delta=1,
+                reason=reason,
+                reservation_id=reservation_id,
+                balance_after=balance,
+                created_at=now
+            ))
+            self.db.commit()
+            return balance
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    def release_expired(self, now: datetime, user_id: Optional[str] = None) -> int:
+        """Restitue les réservations expirées (index sur expires_at)"""
+        query = select(CreditReservationModel.id).where(
+            CreditReservationModel.status == 'reserved',
+            CreditReservationModel.expires_at < now
+        )
+        if user_id:
+            query = query.where(CreditReservationModel.user_id == user_id)
+
+        expired_ids = self.db.execute(query).scalars().all()
+
+        # Chaque libération est conditionnelle (status='reserved'): pas de double restitution
+        released = sum(
+            1 for reservation_id in expired_ids
+            if self.release(reservation_id, reason='expire') is not None
+        )
+
+        if released:
+            logger.info(f"Réservations de crédits expirées restituées: {released}")
+        return released
+
+    def take_snapshots(self) -> int:
+        """INSERT ... SELECT des soldes courants avec la dernière entrée du journal"""
+        last_ledger_id = select(func.max(CreditLedgerModel.id)).scalar_subquery()
+
+        stmt = CreditBalanceSnapshotModel.__table__.insert().from_select(
+            ['user_id', 'pdf_credits', 'text_credits', 'last_ledger_id', 'created_at'],
+            select(
+                UserModel.id,
+                UserModel.pdf_credits,
+                UserModel.text_credits,
+                last_ledger_id,
+                literal(datetime.now())
+            )
+        )
+
+        try:
+            result = self.db.execute(stmt)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+        logger.info(f"Snapshots de soldes enregistrés: {result.rowcount}")
+        return result.rowcount
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 import uuid
 
 from domain.ports.cv_repository import CvRepository
-from domain.entities.cv import Cv
+from domain.entities.cv import Cv, CvSummary
 from infrastructure.database.models import CvModel
 from infrastructure.database.config import get_session_factory
 
@@ -86,6 +86,22 @@ class PostgresCvRepository(CvRepository):
             if not self._external_session:
                 session.close()
     
+    def list_summaries(self, user_id: str) -> List[CvSummary]:
+        """SELECT des seules colonnes affichées: raw_text n'est jamais chargé"""
+        session = self._get_session()
+        try:
+            rows = session.query(
+                CvModel.id,
+                CvModel.filename,
+                CvModel.file_path,
+                CvModel.file_size,
+                CvModel.created_at
+            ).filter(CvModel.user_id == user_id).all()
+            return [CvSummary(*row) for row in rows]
+        finally:
+            if not self._external_session:
+                session.close()
+    
     def update(self, cv: Cv) -> Cv:
         session = self._get_session()
         try:
@@ -2,19 +2,71 @@
 Implémentation PostgreSQL du repository GenerationHistory
 """
 from typing import Optional, List, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_, func
-from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import desc, or_, func, text, inspect, cast, Date, update, any_, literal, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, date, timedelta
 import uuid
 import math
+import unicodedata
 
 from domain.entities.generation_history import GenerationHistory
 from domain.ports.generation_history_repository import GenerationHistoryRepository
-from infrastructure.database.models import GenerationHistoryModel
+from infrastructure.database.models import GenerationHistoryModel, UserGenerationStatsModel
+from infrastructure.database.pagination import paginate_by_cursor, encode_cursor
 from infrastructure.adapters.logger_config import setup_logger
 
 logger = setup_logger(__name__)
 
+# Reconstruction des statistiques depuis generation_history (INSERT ... SELECT GROUP BY)
+_REBUILD_STATS_SQL = """
+INSERT INTO user_generation_stats (
+    user_id, total_count, pdf_count, text_count, success_count, failed_count,
+    last_generation_at, month_bucket, month_count, company_counts, unique_companies, updated_at
+)
+SELECT
+    h.user_id,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE h.type = 'pdf'),
+    COUNT(*) FILTER (WHERE h.type = 'text'),
+    COUNT(*) FILTER (WHERE h.status = 'success'),
+    COUNT(*) FILTER (WHERE h.status <> 'success'),
+    MAX(h.created_at),
+    :month_bucket,
+    COUNT(*) FILTER (WHERE h.created_at >= :month_bucket),
+    COALESCE(c.company_counts, '{{}}'::jsonb),
+    COALESCE(c.unique_companies, 0),
+    :now
+FROM generation_history h
+LEFT JOIN (
+    SELECT user_id, jsonb_object_agg(company_name, n) AS company_counts, COUNT(*) AS unique_companies
+    FROM (
+        SELECT user_id, company_name, COUNT(*) AS n
+        FROM generation_history
+        WHERE company_name IS NOT NULL {user_filter}
+        GROUP BY user_id, company_name
+    ) per_company
+    GROUP BY user_id
+) c ON c.user_id = h.user_id
+WHERE TRUE {user_filter_h}
+GROUP BY h.user_id, c.company_counts, c.unique_companies
+ON CONFLICT (user_id) DO NOTHING
+"""
+
+
+# Colonnes volumineuses exclues des listes (chargées par les endpoints de détail)
+_LIST_DEFERRED_COLUMNS = (
+    defer(GenerationHistoryModel.text_content, raiseload=True),
+    defer(GenerationHistoryModel.error_message, raiseload=True),
+)
+
+
+def _normalize(value: str) -> str:
+    """Minuscules sans accents (équivalent Python de cvlm_unaccent pour l'autocomplétion)"""
+    decomposed = unicodedata.normalize("NFKD", value.strip().lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
 
 class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
     """Implémentation PostgreSQL pour l'historique des générations"""
@@ -30,8 +82,13 @@ class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
         if not history.created_at:
             history.created_at = datetime.now()
         
+        # Verrouiller les statistiques AVANT l'insertion (initialisation paresseuse
+        # depuis l'historique existant), puis incrémenter dans la même transaction
+        stats = self._lock_user_stats(history.user_id)
+        
         model = self._entity_to_model(history)
         self.db.add(model)
+        self._apply_to_stats(stats, history, 1)
         self.db.commit()
         self.db.refresh(model)
         
@@ -53,22 +110,31 @@ class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
         per_page: int = 50,
         search: Optional[str] = None,
         type_filter: Optional[str] = None,
-        period_days: Optional[int] = None
+        period_days: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+        with_content: bool = False
     ) -> Dict:
-        """Récupère l'historique d'un utilisateur avec pagination et filtres"""
+        """
+        Récupère l'historique d'un utilisateur avec pagination et filtres
+        
+        Mode curseur (cursor fourni): keyset sur (created_at, id), sans OFFSET.
+        Mode offset (compatibilité): page/per_page.
+        Sans filtre, le total est lu dans user_generation_stats (clé primaire).
+        Avec recherche (mode offset), les résultats sont triés par pertinence.
+        text_content/error_message ne sont chargés que si with_content (export).
+        """
         query = self.db.query(GenerationHistoryModel).filter(
             GenerationHistoryModel.user_id == user_id
         )
+        if not with_content:
+            query = query.options(*_LIST_DEFERRED_COLUMNS)
         
-        # Filtre recherche (entreprise ou poste)
+        # Filtre recherche (entreprise ou poste) via les index trigrammes
+        ranking = None
+        search = search.strip() if search else None
         if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    GenerationHistoryModel.job_title.ilike(search_pattern),
-                    GenerationHistoryModel.company_name.ilike(search_pattern)
-                )
-            )
+            query, ranking = self._apply_search(query, search)
         
         # Filtre par type
         if type_filter and type_filter in ['pdf', 'text']:
@@ -79,78 +145,141 @@ class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
             since_date = datetime.now() - timedelta(days=period_days)
             query = query.filter(GenerationHistoryModel.created_at >= since_date)
         
-        # Total
-        total = query.count()
+        # Total (optionnel)
+        total = None
+        if with_total:
+            is_filtered = bool(search or type_filter in ['pdf', 'text'] or period_days)
+            total = query.count() if is_filtered else self.get_user_stats(user_id)["total"]
         
-        # Pagination
-        items = query.order_by(
-            desc(GenerationHistoryModel.created_at)
-        ).offset((page - 1) * per_page).limit(per_page).all()
+        return self._paginate(query, page, per_page, cursor, total, ranking)
+    
+    @staticmethod
+    def _apply_search(query, search: str):
+        """
+        Filtre ILIKE insensible aux accents et score de pertinence
         
-        return {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "pages": math.ceil(total / per_page) if total > 0 else 0,
-            "items": [self._model_to_entity(item) for item in items]
-        }
+        Les expressions cvlm_unaccent(colonne) correspondent aux index GIN
+        gin_trgm_ops (infrastructure.database.search).
+        """
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = func.cvlm_unaccent(f"%{escaped}%")
+        term = func.cvlm_unaccent(search)
+        job_title = func.cvlm_unaccent(GenerationHistoryModel.job_title)
+        company_name = func.cvlm_unaccent(GenerationHistoryModel.company_name)
+        
+        query = query.filter(
+            or_(
+                job_title.ilike(pattern),
+                company_name.ilike(pattern)
+            )
+        )
+        ranking = func.greatest(
+            func.coalesce(func.word_similarity(term, job_title), 0),
+            func.coalesce(func.word_similarity(term, company_name), 0)
+        )
+        return query, ranking
     
     def get_user_stats(self, user_id: str) -> Dict:
-        """Récupère les statistiques d'un utilisateur"""
-        # Total générations
-        total = self.db.query(GenerationHistoryModel).filter(
-            GenerationHistoryModel.user_id == user_id
-        ).count()
-        
-        # Par type
-        pdf_count = self.db.query(GenerationHistoryModel).filter(
-            GenerationHistoryModel.user_id == user_id,
-            GenerationHistoryModel.type == 'pdf'
-        ).count()
-        
-        text_count = self.db.query(GenerationHistoryModel).filter(
-            GenerationHistoryModel.user_id == user_id,
-            GenerationHistoryModel.type == 'text'
-        ).count()
-        
-        # Taux de succès
-        success_count = self.db.query(GenerationHistoryModel).filter(
-            GenerationHistoryModel.user_id == user_id,
-            GenerationHistoryModel.status == 'success'
-        ).count()
-        
-        success_rate = (success_count / total * 100) if total > 0 else 0
-        
-        # Ce mois-ci
-        first_day_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        this_month = self.db.query(GenerationHistoryModel).filter(
-            GenerationHistoryModel.user_id == user_id,
-            GenerationHistoryModel.created_at >= first_day_month
-        ).count()
+        """
+        Récupère les statistiques d'un utilisateur
+        Lecture par clé primaire dans user_generation_stats (indépendante du volume d'historique)
+        """
+        stats = self.db.get(UserGenerationStatsModel, user_id)
         
-        # Dernière génération
-        last_gen = self.db.query(GenerationHistoryModel).filter(
-            GenerationHistoryModel.user_id == user_id
-        ).order_by(desc(GenerationHistoryModel.created_at)).first()
+        if stats is None:
+            # Première lecture: construire la ligne depuis l'historique existant
+            self._initialize_user_stats(user_id)
+            self.db.commit()
+            stats = self.db.get(UserGenerationStatsModel, user_id)
         
-        # Nombre d'entreprises uniques
-        companies = self.db.query(
-            func.count(func.distinct(GenerationHistoryModel.company_name))
-        ).filter(
-            GenerationHistoryModel.user_id == user_id,
-            GenerationHistoryModel.company_name.isnot(None)
-        ).scalar() or 0
+        total = stats.total_count
+        success_rate = (stats.success_count / total * 100) if total > 0 else 0
+        this_month = stats.month_count if stats.month_bucket == self._current_month() else 0
         
         return {
             "total": total,
-            "pdf_count": pdf_count,
-            "text_count": text_count,
+            "pdf_count": stats.pdf_count,
+            "text_count": stats.text_count,
             "success_rate": round(success_rate, 1),
             "this_month": this_month,
-            "last_generation": last_gen.created_at if last_gen else None,
-            "unique_companies": companies
+            "last_generation": stats.last_generation_at,
+            "unique_companies": stats.unique_companies
         }
     
+    def count_all(self) -> int:
+        """COUNT(*) sur generation_history (parcours d'index, résultat mis en cache côté service)"""
+        return self.db.query(func.count(GenerationHistoryModel.id)).scalar() or 0
+    
+    def get_daily_generation_stats(self, since: datetime) -> List[Dict]:
+        """GROUP BY jour, provider sur la fenêtre demandée (index sur created_at)"""
+        day = cast(GenerationHistoryModel.created_at, Date)
+        provider = func.coalesce(GenerationHistoryModel.llm_provider, 'unknown')
+        rows = self.db.query(
+            day.label("day"),
+            provider.label("llm_provider"),
+            func.count().label("total"),
+            func.count().filter(GenerationHistoryModel.status == 'success').label("success")
+        ).filter(
+            GenerationHistoryModel.created_at >= since
+        ).group_by(day, provider).order_by(day, provider).all()
+        
+        return [
+            {"day": row.day, "llm_provider": row.llm_provider, "total": row.total, "success": row.success}
+            for row in rows
+        ]
+    
+    def get_company_suggestions(self, user_id: str, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Autocomplétion des entreprises d'un utilisateur
+        
+        Lit company_counts de user_generation_stats (clé primaire) plutôt que
+        l'historique: le coût dépend du nombre d'entreprises, pas de générations.
+        Tri: début du nom, puis début d'un mot, puis sous-chaîne; à égalité,
+        les entreprises les plus fréquentes d'abord.
+        """
+        stats = self.db.get(UserGenerationStatsModel, user_id)
+        if stats is None:
+            self._initialize_user_stats(user_id)
+            self.db.commit()
+            stats = self.db.get(UserGenerationStatsModel, user_id)
+        
+        term = _normalize(prefix)
+        suggestions = []
+        for company, count in (stats.company_counts or {}).items():
+            name = _normalize(company)
+            if name.startswith(term):
+                rank = 0
+            elif f" {term}" in f" {name}":
+                rank = 1
+            elif term in name:
+                rank = 2
+            else:
+                continue
+            suggestions.append((rank, -count, company))
+        
+        suggestions.sort()
+        return [company for _, _, company in suggestions[:limit]]
+    
+    def rebuild_user_stats(self, user_id: Optional[str] = None) -> int:
+        """
+        Reconstruit les statistiques depuis generation_history (job de réparation)
+        Tous les utilisateurs si user_id est None. Retourne le nombre de lignes reconstruites.
+        """
+        try:
+            delete_query = self.db.query(UserGenerationStatsModel)
+            if user_id:
+                delete_query = delete_query.filter(UserGenerationStatsModel.user_id == user_id)
+            delete_query.delete(synchronize_session=False)
+            
+            rebuilt = self._initialize_user_stats(user_id, with_empty_row=user_id is not None)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        logger.info(f"Statistiques d'historique reconstruites: {rebuilt} utilisateur(s)")
+        return rebuilt
+    
     def update(self, history: GenerationHistory) -> GenerationHistory:
         """Met à jour une entrée (pour régénération)"""
         model = self.db.query(GenerationHistoryModel).filter(
@@ -181,47 +310,258 @@ class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
         ).first()
         
         if model:
+            stats = self._lock_user_stats(model.user_id)
+            entity = self._model_to_entity(model)
+            
             self.db.delete(model)
+            self.db.flush()
+            self._apply_to_stats(stats, entity, -1)
             self.db.commit()
             logger.info(f"Historique supprimé: {history_id}")
     
     def get_expired_files(self) -> List[GenerationHistory]:
         """Récupère les entrées avec fichiers expirés (pour cleanup)"""
-        models = self.db.query(GenerationHistoryModel).filter(
+        models = self.db.query(GenerationHistoryModel).options(*_LIST_DEFERRED_COLUMNS).filter(
             GenerationHistoryModel.file_expires_at < datetime.now(),
             GenerationHistoryModel.file_path.isnot(None)
         ).all()
         
         return [self._model_to_entity(model) for model in models]
     
+    def lock_expired_files(self, limit: int, exclude_ids: Optional[List[str]] = None) -> List[GenerationHistory]:
+        """
+        SELECT ... FOR UPDATE SKIP LOCKED sur l'index partiel ix_generation_history_expiring_files:
+        plusieurs nœuds peuvent nettoyer en parallèle sans traiter les mêmes lignes
+        """
+        query = self.db.query(
+            GenerationHistoryModel.id,
+            GenerationHistoryModel.file_path
+        ).filter(
+            GenerationHistoryModel.file_expires_at < datetime.now(),
+            GenerationHistoryModel.file_path.isnot(None)
+        )
+        if exclude_ids:
+            query = query.filter(GenerationHistoryModel.id.notin_(exclude_ids))
+        
+        rows = query.order_by(
+            GenerationHistoryModel.file_expires_at
+        ).limit(limit).with_for_update(skip_locked=True).all()
+        
+        # Projection: seuls id et file_path sont utiles au nettoyage
+        return [
+            GenerationHistory(id=row.id, user_id="", type='pdf', file_path=row.file_path)
+            for row in rows
+        ]
+    
+    def clear_file_paths(self, history_ids: List[str]) -> int:
+        """UPDATE generation_history SET file_path = NULL WHERE id = ANY(:ids)"""
+        try:
+            cleared = 0
+            if history_ids:
+                cleared = self.db.execute(
+                    update(GenerationHistoryModel)
+                    .where(GenerationHistoryModel.id == any_(literal(history_ids, ARRAY(String))))
+                    .values(file_path=None)
+                ).rowcount
+            self.db.commit()
+            return cleared
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    def rollback(self) -> None:
+        self.db.rollback()
+    
     def get_all_with_pagination(
         self,
         page: int = 1,
         per_page: int = 50,
-        user_filter: Optional[str] = None
+        user_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True
     ) -> Dict:
-        """Récupère tout l'historique (admin) avec pagination"""
-        query = self.db.query(GenerationHistoryModel)
+        """
+        Récupère tout l'historique (admin) avec pagination
+        
+        Sans filtre utilisateur, le total est une estimation (pg_class.reltuples)
+        pour éviter un COUNT(*) complet de la table. Avec filtre, il est lu dans
+        user_generation_stats, ou compté sur l'historique filtré si la ligne n'existe pas.
+        """
+        query = self.db.query(GenerationHistoryModel).options(*_LIST_DEFERRED_COLUMNS)
         
+        total = None
+        total_is_estimate = False
         if user_filter:
             query = query.filter(GenerationHistoryModel.user_id == user_filter)
+            if with_total:
+                # Lecture seule: un filtre sur un utilisateur inconnu (faute de frappe)
+                # ne crée pas de ligne user_generation_stats, contrairement à get_user_stats
+                stats = self.db.get(UserGenerationStatsModel, user_filter)
+                total = stats.total_count if stats is not None else query.order_by(None).count()
+        elif with_total:
+            total = self._estimate_row_count()
+            total_is_estimate = True
         
-        total = query.count()
+        result = self._paginate(query, page, per_page, cursor, total)
+        result["total_is_estimate"] = total_is_estimate
+        return result
+    
+    def _paginate(
+        self,
+        query,
+        page: int,
+        per_page: int,
+        cursor: Optional[str],
+        total: Optional[int],
+        ranking=None
+    ) -> Dict:
+        """
+        Pagination keyset si curseur, sinon offset (compatibilité)
         
-        items = query.order_by(
-            desc(GenerationHistoryModel.created_at)
-        ).offset((page - 1) * per_page).limit(per_page).all()
+        Un tri par pertinence (ranking) n'est possible qu'en mode offset:
+        aucun curseur n'est alors émis.
+        """
+        if cursor:
+            items, next_cursor = paginate_by_cursor(
+                query,
+                GenerationHistoryModel.created_at,
+                GenerationHistoryModel.id,
+                per_page,
+                cursor
+            )
+            page = None
+            has_more = next_cursor is not None
+        elif ranking is not None:
+            rows = query.order_by(
+                desc(ranking),
+                desc(GenerationHistoryModel.created_at),
+                desc(GenerationHistoryModel.id)
+            ).offset((page - 1) * per_page).limit(per_page + 1).all()
+            items = rows[:per_page]
+            next_cursor = None
+            has_more = len(rows) > per_page
+        else:
+            # Même ordre que le mode curseur pour pouvoir basculer depuis n'importe quelle page
+            rows = query.order_by(
+                desc(GenerationHistoryModel.created_at),
+                desc(GenerationHistoryModel.id)
+            ).offset((page - 1) * per_page).limit(per_page + 1).all()
+            items = rows[:per_page]
+            next_cursor = (
+                encode_cursor(items[-1].created_at, items[-1].id)
+                if len(rows) > per_page else None
+            )
+            has_more = next_cursor is not None
         
         return {
             "total": total,
             "page": page,
             "per_page": per_page,
-            "pages": math.ceil(total / per_page) if total > 0 else 0,
+            "pages": math.ceil(total / per_page) if total is not None else None,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
             "items": [self._model_to_entity(item) for item in items]
         }
     
+    def _estimate_row_count(self) -> int:
+        """Nombre de lignes estimé par PostgreSQL (mis à jour par ANALYZE/autovacuum)"""
+        estimate = self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'generation_history'")
+        ).scalar()
+        return max(int(estimate or 0), 0)
+    
+    # === Statistiques incrémentales ===
+    
+    @staticmethod
+    def _current_month() -> date:
+        """Premier jour du mois courant"""
+        return date.today().replace(day=1)
+    
+    def _initialize_user_stats(self, user_id: Optional[str] = None, with_empty_row: bool = True) -> int:
+        """
+        INSERT ... SELECT des statistiques depuis l'historique (ON CONFLICT DO NOTHING)
+        Un utilisateur sans historique reçoit une ligne vide si with_empty_row
+        """
+        user_filter = "AND user_id = :user_id" if user_id else ""
+        user_filter_h = "AND h.user_id = :user_id" if user_id else ""
+        sql = text(_REBUILD_STATS_SQL.format(user_filter=user_filter, user_filter_h=user_filter_h))
+        
+        params = {"month_bucket": self._current_month(), "now": datetime.now()}
+        if user_id:
+            params["user_id"] = user_id
+        
+        inserted = self.db.execute(sql, params).rowcount
+        
+        if user_id and with_empty_row and not inserted:
+            self.db.execute(
+                insert(UserGenerationStatsModel)
+                .values(user_id=user_id, company_counts={}, month_bucket=self._current_month())
+                .on_conflict_do_nothing(index_elements=['user_id'])
+            )
+        
+        return inserted
+    
+    def _lock_user_stats(self, user_id: str) -> UserGenerationStatsModel:
+        """Récupère la ligne de statistiques (SELECT ... FOR UPDATE), créée si absente"""
+        stats = self.db.query(UserGenerationStatsModel).filter(
+            UserGenerationStatsModel.user_id == user_id
+        ).with_for_update().first()
+        
+        if stats is None:
+            self._initialize_user_stats(user_id)
+            stats = self.db.query(UserGenerationStatsModel).filter(
+                UserGenerationStatsModel.user_id == user_id
+            ).with_for_update().first()
+        
+        return stats
+    
+    def _apply_to_stats(self, stats: UserGenerationStatsModel, history: GenerationHistory, sign: int) -> None:
+        """Applique l'ajout (+1) ou la suppression (-1) d'une entrée aux compteurs"""
+        stats.total_count += sign
+        if history.type == 'pdf':
+            stats.pdf_count += sign
+        elif history.type == 'text':
+            stats.text_count += sign
+        
+        if history.status == 'success':
+            stats.success_count += sign
+        else:
+            stats.failed_count += sign
+        
+        # Mois courant: remise à zéro au changement de mois
+        current_month = self._current_month()
+        if stats.month_bucket != current_month:
+            stats.month_bucket = current_month
+            stats.month_count = 0
+        if history.created_at and history.created_at.date() >= current_month:
+            stats.month_count = max(stats.month_count + sign, 0)
+        
+        # Dernière génération
+        if sign > 0:
+            if not stats.last_generation_at or history.created_at > stats.last_generation_at:
+                stats.last_generation_at = history.created_at
+        elif stats.last_generation_at and history.created_at >= stats.last_generation_at:
+            # Entrée la plus récente supprimée: relire le max via l'index (user_id, created_at)
+            stats.last_generation_at = self.db.query(
+                func.max(GenerationHistoryModel.created_at)
+            ).filter(GenerationHistoryModel.user_id == history.user_id).scalar()
+        
+        # Entreprises distinctes (nouveau dict pour que SQLAlchemy détecte la modification)
+        if history.company_name:
+            company_counts = dict(stats.company_counts or {})
+            count = company_counts.get(history.company_name, 0) + sign
+            if count > 0:
+                company_counts[history.company_name] = count
+            else:
+                company_counts.pop(history.company_name, None)
+            stats.company_counts = company_counts
+            stats.unique_companies = len(company_counts)
+        
+        stats.updated_at = datetime.now()
+    
     def _model_to_entity(self, model: GenerationHistoryModel) -> GenerationHistory:
-        """Convertit un modèle SQLAlchemy en entité"""
+        """Convertit un modèle SQLAlchemy en entité (colonnes différées non chargées -> None)"""
+        unloaded = inspect(model).unloaded
         return GenerationHistory(
             id=model.id,
             user_id=model.user_id,
@@ -231,10 +571,12 @@ class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
             job_url=model.job_url,
             cv_filename=model.cv_filename,
             cv_id=model.cv_id,
+            llm_provider=model.llm_provider,
             file_path=model.file_path,
-            text_content=model.text_content,
+            letter_id=model.letter_id,
+            text_content=None if 'text_content' in unloaded else model.text_content,
             status=model.status,
-            error_message=model.error_message,
+            error_message=None if 'error_message' in unloaded else model.error_message,
             created_at=model.created_at,
             file_expires_at=model.file_expires_at
         )
@@ -250,7 +592,9 @@ class PostgresGenerationHistoryRepository(GenerationHistoryRepository):
             job_url=entity.job_url,
             cv_filename=entity.cv_filename,
             cv_id=entity.cv_id,
+            llm_provider=entity.llm_provider,
             file_path=entity.file_path,
+            letter_id=entity.letter_id,
             text_content=entity.text_content,
             status=entity.status,
             error_message=entity.error_message,
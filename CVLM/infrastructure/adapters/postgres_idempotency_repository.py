@@ -0,0 +1,93 @@
+"""
+Implémentation PostgreSQL du repository des clés d'idempotence
+"""
+from typing import Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from domain.entities.idempotency_record import IdempotencyRecord
+from domain.ports.idempotency_repository import IdempotencyRepository
+from infrastructure.database.models import IdempotencyKeyModel
+from infrastructure.adapters.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PostgresIdempotencyRepository(IdempotencyRepository):
+    """Repository PostgreSQL pour les réponses idempotentes"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_pending(self, record: IdempotencyRecord) -> bool:
+        """Réserve la clé via INSERT ... ON CONFLICT DO NOTHING (atomique)"""
+        stmt = insert(IdempotencyKeyModel).values(
+            user_id=record.user_id,
+            key=record.key,
+            endpoint=record.endpoint,
+            request_hash=record.request_hash,
+            status='pending',
+            created_at=record.created_at or datetime.now(),
+            expires_at=record.expires_at
+        ).on_conflict_do_nothing(index_elements=['user_id', 'key'])
+
+        result = self.db.execute(stmt)
+        self.db.commit()
+        return result.rowcount == 1
+
+    def get(self, user_id: str, key: str) -> Optional[IdempotencyRecord]:
+        """Récupère l'enregistrement d'une clé"""
+        model = self.db.query(IdempotencyKeyModel).filter(
+            IdempotencyKeyModel.user_id == user_id,
+            IdempotencyKeyModel.key == key
+        ).first()
+
+        return self._model_to_entity(model) if model else None
+
+    def mark_completed(self, user_id: str, key: str, status_code: int, response_body: str) -> None:
+        """Mémorise la réponse finale associée à la clé"""
+        self.db.query(IdempotencyKeyModel).filter(
+            IdempotencyKeyModel.user_id == user_id,
+            IdempotencyKeyModel.key == key
+        ).update(
+            {
+                IdempotencyKeyModel.status: 'completed',
+                IdempotencyKeyModel.status_code: status_code,
+                IdempotencyKeyModel.response_body: response_body
+            },
+            synchronize_session=False
+        )
+        self.db.commit()
+
+    def delete(self, user_id: str, key: str) -> None:
+        """Libère une clé"""
+        self.db.query(IdempotencyKeyModel).filter(
+            IdempotencyKeyModel.user_id == user_id,
+            IdempotencyKeyModel.key == key
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+    def delete_expired(self, now: datetime) -> int:
+        """Supprime les clés expirées (index sur expires_at)"""
+        deleted = self.db.query(IdempotencyKeyModel).filter(
+            IdempotencyKeyModel.expires_at < now
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+        logger.info(f"Clés d'idempotence expirées supprimées: {deleted}")
+        return deleted
+
+    def _model_to_entity(self, model: IdempotencyKeyModel) -> IdempotencyRecord:
+        """Convertit un modèle SQLAlchemy en entité"""
+        return IdempotencyRecord(
+            key=model.key,
+            user_id=model.user_id,
+            endpoint=model.endpoint,
+            request_hash=model.request_hash,
+            status=model.status,
+            status_code=model.status_code,
+            response_body=model.response_body,
+            created_at=model.created_at,
+            expires_at=model.expires_at
+        )
@@ -1,14 +1,15 @@
 """
 Implémentation PostgreSQL du MotivationalLetterRepository
 """
-from typing import Optional, List
+from typing import Optional, List, Dict
 from sqlalchemy.orm import Session
 import uuid
 
 from domain.ports.motivational_letter_repository import MotivationalLetterRepository
-from domain.entities.motivational_letter import MotivationalLetter
-from infrastructure.database.models import MotivationalLetterModel
+from domain.entities.motivational_letter import MotivationalLetter, LetterSummary
+from infrastructure.database.models import MotivationalLetterModel, CvModel
 from infrastructure.database.config import get_session_factory
+from infrastructure.database.pagination import paginate_by_cursor
 
 
 class PostgresMotivationalLetterRepository(MotivationalLetterRepository):
@@ -36,6 +37,8 @@ class PostgresMotivationalLetterRepository(MotivationalLetterRepository):
         letter.file_path = model.file_path
         letter.file_size = model.file_size
         letter.llm_provider = model.llm_provider
+        letter.pdf_generator = model.pdf_generator or "fpdf"
+        letter.layout = model.layout or "classic"
         letter.created_at = model.created_at
         letter.updated_at = model.updated_at
         return letter
@@ -52,6 +55,8 @@ class PostgresMotivationalLetterRepository(MotivationalLetterRepository):
             file_size=letter.file_size,
             raw_text=letter.raw_text,
             llm_provider=letter.llm_provider,
+            pdf_generator=letter.pdf_generator,
+            layout=letter.layout,
             created_at=letter.created_at,
             updated_at=letter.updated_at
         )
@@ -96,6 +101,42 @@ class PostgresMotivationalLetterRepository(MotivationalLetterRepository):
             if not self._external_session:
                 session.close()
     
+    def list_summaries(self, user_id: str, per_page: int = 50, cursor: Optional[str] = None) -> Dict:
+        """
+        Une seule requête: colonnes affichées + nom du CV (LEFT JOIN),
+        tri et pagination keyset (created_at, id) en SQL. raw_text n'est jamais chargé.
+        """
+        session = self._get_session()
+        try:
+            query = session.query(
+                MotivationalLetterModel.id,
+                MotivationalLetterModel.cv_id,
+                MotivationalLetterModel.job_offer_url,
+                MotivationalLetterModel.filename,
+                MotivationalLetterModel.file_size,
+                MotivationalLetterModel.llm_provider,
+                MotivationalLetterModel.created_at,
+                CvModel.filename.label('cv_filename')
+            ).outerjoin(
+                CvModel, CvModel.id == MotivationalLetterModel.cv_id
+            ).filter(MotivationalLetterModel.user_id == user_id)
+            
+            rows, next_cursor = paginate_by_cursor(
+                query,
+                MotivationalLetterModel.created_at,
+                MotivationalLetterModel.id,
+                per_page,
+                cursor
+            )
+            return {
+                "items": [LetterSummary(*row) for row in rows],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
+        finally:
+            if not self._external_session:
+                session.close()
+    
     def get_by_cv_id(self, cv_id: str) -> List[MotivationalLetter]:
         session = self._get_session()
         try:
@@ -124,6 +165,8 @@ class PostgresMotivationalLetterRepository(MotivationalLetterRepository):
             model.file_size = letter.file_size
             model.raw_text = letter.raw_text
             model.llm_provider = letter.llm_provider
+            model.pdf_generator = letter.pdf_generator
+            model.layout = letter.layout
             model.updated_at = letter.updated_at
             
             session.commit()
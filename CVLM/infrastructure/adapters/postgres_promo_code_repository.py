@@ -1,13 +1,19 @@
 """
 Implémentation PostgreSQL du repository PromoCode
 """
-from typing import Optional, List
+from typing import Optional, List, Set, Dict
+from datetime import datetime
+from sqlalchemy import update, select, or_, any_, literal, String, func
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert, ARRAY
 
 from domain.entities.promo_code import PromoCode
+from domain.entities.promo_redemption import PromoRedemption
 from domain.ports.promo_code_repository import PromoCodeRepository
-from infrastructure.database.models import PromoCodeModel
+from domain.exceptions import PromoCodeAlreadyUsedError
+from infrastructure.database.models import PromoCodeModel, PromoRedemptionModel, UserModel
 from infrastructure.adapters.logger_config import setup_logger
+from config.constants import PROMO_BULK_INSERT_BATCH_SIZE
 
 logger = setup_logger(__name__)
 
@@ -36,6 +42,36 @@ class PostgresPromoCodeRepository(PromoCodeRepository):
         logger.info(f"Code promo créé: {promo_code.code}")
         return self._model_to_entity(db_promo)
     
+    def create_many(self, promo_codes: List[PromoCode]) -> int:
+        """
+        Crée plusieurs codes promo dans une seule transaction
+        INSERT multi-lignes (executemany batché par SQLAlchemy), par lots
+        """
+        rows = [
+            {
+                "code": promo.code,
+                "pdf_credits": promo.pdf_credits,
+                "text_credits": promo.text_credits,
+                "max_uses": promo.max_uses,
+                "current_uses": promo.current_uses,
+                "is_active": promo.is_active,
+                "created_at": promo.created_at,
+                "expires_at": promo.expires_at
+            }
+            for promo in promo_codes
+        ]
+        
+        try:
+            for start in range(0, len(rows), PROMO_BULK_INSERT_BATCH_SIZE):
+                self.db.execute(insert(PromoCodeModel), rows[start:start + PROMO_BULK_INSERT_BATCH_SIZE])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        logger.info(f"Codes promo créés en masse: {len(rows)}")
+        return len(rows)
+    
     def get_by_code(self, code: str) -> Optional[PromoCode]:
         """Récupère un code promo par son code"""
         db_promo = self.db.query(PromoCodeModel).filter(
@@ -46,6 +82,29 @@ class PostgresPromoCodeRepository(PromoCodeRepository):
             return self._model_to_entity(db_promo)
         return None
     
+    def find_existing_codes(self, codes: List[str]) -> Set[str]:
+        """SELECT code FROM promo_codes WHERE code = ANY(:codes)"""
+        if not codes:
+            return set()
+        
+        result = self.db.execute(
+            select(PromoCodeModel.code).where(
+                PromoCodeModel.code == any_(literal(codes, ARRAY(String)))
+            )
+        )
+        return set(result.scalars().all())
+    
+    def get_aggregate_stats(self) -> Dict:
+        """SELECT COUNT/SUM en une passe sur promo_codes"""
+        row = self.db.execute(
+            select(
+                func.count(PromoCodeModel.code).label("total_promo_codes"),
+                func.count(PromoCodeModel.code).filter(PromoCodeModel.is_active.is_(True)).label("active_promo_codes"),
+                func.coalesce(func.sum(PromoCodeModel.current_uses), 0).label("total_promo_redemptions")
+            )
+        ).one()
+        return dict(row._mapping)
+    
     def get_all_active(self) -> List[PromoCode]:
         """Récupère tous les codes promo actifs"""
         db_promos = self.db.query(PromoCodeModel).filter(
@@ -75,6 +134,82 @@ class PostgresPromoCodeRepository(PromoCodeRepository):
         logger.info(f"Code promo mis à jour: {promo_code.code}")
         return self._model_to_entity(db_promo)
     
+    def redeem(self, code: str, user_id: str) -> Optional[PromoRedemption]:
+        """
+        Utilise un code promo en une seule transaction:
+        1. UPDATE promo_codes ... WHERE <utilisable> RETURNING (verrouille la ligne du code)
+        2. INSERT promo_redemptions ON CONFLICT DO NOTHING (index unique user_id + code)
+        3. UPDATE users ... RETURNING nouveaux soldes
+        
+        Les dates d'expiration sont en UTC (cf. PromoCode.can_be_used)
+        """
+        code = code.upper()
+        now = datetime.utcnow()
+        
+        try:
+            promo = self.db.execute(
+                update(PromoCodeModel)
+                .where(
+                    PromoCodeModel.code == code,
+                    PromoCodeModel.is_active == True,
+                    or_(PromoCodeModel.max_uses == 0, PromoCodeModel.current_uses < PromoCodeModel.max_uses),
+                    or_(PromoCodeModel.expires_at.is_(None), PromoCodeModel.expires_at > now)
+                )
+                .values(current_uses=PromoCodeModel.current_uses + 1)
+                .returning(PromoCodeModel.pdf_credits, PromoCodeModel.text_credits)
+            ).first()
+            
+            if promo is None:
+                self.db.rollback()
+                return None
+            
+            inserted = self.db.execute(
+                insert(PromoRedemptionModel)
+                .values(
+                    user_id=user_id,
+                    code=code,
+                    pdf_credits=promo.pdf_credits,
+                    text_credits=promo.text_credits,
+                    redeemed_at=now
+                )
+                .on_conflict_do_nothing(index_elements=['user_id', 'code'])
+                .returning(PromoRedemptionModel.id)
+            ).scalar_one_or_none()
+            
+            if inserted is None:
+                # Le rollback annule aussi l'incrément de current_uses
+                raise PromoCodeAlreadyUsedError(code)
+            
+            balances = self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == user_id)
+                .values(
+                    pdf_credits=UserModel.pdf_credits + promo.pdf_credits,
+                    text_credits=UserModel.text_credits + promo.text_credits,
+                    updated_at=datetime.now()
+                )
+                .returning(UserModel.pdf_credits, UserModel.text_credits)
+            ).first()
+            
+            if balances is None:
+                raise ValueError(f"User with id {user_id} not found")
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        logger.info(f"Code promo utilisé: {code} par {user_id}")
+        return PromoRedemption(
+            code=code,
+            user_id=user_id,
+            pdf_credits_added=promo.pdf_credits,
+            text_credits_added=promo.text_credits,
+            new_pdf_credits=balances.pdf_credits,
+            new_text_credits=balances.text_credits,
+            redeemed_at=now
+        )
+    
     def delete(self, code: str) -> None:
         """Supprime un code promo"""
         db_promo = self.db.query(PromoCodeModel).filter(
@@ -1,14 +1,17 @@
 """
 Implémentation PostgreSQL du UserRepository
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterator
+from datetime import datetime
+from sqlalchemy import update, select, func, cast, Date
 from sqlalchemy.orm import Session
 import uuid
 
 from domain.ports.user_repository import UserRepository
-from domain.entities.user import User
+from domain.entities.user import User, UserListFilters
 from infrastructure.database.models import UserModel
 from infrastructure.database.config import get_session_factory
+from infrastructure.database.pagination import paginate_by_cursor
 
 
 class PostgresUserRepository(UserRepository):
@@ -135,6 +138,40 @@ class PostgresUserRepository(UserRepository):
             if not self._external_session:
                 session.close()
     
+    def decrement_credit(self, user_id: str, credit_type: str) -> Optional[int]:
+        """
+        Décrémente un crédit en une seule requête:
+        UPDATE users SET <type>_credits = <type>_credits - 1
+        WHERE id = :id AND <type>_credits > 0 RETURNING <type>_credits
+        
+        Sûr en cas de requêtes concurrentes du même utilisateur (pas de read-modify-write)
+        """
+        credit_columns = {
+            "pdf": UserModel.pdf_credits,
+            "text": UserModel.text_credits
+        }
+        if credit_type not in credit_columns:
+            raise ValueError(f"Type de crédit inconnu: {credit_type}")
+        column = credit_columns[credit_type]
+        
+        session = self._get_session()
+        try:
+            stmt = (
+                update(UserModel)
+                .where(UserModel.id == user_id, column > 0)
+                .values({column: column - 1, UserModel.updated_at: datetime.now()})
+                .returning(column)
+            )
+            remaining = session.execute(stmt).scalar_one_or_none()
+            session.commit()
+            return remaining
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            if not self._external_session:
+                session.close()
+    
     def delete(self, user_id: str) -> bool:
         """Supprime un utilisateur"""
         session = self._get_session()
@@ -166,3 +203,101 @@ class PostgresUserRepository(UserRepository):
     def get_all(self) -> List[User]:
         """Récupère tous les utilisateurs (alias de list_all)"""
         return self.list_all()
+    
+    def get_aggregate_stats(self) -> Dict:
+        """SELECT COUNT/SUM en une passe sur users (aucune entité chargée)"""
+        session = self._get_session()
+        try:
+            row = session.execute(
+                select(
+                    func.count(UserModel.id).label("total_users"),
+                    func.count(UserModel.id).filter(UserModel.is_admin.is_(True)).label("total_admins"),
+                    func.coalesce(func.sum(UserModel.pdf_credits), 0).label("total_pdf_credits"),
+                    func.coalesce(func.sum(UserModel.text_credits), 0).label("total_text_credits")
+                )
+            ).one()
+            return dict(row._mapping)
+        finally:
+            if not self._external_session:
+                session.close()
+    
+    def count_signups_per_day(self, since: datetime) -> List[Dict]:
+        """GROUP BY jour sur users.created_at (index ix_users_created_at)"""
+        day = cast(UserModel.created_at, Date)
+        session = self._get_session()
+        try:
+            rows = session.execute(
+                select(day.label("day"), func.count().label("count"))
+                .where(UserModel.created_at >= since)
+                .group_by(day)
+                .order_by(day)
+            ).all()
+            return [{"day": row.day, "count": row.count} for row in rows]
+        finally:
+            if not self._external_session:
+                session.close()
+    
+    # Tri -> (colonne de tri, ordre décroissant); départage par id
+    _SORTS = {
+        'created_desc': (UserModel.created_at, True),
+        'created_asc': (UserModel.created_at, False),
+        'email': (UserModel.email, False),
+    }
+    
+    def _filtered_query(self, session: Session, filters: UserListFilters):
+        """Requête users avec les filtres d'administration"""
+        query = session.query(UserModel)
+        
+        if filters.email_prefix:
+            # LIKE 'prefix%' servi par ix_users_email_pattern (varchar_pattern_ops)
+            prefix = filters.email_prefix.strip().lower()
+            escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query = query.filter(UserModel.email.like(f"{escaped}%"))
+        if filters.is_admin is not None:
+            query = query.filter(UserModel.is_admin.is_(filters.is_admin))
+        if filters.zero_credits:
+            query = query.filter(UserModel.pdf_credits == 0, UserModel.text_credits == 0)
+        if filters.created_from:
+            query = query.filter(UserModel.created_at >= filters.created_from)
+        if filters.created_to:
+            query = query.filter(UserModel.created_at < filters.created_to)
+        
+        return query
+    
+    def _sort(self, filters: UserListFilters):
+        if filters.sort not in self._SORTS:
+            raise ValueError(f"Tri inconnu: {filters.sort}")
+        return self._SORTS[filters.sort]
+    
+    def list_page(self, filters: UserListFilters, per_page: int = 50, cursor: Optional[str] = None) -> Dict:
+        """Une page keyset (LIMIT per_page + 1), sans OFFSET ni COUNT"""
+        sort_column, descending = self._sort(filters)
+        session = self._get_session()
+        try:
+            models, next_cursor = paginate_by_cursor(
+                self._filtered_query(session, filters),
+                sort_column,
+                UserModel.id,
+                per_page,
+                cursor,
+                descending=descending
+            )
+            return {
+                "items": [self._user_model_to_entity(model) for model in models],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
+        finally:
+            if not self._external_session:
+                session.close()
+    
+    def iter_all(self, filters: UserListFilters, batch_size: int = 1000) -> Iterator[User]:
+        """Lots successifs de list_page: au plus batch_size entités en mémoire"""
+        cursor = None
+        while True:
+            page = self.list_page(filters, per_page=batch_size, cursor=cursor)
+            yield from page["items"]
+            if not page["has_more"]:
+                return
+            cursor = page["next_cursor"]
+
@@ -0,0 +1,302 @@
+"""
+Stockage objet S3 (ou compatible) du FileStorage
+
+Les fichiers sont partagés par tous les nœuds de l'API: un PDF rendu sur un
+nœud est téléchargeable depuis n'importe quel autre. Les chemins enregistrés
+en base sont des URI s3://<bucket>/<clé>; les chemins locaux hérités restent
+gérés comme avant (path_exists, delete_path).
+
+- Un client boto3 par processus (get_file_storage), connexions HTTP réutilisées
+  (max_pool_connections, à aligner sur FILE_STORAGE_IO_WORKERS)
+- Envoi en multipart au-delà de S3_MULTIPART_THRESHOLD_BYTES
+- Téléchargements par URL présignée (redirection, l'API ne relaie pas le PDF)
+  ou en flux par morceaux si S3_PRESIGNED_DOWNLOADS=false
+
+Stand-in local (moto en mode serveur, docker-compose --profile s3 up):
+    FILE_STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://s3:5000 S3_PUBLIC_ENDPOINT_URL=http://localhost:5000
+    S3_CREATE_BUCKET=true AWS_ACCESS_KEY_ID=test AWS_SECRET_ACCESS_KEY=test S3_REGION=us-east-1
+L'API joint moto par le réseau compose (s3:5000), le navigateur qui suit la
+redirection par le port publié (localhost:5000): les URLs présignées sont
+signées pour S3_PUBLIC_ENDPOINT_URL (l'hôte fait partie de la signature).
+"""
+import io
+from typing import Iterator, Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from domain.ports.file_storage import FileStorage
+from domain.services.filename_builder import FilenameBuilder
+from infrastructure.adapters.logger_config import setup_logger
+from config.constants import (
+    S3_BUCKET,
+    S3_PREFIX,
+    S3_ENDPOINT_URL,
+    S3_PUBLIC_ENDPOINT_URL,
+    S3_REGION,
+    S3_CREATE_BUCKET,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_MULTIPART_THRESHOLD_BYTES,
+    S3_MULTIPART_CHUNK_BYTES,
+    S3_PRESIGNED_DOWNLOADS,
+    S3_PRESIGNED_URL_TTL_SECONDS,
+    S3_STREAM_CHUNK_BYTES
+)
+
+logger = setup_logger(__name__)
+
+_NOT_FOUND_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def _is_not_found(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in _NOT_FOUND_CODES
+
+
+class S3FileStorage(FileStorage):
+    """
+    Stockage des fichiers PDF dans un bucket S3
+    """
+
+    def __init__(
+        self,
+        bucket: str = S3_BUCKET,
+        prefix: str = S3_PREFIX,
+        endpoint_url: Optional[str] = S3_ENDPOINT_URL,
+        public_endpoint_url: Optional[str] = S3_PUBLIC_ENDPOINT_URL,
+        region: Optional[str] = S3_REGION,
+        create_bucket: bool = S3_CREATE_BUCKET,
+        presigned_downloads: bool = S3_PRESIGNED_DOWNLOADS,
+        presigned_url_ttl: int = S3_PRESIGNED_URL_TTL_SECONDS
+    ):
+        """
+        Args:
+            bucket: Nom du bucket
+            prefix: Préfixe des clés (plusieurs environnements dans un bucket)
+            endpoint_url: URL d'un stockage compatible S3, None pour AWS
+            public_endpoint_url: URL des téléchargements présignés, si l'API
+                joint le stockage par une autre adresse que les clients
+            region: Région du bucket (défaut: configuration AWS)
+            create_bucket: Créer le bucket s'il n'existe pas (stand-in local)
+            presigned_downloads: Servir les téléchargements par URL présignée
+            presigned_url_ttl: Durée de validité des URLs présignées (secondes)
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.presigned_downloads = presigned_downloads
+        self.presigned_url_ttl = presigned_url_ttl
+
+        # Client thread-safe partagé par les threads d'I/O: pool de connexions HTTP réutilisées
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": 5, "mode": "standard"}
+            )
+        )
+        # URLs présignées signées pour l'hôte que joignent les clients (signature locale)
+        self.presign_client = self.client
+        if public_endpoint_url and public_endpoint_url != endpoint_url:
+            self.presign_client = boto3.client(
+                "s3",
+                endpoint_url=public_endpoint_url,
+                region_name=region
+            )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD_BYTES,
+            multipart_chunksize=S3_MULTIPART_CHUNK_BYTES,
+            use_threads=False  # Déjà exécuté dans le pool d'I/O (ThreadedFileStorage)
+        )
+
+        if create_bucket:
+            self._ensure_bucket()
+
+    def _ensure_bucket(self) -> None:
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except ClientError as e:
+            if not _is_not_found(e):
+                raise
+            self.client.create_bucket(Bucket=self.bucket)
+            logger.info(f"Bucket S3 créé: {self.bucket}")
+
+    # === Clés et URI ===
+
+    def _key(self, subfolder: str, filename: str) -> str:
+        return f"{self.prefix}{subfolder}/{filename}" if subfolder else f"{self.prefix}{filename}"
+
+    def _uri(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def _key_from_uri(self, path: str) -> Optional[str]:
+        """Clé d'une URI s3:// de ce bucket, None pour un chemin local"""
+        uri_prefix = f"s3://{self.bucket}/"
+        return path[len(uri_prefix):] if path.startswith(uri_prefix) else None
+
+    def _key_from_path(self, file_path: str) -> str:
+        """Clé d'un chemin retourné par save_file (clé) ou save_cv/save_letter (URI)"""
+        return self._key_from_uri(file_path) or file_path
+
+    # === Opérations S3 ===
+
+    def _put(self, key: str, content: bytes) -> None:
+        self.client.upload_fileobj(
+            io.BytesIO(content),
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": "application/pdf"},
+            Config=self.transfer_config
+        )
+
+    def _head(self, key: str) -> Optional[dict]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+
+    def _delete(self, key: str) -> bool:
+        # DeleteObject réussit aussi sur une clé absente: HEAD pour distinguer les deux cas
+        if self._head(key) is None:
+            return False
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    @staticmethod
+    def _iter_body(body, chunk_size: int) -> Iterator[bytes]:
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    # === FileStorage ===
+
+    def save_file(self, file_content: bytes, filename: str, subfolder: str = "") -> str:
+        """
+        Envoie un fichier dans le bucket
+
+        Returns:
+            Clé de l'objet
+        """
+        key = self._key(subfolder, filename)
+        self._put(key, file_content)
+        return key
+
+    def get_file(self, file_path: str) -> Optional[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key_from_path(file_path))
+            return response["Body"].read()
+        except ClientError as e:
+            if not _is_not_found(e):
+                logger.warning(f"Erreur lecture objet {file_path}: {e}")
+            return None
+
+    def delete_file(self, file_path: str) -> bool:
+        try:
+            return self._delete(self._key_from_path(file_path))
+        except ClientError as e:
+            logger.warning(f"Erreur suppression objet {file_path}: {e}")
+            return False
+
+    def file_exists(self, file_path: str) -> bool:
+        return self._head(self._key_from_path(file_path)) is not None
+
+    def get_file_size(self, file_path: str) -> Optional[int]:
+        try:
+            head = self._head(self._key_from_path(file_path))
+        except ClientError as e:
+            logger.warning(f"Erreur récupération taille {file_path}: {e}")
+            return None
+        return head["ContentLength"] if head else None
+
+    # === Méthodes spécifiques pour CVs ===
+
+    def save_cv(self, cv_id: str, content: bytes, filename: str) -> str:
+        key = self._key("cvs", f"cv_{cv_id}.pdf")
+        self._put(key, content)
+        return self._uri(key)
+
+    def get_cv_path(self, cv_id: str) -> Optional[str]:
+        key = self._key("cvs", f"cv_{cv_id}.pdf")
+        return self._uri(key) if self._head(key) else None
+
+    def delete_cv(self, cv_id: str) -> bool:
+        try:
+            return self._delete(self._key("cvs", f"cv_{cv_id}.pdf"))
+        except ClientError as e:
+            logger.warning(f"Erreur suppression CV {cv_id}: {e}")
+            return False
+
+    # === Méthodes spécifiques pour lettres de motivation ===
+
+    def save_letter(self, letter_id: str, content: bytes, filename: str) -> str:
+        key = self._key("letters", f"letter_{letter_id}.pdf")
+        self._put(key, content)
+        return self._uri(key)
+
+    def get_letter_path(self, letter_id: str) -> Optional[str]:
+        key = self._key("letters", f"letter_{letter_id}.pdf")
+        return self._uri(key) if self._head(key) else None
+
+    def delete_letter(self, letter_id: str) -> bool:
+        try:
+            return self._delete(self._key("letters", f"letter_{letter_id}.pdf"))
+        except ClientError as e:
+            logger.warning(f"Erreur suppression lettre {letter_id}: {e}")
+            return False
+
+    # === Chemins enregistrés en base (URI s3:// ou chemins locaux hérités) ===
+
+    def path_exists(self, path: str) -> bool:
+        key = self._key_from_uri(path)
+        if key is None:
+            return super().path_exists(path)
+        return self._head(key) is not None
+
+    def delete_path(self, path: str) -> bool:
+        key = self._key_from_uri(path)
+        if key is None:
+            return super().delete_path(path)
+        return self._delete(key)
+
+    def get_etag(self, path: str) -> Optional[str]:
+        """ETag de l'objet (calculé par S3 depuis le contenu, déjà entre guillemets)"""
+        key = self._key_from_uri(path)
+        if key is None:
+            return super().get_etag(path)
+        head = self._head(key)
+        return head["ETag"] if head else None
+
+    def get_download_url(self, path: str, filename: str) -> Optional[str]:
+        """URL présignée GET (signature locale, sans appel réseau)"""
+        key = self._key_from_uri(path)
+        if key is None or not self.presigned_downloads:
+            return None
+
+        return self.presign_client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": "application/pdf",
+                "ResponseContentDisposition": FilenameBuilder.build_content_disposition(filename)
+            },
+            ExpiresIn=self.presigned_url_ttl
+        )
+
+    def stream_file(self, path: str, chunk_size: int = S3_STREAM_CHUNK_BYTES) -> Optional[Iterator[bytes]]:
+        key = self._key_from_uri(path)
+        if key is None:
+            return None
+
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except ClientError as e:
+            if _is_not_found(e):
+                return None
+            raise
+        return self._iter_body(body, chunk_size)
@@ -0,0 +1,264 @@
+"""
+Stockage de fichiers adressé par contenu, réparti en sous-répertoires
+
+    objects/ab/cd/<sha256>             contenu, stocké une seule fois
+    refs/<dossier>/ef/01/<nom>         référence nommée (cv_<id>.pdf, letter_<id>.pdf)
+
+Une référence est un lien physique (hard link) vers son objet: le compteur de
+liens du système de fichiers sert de compteur de références (st_nlink - 1),
+maintenu atomiquement sans base annexe ni verrou inter-processus. Un contenu
+identique (même CV importé deux fois, même lettre re-rendue) n'occupe qu'un
+objet. Les chemins retournés sont ceux des références: des fichiers ordinaires,
+servis tels quels par FileResponse.
+
+Les références sont réparties par hash de leur nom et les objets par leur
+hash: aucun répertoire ne grossit avec le nombre de fichiers.
+"""
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from domain.ports.file_storage import FileStorage
+from infrastructure.adapters.content_digest_cache import ContentDigestCache
+from infrastructure.adapters.logger_config import setup_logger
+from config.constants import FILE_STORAGE_BASE_PATH, FILE_STORAGE_PATH_CACHE_SIZE
+
+logger = setup_logger(__name__)
+
+class ShardedFileStorage(FileStorage):
+    """
+    Stockage local dédupliqué: objets adressés par sha256, références en liens physiques
+    """
+
+    OBJECTS_DIR = "objects"
+    REFS_DIR = "refs"
+
+    def __init__(self, base_path: str = FILE_STORAGE_BASE_PATH, path_cache_size: int = FILE_STORAGE_PATH_CACHE_SIZE):
+        """
+        Args:
+            base_path: Répertoire de base pour le stockage
+            path_cache_size: Nombre de références dont l'objet est gardé en mémoire
+        """
+        self.base_path = Path(base_path)
+        self.objects_path = self.base_path / self.OBJECTS_DIR
+        self.refs_path = self.base_path / self.REFS_DIR
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        self.refs_path.mkdir(parents=True, exist_ok=True)
+        # Référence -> sha256: retrouver l'objet sans relire le fichier
+        self._digests = ContentDigestCache(path_cache_size)
+
+    # === Chemins ===
+
+    def object_path(self, digest: str) -> Path:
+        """Chemin de l'objet d'un contenu (objects/ab/cd/<sha256>)"""
+        return self.objects_path / digest[:2] / digest[2:4] / digest
+
+    def _ref_path(self, subfolder: str, filename: str) -> Path:
+        shard = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+        return self.refs_path / subfolder / shard[:2] / shard[2:4] / filename
+
+    def _full_path(self, file_path: str) -> Path:
+        return self.base_path / file_path
+
+    @staticmethod
+    def _tmp_name(name: str) -> str:
+        return f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    # === Objets et références ===
+
+    def _store_object(self, digest: str, content: bytes) -> Path:
+        """Écrit l'objet s'il n'existe pas encore et retourne son chemin"""
+        path = self.object_path(digest)
+        if path.exists():
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(self._tmp_name(digest))
+        try:
+            tmp_path.write_bytes(content)
+            # link() et non replace(): un objet déjà publié par un autre writer n'est
+            # jamais remplacé, ses références restent comptées sur le même inode
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return path
+
+    def _save(self, content: bytes, ref_path: Path) -> Path:
+        """Publie le contenu sous la référence (remplacement atomique) et libère l'ancien objet"""
+        digest = hashlib.sha256(content).hexdigest()
+        previous = self._resolve(ref_path)
+
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_ref = ref_path.with_name(self._tmp_name(ref_path.name))
+
+        for attempt in range(3):
+            object_path = self._store_object(digest, content)
+            try:
+                os.link(object_path, tmp_ref)
+                break
+            except FileNotFoundError:
+                # Objet collecté entre l'écriture et le lien: on le réécrit
+                if attempt == 2:
+                    raise
+        os.replace(tmp_ref, ref_path)
+
+        self._digests.remember(ref_path, digest)
+        if previous and previous != digest:
+            self._release(previous)
+        return ref_path
+
+    def _delete(self, ref_path: Path) -> bool:
+        """Supprime la référence et l'objet s'il n'est plus référencé"""
+        digest = self._resolve(ref_path)
+        if digest is None:
+            return False
+
+        try:
+            ref_path.unlink()
+        except FileNotFoundError:
+            return False
+
+        self._digests.forget(ref_path)
+        self._release(digest)
+        return True
+
+    def _release(self, digest: str) -> None:
+        """Supprime l'objet si plus aucune référence n'y pointe"""
+        path = self.object_path(digest)
+        try:
+            if path.stat().st_nlink <= 1:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Libération objet {digest} impossible: {e}")
+
+    def _resolve(self, ref_path: Path) -> Optional[str]:
+        """sha256 du contenu d'une référence (cache des hash), None si elle n'existe pas"""
+        return self._digests.get(ref_path)
+
+    def get_digest(self, file_path: str) -> Optional[str]:
+        """sha256 du contenu d'un fichier stocké, None si inexistant"""
+        return self._resolve(self._full_path(file_path))
+
+    def ref_count(self, digest: str) -> int:
+        """Nombre de références vers un objet (0 si absent)"""
+        try:
+            return self.object_path(digest).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def collect_garbage(self) -> int:
+        """
+        Supprime les objets sans référence
+
+        Un fichier de référence supprimé hors du storage (os.remove direct,
+        écriture interrompue) laisse son objet à 0 référence: repris ici.
+
+        Returns:
+            Nombre d'objets supprimés
+        """
+        removed = 0
+        for path in self.objects_path.glob("*/*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                if path.stat().st_nlink <= 1:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Collecte objet {path.name} impossible: {e}")
+
+        logger.info(f"Stockage: {removed} objet(s) sans référence supprimé(s)")
+        return removed
+
+    # === FileStorage ===
+
+    def save_file(self, file_content: bytes, filename: str, subfolder: str = "") -> str:
+        """
+        Sauvegarde un fichier (dédupliqué)
+
+        Returns:
+            Chemin relatif de la référence
+        """
+        ref_path = self._save(file_content, self._ref_path(subfolder, filename))
+        return str(ref_path.relative_to(self.base_path))
+
+    def get_file(self, file_path: str) -> Optional[bytes]:
+        full_path = self._full_path(file_path)
+
+        try:
+            return full_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Erreur lecture fichier {file_path}: {e}")
+            return None
+
+    def delete_file(self, file_path: str) -> bool:
+        try:
+            return self._delete(self._full_path(file_path))
+        except Exception as e:
+            logger.warning(f"Erreur suppression fichier {file_path}: {e}")
+            return False
+
+    def file_exists(self, file_path: str) -> bool:
+        return self._full_path(file_path).exists()
+
+    def get_file_size(self, file_path: str) -> Optional[int]:
+        try:
+            return self._full_path(file_path).stat().st_size
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Erreur récupération taille {file_path}: {e}")
+            return None
+
+    # === Méthodes spécifiques pour CVs ===
+
+    def save_cv(self, cv_id: str, content: bytes, filename: str) -> str:
+        return str(self._save(content, self._ref_path("cvs", f"cv_{cv_id}.pdf")))
+
+    def get_cv_path(self, cv_id: str) -> Optional[str]:
+        file_path = self._ref_path("cvs", f"cv_{cv_id}.pdf")
+        return str(file_path) if file_path.exists() else None
+
+    def delete_cv(self, cv_id: str) -> bool:
+        try:
+            return self._delete(self._ref_path("cvs", f"cv_{cv_id}.pdf"))
+        except Exception as e:
+            logger.warning(f"Erreur suppression CV {cv_id}: {e}")
+            return False
+
+    # === Méthodes spécifiques pour lettres de motivation ===
+
+    def save_letter(self, letter_id: str, content: bytes, filename: str) -> str:
+        return str(self._save(content, self._ref_path("letters", f"letter_{letter_id}.pdf")))
+
+    def get_letter_path(self, letter_id: str) -> Optional[str]:
+        file_path = self._ref_path("letters", f"letter_{letter_id}.pdf")
+        return str(file_path) if file_path.exists() else None
+
+    def delete_letter(self, letter_id: str) -> bool:
+        try:
+            return self._delete(self._ref_path("letters", f"letter_{letter_id}.pdf"))
+        except Exception as e:
+            logger.warning(f"Erreur suppression lettre {letter_id}: {e}")
+            return False
+
+    def get_etag(self, path: str) -> Optional[str]:
+        digest = self._resolve(Path(path))
+        return f'"{digest}"' if digest else None
+
+    def delete_path(self, path: str) -> bool:
+        """Supprime une référence par son chemin complet (objet libéré si plus référencé)"""
+        return self._delete(Path(path))
+
+    def get_absolute_path(self, file_path: str) -> str:
+        return str(self._full_path(file_path).absolute())
@@ -0,0 +1,66 @@
+"""
+Implémentation SQLAlchemy de l'unité de travail
+"""
+from sqlalchemy.orm import Session
+
+from domain.ports.unit_of_work import UnitOfWork
+from infrastructure.adapters.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SqlAlchemyUnitOfWork(UnitOfWork):
+    """
+    Unité de travail sur la session de la requête
+
+    Les repositories partagent la même session (get_db): pendant le bloc,
+    leurs commit() deviennent des flush (UnitOfWorkSession) et un seul
+    COMMIT est émis à la sortie du bloc le plus externe.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _depth(self) -> int:
+        return self.db.info.get("unit_of_work_depth", 0)
+
+    def begin(self) -> None:
+        if self._depth() == 0:
+            self.db.info["unit_of_work_rollback_only"] = False
+        self.db.info["unit_of_work_depth"] = self._depth() + 1
+
+    def commit(self) -> None:
+        depth = self._depth()
+        if depth > 1:
+            self.db.info["unit_of_work_depth"] = depth - 1
+            return
+
+        rollback_only = self.db.info.get("unit_of_work_rollback_only", False)
+        self._end()
+
+        if rollback_only:
+            # Un repository a annulé la transaction au milieu de l'unité de travail
+            self.db.rollback()
+            raise RuntimeError("Transaction annulée pendant l'unité de travail, aucune écriture validée")
+
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def rollback(self) -> None:
+        depth = self._depth()
+        if depth > 1:
+            # L'exception remonte jusqu'au bloc externe qui annulera tout
+            self.db.info["unit_of_work_depth"] = depth - 1
+            self.db.info["unit_of_work_rollback_only"] = True
+            return
+
+        self._end()
+        self.db.rollback()
+        logger.info("Unité de travail annulée")
+
+    def _end(self) -> None:
+        self.db.info["unit_of_work_depth"] = 0
+        self.db.info["unit_of_work_rollback_only"] = False
@@ -0,0 +1,107 @@
+"""
+Stockage asynchrone: chaque opération d'un FileStorage synchrone (local,
+partitionné, S3) est exécutée dans un pool de threads dédié aux I/O.
+
+Pool séparé du threadpool de FastAPI/Starlette: un disque lent ou un volume
+NFS bloqué sature ce pool, pas la boucle d'événements ni les autres requêtes.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, Optional, TypeVar
+
+from domain.ports.async_file_storage import AsyncFileStorage
+from domain.ports.file_storage import FileStorage
+from config.constants import FILE_STORAGE_IO_WORKERS
+
+T = TypeVar("T")
+
+
+class ThreadedFileStorage(AsyncFileStorage):
+    """Adapte un FileStorage synchrone au port asynchrone via un pool de threads"""
+
+    def __init__(
+        self,
+        storage: FileStorage,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_workers: int = FILE_STORAGE_IO_WORKERS
+    ):
+        """
+        Args:
+            storage: Stockage synchrone adapté
+            executor: Pool d'I/O partagé (défaut: pool propre de max_workers threads)
+            max_workers: Taille du pool propre
+        """
+        self.storage = storage
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-io")
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Attend la fin des écritures en cours puis arrête les threads"""
+        self._executor.shutdown(wait=True)
+
+    async def save_file(self, file_content: bytes, filename: str, subfolder: str = "") -> str:
+        return await self._run(self.storage.save_file, file_content, filename, subfolder)
+
+    async def get_file(self, file_path: str) -> Optional[bytes]:
+        return await self._run(self.storage.get_file, file_path)
+
+    async def delete_file(self, file_path: str) -> bool:
+        return await self._run(self.storage.delete_file, file_path)
+
+    async def file_exists(self, file_path: str) -> bool:
+        return await self._run(self.storage.file_exists, file_path)
+
+    async def path_exists(self, path: str) -> bool:
+        return await self._run(self.storage.path_exists, path)
+
+    async def delete_path(self, path: str) -> bool:
+        return await self._run(self.storage.delete_path, path)
+
+    async def get_etag(self, path: str) -> Optional[str]:
+        return await self._run(self.storage.get_etag, path)
+
+    async def get_download_url(self, path: str, filename: str) -> Optional[str]:
+        return await self._run(self.storage.get_download_url, path, filename)
+
+    async def stream_file(self, path: str) -> Optional[AsyncIterator[bytes]]:
+        chunks = await self._run(self.storage.stream_file, path)
+        return self._iterate(chunks) if chunks is not None else None
+
+    async def _iterate(self, chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        """Chaque morceau est lu dans le pool d'I/O (lecture réseau bloquante)"""
+        done = object()
+        try:
+            while True:
+                chunk = await self._run(next, chunks, done)
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                await self._run(close)
+
+    async def get_file_size(self, file_path: str) -> Optional[int]:
+        return await self._run(self.storage.get_file_size, file_path)
+
+    async def save_cv(self, cv_id: str, content: bytes, filename: str) -> str:
+        return await self._run(self.storage.save_cv, cv_id, content, filename)
+
+    async def get_cv_path(self, cv_id: str) -> Optional[str]:
+        return await self._run(self.storage.get_cv_path, cv_id)
+
+    async def delete_cv(self, cv_id: str) -> bool:
+        return await self._run(self.storage.delete_cv, cv_id)
+
+    async def save_letter(self, letter_id: str, content: bytes, filename: str) -> str:
+        return await self._run(self.storage.save_letter, letter_id, content, filename)
+
+    async def get_letter_path(self, letter_id: str) -> Optional[str]:
+        return await self._run(self.storage.get_letter_path, letter_id)
+
+    async def delete_letter(self, letter_id: str) -> bool:
+        return await self._run(self.storage.delete_letter, letter_id)
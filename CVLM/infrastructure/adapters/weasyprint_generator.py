@@ -1,33 +1,25 @@
 # infrastructure/adapters/weasyprint_generator.py
+import asyncio
+from typing import Optional
+
 from domain.ports.pdf_generator import PdfGenerator, Document
-from weasyprint import HTML
+from infrastructure.adapters.weasyprint_pool import WeasyPrintPool, get_weasyprint_pool
+from config.constants import LETTER_LAYOUT_DEFAULT
 
 
 class WeasyPrintGenerator(PdfGenerator):
-    def create_pdf(self, document: Document, output_path: str) -> str:
-        # Créer du HTML simple avec le texte
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    margin: 2cm;
-                    line-height: 1.6;
-                }}
-            </style>
-        </head>
-        <body>
-            <pre style="white-space: pre-wrap; font-family: Arial;">
-{document.raw_text}
-            </pre>
-        </body>
-        </html>
-        """
+    """Rendu WeasyPrint délégué au pool de processus (hors du thread de la requête)"""
+
+    name = "weasyprint"
+    template_version = "2"  # infrastructure/templates/letters (gabarits et CSS)
+
+    def __init__(self, pool: Optional[WeasyPrintPool] = None, layout: str = LETTER_LAYOUT_DEFAULT):
+        self.pool = pool or get_weasyprint_pool()
+        self.layout = layout
 
-        # Générer le PDF
-        HTML(string=html_content).write_pdf(output_path)
+    async def render_pdf_async(self, document: Document) -> bytes:
+        return await self.pool.render(document.raw_text, self.layout)
 
-        return output_path
+    def render_pdf(self, document: Document) -> bytes:
+        """Rendu synchrone, hors boucle d'événements uniquement (scripts)"""
+        return asyncio.run(self.render_pdf_async(document))
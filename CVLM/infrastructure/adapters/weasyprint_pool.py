@@ -0,0 +1,174 @@
+"""
+Pool de processus WeasyPrint préchauffés
+
+WeasyPrint est CPU-bound et garde le GIL pendant la mise en page: les rendus
+tournent dans des processus dédiés, démarrés au lancement de l'API. Chaque
+worker compile les gabarits Jinja, parse leurs feuilles de style et charge
+les polices une seule fois.
+
+- Rendus attendus de façon asynchrone: la boucle d'événements de l'API reste
+  libre, plusieurs rendus d'un même processus API occupent tous les workers
+- File bornée: au-delà de workers + queue_size rendus en cours, l'appelant
+  attend au plus queue_timeout secondes puis reçoit PdfRenderingBusyError
+- Timeout par rendu: un rendu bloqué fait recycler le pool (processus tués)
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+from weasyprint import CSS, HTML
+
+from domain.exceptions import GenerationError, PdfRenderingBusyError
+from infrastructure.adapters.letter_template_renderer import get_letter_template_renderer
+from infrastructure.adapters.logger_config import setup_logger
+from config.constants import (
+    LETTER_LAYOUTS,
+    LETTER_LAYOUT_DEFAULT,
+    WEASYPRINT_POOL_WORKERS,
+    WEASYPRINT_POOL_QUEUE_SIZE,
+    WEASYPRINT_QUEUE_TIMEOUT_SECONDS,
+    WEASYPRINT_RENDER_TIMEOUT_SECONDS
+)
+
+logger = setup_logger(__name__)
+
+# État propre à chaque worker, initialisé par _init_worker
+_renderer = None
+_stylesheets = {}
+_font_config = None
+
+
+def _init_worker() -> None:
+    """Préchauffe un worker: gabarits compilés, feuilles de style parsées, polices chargées"""
+    global _renderer, _stylesheets, _font_config
+    from weasyprint.text.fonts import FontConfiguration
+
+    _renderer = get_letter_template_renderer()
+    _font_config = FontConfiguration()
+    _stylesheets = {
+        layout: CSS(string=_renderer.css(layout), font_config=_font_config)
+        for layout in LETTER_LAYOUTS
+    }
+    # Premier rendu à vide: charge Pango/fontconfig avant la première vraie lettre
+    _render_letter("", LETTER_LAYOUT_DEFAULT)
+
+
+def _render_letter(text: str, layout: str) -> bytes:
+    """Rendu d'une lettre dans le worker (le texte est échappé par le gabarit)"""
+    html = _renderer.render_html(text, layout, inline_css=False)
+    return HTML(string=html).write_pdf(stylesheets=[_stylesheets[layout]], font_config=_font_config)
+
+
+def _ping() -> bool:
+    return True
+
+
+class WeasyPrintPool:
+    """Pool de workers WeasyPrint avec file bornée et timeout par rendu"""
+
+    def __init__(
+        self,
+        workers: int = WEASYPRINT_POOL_WORKERS,
+        queue_size: int = WEASYPRINT_POOL_QUEUE_SIZE,
+        queue_timeout: float = WEASYPRINT_QUEUE_TIMEOUT_SECONDS,
+        render_timeout: float = WEASYPRINT_RENDER_TIMEOUT_SECONDS
+    ):
+        self.workers = max(workers, 1)
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        # Places = rendus en cours + rendus en attente
+        self._slots = asyncio.BoundedSemaphore(self.workers + max(queue_size, 0))
+        # Jamais plus de tâches soumises que de workers: le timeout ne mesure que le rendu
+        self._running = asyncio.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Démarre et préchauffe tous les workers (idempotent)"""
+        self._get_executor()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def render(self, text: str, layout: str = LETTER_LAYOUT_DEFAULT) -> bytes:
+        """
+        Rend une lettre en PDF dans un worker (attente sans bloquer la boucle d'événements)
+
+        Args:
+            text: Texte brut de la lettre
+            layout: Gabarit (LETTER_LAYOUTS)
+
+        Raises:
+            ValueError: Gabarit inconnu
+            PdfRenderingBusyError: File pleine pendant queue_timeout secondes
+            GenerationError: Rendu trop long ou worker mort
+        """
+        layout = get_letter_template_renderer().resolve_layout(layout)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise PdfRenderingBusyError()
+
+        try:
+            async with self._running:
+                # Démarrage des workers (après un recyclage) hors de la boucle d'événements
+                executor = self._executor or await asyncio.to_thread(self._get_executor)
+                try:
+                    future = executor.submit(_render_letter, text, layout)
+                    return await asyncio.wait_for(asyncio.wrap_future(future), self.render_timeout)
+                except asyncio.TimeoutError:
+                    logger.error(f"Rendu WeasyPrint > {self.render_timeout}s, recyclage du pool")
+                    self._recycle(executor)
+                    raise GenerationError("pdf", f"rendu interrompu après {self.render_timeout}s")
+                except BrokenProcessPool:
+                    logger.error("Worker WeasyPrint arrêté brutalement, recyclage du pool")
+                    self._recycle(executor)
+                    raise GenerationError("pdf", "worker de rendu indisponible")
+        finally:
+            self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            return self._executor
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn: pas de fork d'un processus API multi-threadé
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        try:
+            # Un worker est lancé par tâche soumise tant que le pool n'est pas plein
+            for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        logger.info(f"Pool WeasyPrint démarré: {self.workers} workers")
+        return executor
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Remplace un pool dont un worker est bloqué ou mort (le prochain rendu en recrée un)"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor n'expose pas ses processus: seul moyen d'arrêter un rendu bloqué
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=None)
+def get_weasyprint_pool() -> WeasyPrintPool:
+    """Pool partagé par le processus (démarré au lancement de l'API)"""
+    return WeasyPrintPool()
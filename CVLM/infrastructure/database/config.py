@@ -3,9 +3,10 @@ Configuration de la base de données PostgreSQL avec SQLAlchemy
 Contient uniquement la configuration (Base, engine, sessions)
 Les modèles sont maintenant dans infrastructure/database/models/
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from functools import lru_cache
 import os
 from infrastructure.adapters.logger_config import setup_logger
 
@@ -29,13 +30,45 @@ def get_database_url():
 def create_db_engine():
     """Crée le moteur SQLAlchemy"""
     database_url = get_database_url()
-    return create_engine(database_url, echo=False)
+    return create_engine(database_url, echo=False, pool_pre_ping=True)
 
 
+@lru_cache(maxsize=None)
+def get_engine():
+    """Moteur partagé par le processus (un seul pool de connexions)"""
+    return create_db_engine()
+
+
+class UnitOfWorkSession(Session):
+    """
+    Session dont les commits des repositories sont différés pendant une unité de travail
+    
+    Dans une unité de travail (info["unit_of_work_depth"] > 0):
+    - commit() se contente d'un flush (les écritures restent dans la transaction)
+    - rollback() annule toute la transaction et la marque comme annulée,
+      l'unité de travail refusera alors de valider
+    Hors unité de travail, comportement standard.
+    """
+    
+    def in_unit_of_work(self) -> bool:
+        return self.info.get("unit_of_work_depth", 0) > 0
+    
+    def commit(self):
+        if self.in_unit_of_work():
+            self.flush()
+            return
+        super().commit()
+    
+    def rollback(self):
+        if self.in_unit_of_work():
+            self.info["unit_of_work_rollback_only"] = True
+        super().rollback()
+
+
+@lru_cache(maxsize=None)
 def get_session_factory():
-    """Crée une factory de sessions"""
-    engine = create_db_engine()
-    return sessionmaker(bind=engine)
+    """Factory de sessions partagée (liée au moteur du processus)"""
+    return sessionmaker(bind=get_engine(), class_=UnitOfWorkSession)
 
 
 def get_db():
@@ -56,16 +89,56 @@ def init_database():
     # Import des modèles pour que SQLAlchemy les connaisse
     from infrastructure.database.models import (
         UserModel, CvModel, MotivationalLetterModel, 
-        PromoCodeModel, GenerationHistoryModel
+        PromoCodeModel, GenerationHistoryModel, IdempotencyKeyModel,
+        CreditLedgerModel, CreditReservationModel, CreditBalanceSnapshotModel,
+        PromoRedemptionModel, UserGenerationStatsModel
     )
     
-    engine = create_db_engine()
+    engine = get_engine()
     Base.metadata.create_all(engine)
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    
+    from infrastructure.database.search import ensure_search_indexes
+    ensure_search_indexes(engine)
     logger.info("Base de données initialisée avec succès")
 
 
+def ensure_columns(engine):
+    """
+    Ajoute les colonnes nullables déclarées sur les modèles mais absentes en base
+    (create_all ne modifie pas les tables existantes)
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'
+                ))
+                logger.info(f"Colonne ajoutée: {table.name}.{column.name}")
+
+
+def ensure_indexes(engine):
+    """
+    Crée les index déclarés sur les modèles mais absents en base
+    (create_all ne crée les index que pour les nouvelles tables)
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def drop_all_tables():
     """Supprime toutes les tables (utile pour les tests)"""
-    engine = create_db_engine()
+    engine = get_engine()
     Base.metadata.drop_all(engine)
     logger.warning("Toutes les tables ont été supprimées")
@@ -6,11 +6,23 @@ from .cv_model import CvModel
 from .letter_model import MotivationalLetterModel
 from .promo_code_model import PromoCodeModel
 from .generation_history_model import GenerationHistoryModel
+from .idempotency_key_model import IdempotencyKeyModel
+from .credit_ledger_model import CreditLedgerModel
+from .credit_reservation_model import CreditReservationModel
+from .credit_balance_snapshot_model import CreditBalanceSnapshotModel
+from .promo_redemption_model import PromoRedemptionModel
+from .user_generation_stats_model import UserGenerationStatsModel
 
 __all__ = [
     'UserModel',
     'CvModel',
     'MotivationalLetterModel',
     'PromoCodeModel',
-    'GenerationHistoryModel'
+    'GenerationHistoryModel',
+    'IdempotencyKeyModel',
+    'CreditLedgerModel',
+    'CreditReservationModel',
+    'CreditBalanceSnapshotModel',
+    'PromoRedemptionModel',
+    'UserGenerationStatsModel'
 ]
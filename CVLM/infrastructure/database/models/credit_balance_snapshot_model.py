@@ -0,0 +1,22 @@
+"""
+Modèle SQLAlchemy pour les snapshots périodiques des soldes de crédits
+"""
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from datetime import datetime
+from infrastructure.database.config import Base
+
+
+class CreditBalanceSnapshotModel(Base):
+    """
+    Solde de chaque utilisateur à un instant donné
+    Solde attendu = snapshot + SUM(credit_ledger.delta WHERE id > last_ledger_id)
+    """
+    __tablename__ = 'credit_balance_snapshots'
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False, index=True)
+    pdf_credits = Column(Integer, nullable=False)
+    text_credits = Column(Integer, nullable=False)
+    last_ledger_id = Column(BigInteger, nullable=True)  # Dernière entrée du journal incluse
+    
+    created_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
@@ -0,0 +1,24 @@
+"""
+Modèle SQLAlchemy pour le journal des mouvements de crédits
+"""
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from datetime import datetime
+from infrastructure.database.config import Base
+
+
+class CreditLedgerModel(Base):
+    """
+    Journal append-only des mouvements de crédits (jamais modifié ni supprimé)
+    Le solde courant reste sur users.<type>_credits (lecture O(1))
+    """
+    __tablename__ = 'credit_ledger'
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False, index=True)
+    credit_type = Column(String(10), nullable=False)  # 'pdf' ou 'text'
+    delta = Column(Integer, nullable=False)  # -1 réservation, +1 libération, 0 confirmation
+    reason = Column(String(20), nullable=False)  # 'reserve', 'commit', 'release', 'expire'
+    reservation_id = Column(String, nullable=True, index=True)
+    balance_after = Column(Integer, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
@@ -0,0 +1,21 @@
+"""
+Modèle SQLAlchemy pour les réservations de crédits
+"""
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from infrastructure.database.config import Base
+
+
+class CreditReservationModel(Base):
+    """Modèle de table pour les crédits réservés pendant une génération"""
+    __tablename__ = 'credit_reservations'
+    
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False, index=True)
+    credit_type = Column(String(10), nullable=False)  # 'pdf' ou 'text'
+    status = Column(String(20), nullable=False, default='reserved')  # 'reserved', 'committed', 'released', 'expired'
+    
+    # Dates
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    resolved_at = Column(DateTime, nullable=True)
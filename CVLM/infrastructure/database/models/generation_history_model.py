@@ -1,7 +1,7 @@
 """
 Modèle SQLAlchemy pour l'historique de génération
 """
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, String, DateTime, Text, Index, text
 from datetime import datetime
 from infrastructure.database.config import Base
 
@@ -9,6 +9,16 @@ from infrastructure.database.config import Base
 class GenerationHistoryModel(Base):
     """Modèle de table pour l'historique de génération"""
     __tablename__ = 'generation_history'
+    __table_args__ = (
+        # Historique et statistiques d'un utilisateur (filtre user_id, tri/filtre created_at)
+        Index('ix_generation_history_user_created', 'user_id', 'created_at'),
+        # Nettoyage des fichiers expirés: seules les lignes ayant encore un fichier
+        Index(
+            'ix_generation_history_expiring_files',
+            'file_expires_at',
+            postgresql_where=text('file_path IS NOT NULL')
+        ),
+    )
     
     id = Column(String, primary_key=True)
     user_id = Column(String, nullable=False, index=True)
@@ -22,7 +32,9 @@ class GenerationHistoryModel(Base):
     # Informations sur la génération
     cv_filename = Column(String(255), nullable=True)
     cv_id = Column(String, nullable=True)
-    file_path = Column(String(500), nullable=True)  # NULL si expiré
+    llm_provider = Column(String(20), nullable=True)
+    file_path = Column(String(500), nullable=True)  # NULL si expiré ou pas encore rendu
+    letter_id = Column(String, nullable=True)  # Lettre source: permet de re-rendre le PDF
     text_content = Column(Text, nullable=True)
     
     # Statut
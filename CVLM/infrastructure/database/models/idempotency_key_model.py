@@ -0,0 +1,25 @@
+"""
+Modèle SQLAlchemy pour les clés d'idempotence
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Text
+from datetime import datetime
+from infrastructure.database.config import Base
+
+
+class IdempotencyKeyModel(Base):
+    """Modèle de table pour les réponses rejouables (Idempotency-Key)"""
+    __tablename__ = 'idempotency_keys'
+
+    user_id = Column(String, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String(100), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+
+    # Réponse mémorisée
+    status = Column(String(20), nullable=False, default='pending')  # 'pending' ou 'completed'
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+
+    # Dates
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,7 +1,7 @@
 """
 Modèle SQLAlchemy pour les lettres de motivation
 """
-from sqlalchemy import Column, String, Integer, DateTime, Text
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
 from datetime import datetime
 from infrastructure.database.config import Base
 
@@ -9,6 +9,10 @@ from infrastructure.database.config import Base
 class MotivationalLetterModel(Base):
     """Modèle de table pour les lettres de motivation"""
     __tablename__ = 'motivational_letters'
+    __table_args__ = (
+        # Liste des lettres d'un utilisateur, plus récentes d'abord
+        Index('ix_motivational_letters_user_created', 'user_id', 'created_at'),
+    )
     
     id = Column(String, primary_key=True)
     user_id = Column(String, nullable=False, index=True)
@@ -19,6 +23,8 @@ class MotivationalLetterModel(Base):
     file_size = Column(Integer, nullable=False)
     raw_text = Column(Text, nullable=True)
     llm_provider = Column(String, nullable=False, default='openai')
+    pdf_generator = Column(String(20), nullable=True)  # Générateur du rendu (différé ou non)
+    layout = Column(String(20), nullable=True)  # Gabarit HTML (rendu WeasyPrint et aperçu)
     
     # Dates
     created_at = Column(DateTime, default=datetime.now, nullable=False)
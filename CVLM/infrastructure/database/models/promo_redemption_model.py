@@ -0,0 +1,24 @@
+"""
+Modèle SQLAlchemy pour les utilisations de codes promo
+"""
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index
+from datetime import datetime
+from infrastructure.database.config import Base
+
+
+class PromoRedemptionModel(Base):
+    """Modèle de table pour les utilisations de codes promo"""
+    __tablename__ = 'promo_redemptions'
+    __table_args__ = (
+        # Un seul usage par utilisateur et par code
+        Index('ix_promo_redemptions_user_code', 'user_id', 'code', unique=True),
+    )
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False)
+    code = Column(String, nullable=False, index=True)
+    pdf_credits = Column(Integer, nullable=False, default=0)
+    text_credits = Column(Integer, nullable=False, default=0)
+    
+    # Dates
+    redeemed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,38 @@
+"""
+Modèle SQLAlchemy pour les statistiques de génération par utilisateur
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Date
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from infrastructure.database.config import Base
+
+
+class UserGenerationStatsModel(Base):
+    """
+    Compteurs maintenus incrémentalement à chaque ajout/suppression d'historique
+    (même transaction que generation_history). Reconstruits par
+    infrastructure.jobs.rebuild_history_stats en cas de dérive.
+    """
+    __tablename__ = 'user_generation_stats'
+    
+    user_id = Column(String, primary_key=True)
+    
+    # Totaux par type et statut
+    total_count = Column(Integer, nullable=False, default=0)
+    pdf_count = Column(Integer, nullable=False, default=0)
+    text_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    
+    # Dernière génération
+    last_generation_at = Column(DateTime, nullable=True)
+    
+    # Mois courant (remis à zéro au changement de mois)
+    month_bucket = Column(Date, nullable=True)
+    month_count = Column(Integer, nullable=False, default=0)
+    
+    # Entreprises distinctes: {company_name: nombre de générations}
+    company_counts = Column(JSONB, nullable=False, default=dict)
+    unique_companies = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.now, nullable=False)
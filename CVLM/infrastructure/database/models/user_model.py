@@ -1,7 +1,7 @@
 """
 Modèle SQLAlchemy pour les utilisateurs
 """
-from sqlalchemy import Column, String, Integer, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Index
 from datetime import datetime
 from infrastructure.database.config import Base
 
@@ -9,6 +9,10 @@ from infrastructure.database.config import Base
 class UserModel(Base):
     """Modèle de table pour les utilisateurs"""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Recherche par préfixe d'email (LIKE 'prefix%') dans l'administration
+        Index('ix_users_email_pattern', 'email', postgresql_ops={'email': 'varchar_pattern_ops'}),
+    )
     
     id = Column(String, primary_key=True)
     email = Column(String, unique=True, nullable=False, index=True)
@@ -22,5 +26,5 @@ class UserModel(Base):
     is_admin = Column(Boolean, nullable=False, default=False)
     
     # Dates
-    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
@@ -0,0 +1,77 @@
+"""
+Pagination par curseur (keyset) sur (colonne de tri, id)
+
+Le curseur est opaque pour le client: base64 url-safe de la dernière clé de tri
+de la page précédente. La page suivante est lue avec
+WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC
+(ou > en ordre croissant), sans OFFSET ni COUNT.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+from sqlalchemy import tuple_, asc, desc
+from sqlalchemy.orm import Query
+
+SortValue = Union[datetime, str]
+
+
+def encode_cursor(sort_value: SortValue, item_id: str) -> str:
+    """Encode la clé de tri d'une ligne en curseur opaque"""
+    if isinstance(sort_value, datetime):
+        payload = [sort_value.isoformat(), item_id]
+    else:
+        payload = [sort_value, item_id, "s"]
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[SortValue, str]:
+    """
+    Décode un curseur
+
+    Raises:
+        ValueError: Curseur invalide ou altéré
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded).decode("utf-8"))
+        if len(payload) == 3 and payload[2] == "s":
+            return str(payload[0]), str(payload[1])
+        sort_value, item_id = payload
+        return datetime.fromisoformat(sort_value), str(item_id)
+    except Exception:
+        raise ValueError("Curseur de pagination invalide")
+
+
+def paginate_by_cursor(
+    query: Query,
+    sort_column,
+    id_column,
+    per_page: int,
+    cursor: Optional[str] = None,
+    descending: bool = True
+) -> Tuple[List, Optional[str]]:
+    """
+    Applique la pagination keyset à une requête ORM
+
+    Returns:
+        (lignes de la page, curseur de la page suivante ou None si dernière page)
+    """
+    if cursor:
+        cursor_value, cursor_id = decode_cursor(cursor)
+        key = tuple_(sort_column, id_column)
+        bound = tuple_(cursor_value, cursor_id)
+        query = query.filter(key < bound if descending else key > bound)
+
+    order = desc if descending else asc
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    rows = query.order_by(order(sort_column), order(id_column)).limit(per_page + 1).all()
+
+    if len(rows) <= per_page:
+        return rows, None
+
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
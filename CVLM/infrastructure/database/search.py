@@ -0,0 +1,59 @@
+"""
+Recherche plein texte sur l'historique (pg_trgm + unaccent)
+
+Les index trigrammes GIN permettent à ILIKE '%terme%' d'utiliser un index
+au lieu de parcourir tout l'historique. unaccent n'étant pas IMMUTABLE,
+il est encapsulé dans cvlm_unaccent() pour pouvoir être indexé.
+"""
+from sqlalchemy import text
+
+from infrastructure.adapters.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+UNACCENT_FUNCTION = "cvlm_unaccent"
+
+_UNACCENT_WRAPPER_SQL = f"""
+CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+"""
+
+# Repli sans l'extension unaccent: la recherche reste fonctionnelle, sensible aux accents
+_IDENTITY_WRAPPER_SQL = f"""
+CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT $1 $$
+"""
+
+_TRIGRAM_INDEXES_SQL = [
+    f"""
+    CREATE INDEX IF NOT EXISTS ix_generation_history_job_title_trgm
+    ON generation_history USING gin ({UNACCENT_FUNCTION}(job_title) gin_trgm_ops)
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS ix_generation_history_company_name_trgm
+    ON generation_history USING gin ({UNACCENT_FUNCTION}(company_name) gin_trgm_ops)
+    """,
+]
+
+
+def ensure_search_indexes(engine) -> None:
+    """Installe les extensions, la fonction cvlm_unaccent et les index trigrammes"""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+            conn.execute(text(_UNACCENT_WRAPPER_SQL))
+    except Exception as e:
+        logger.warning(f"Extension unaccent indisponible, recherche sensible aux accents: {e}")
+        with engine.begin() as conn:
+            conn.execute(text(_IDENTITY_WRAPPER_SQL))
+
+    with engine.begin() as conn:
+        for statement in _TRIGRAM_INDEXES_SQL:
+            conn.execute(text(statement))
+
+    logger.info("Index de recherche trigrammes en place")
@@ -0,0 +1,4 @@
+"""
+Tâches de maintenance planifiées (cron)
+Usage: python -m infrastructure.jobs.<nom_du_job>
+"""
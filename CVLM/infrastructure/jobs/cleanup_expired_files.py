@@ -0,0 +1,36 @@
+"""
+Job de nettoyage des fichiers PDF expirés de l'historique
+Reprenable et exécutable en parallèle sur plusieurs nœuds (SKIP LOCKED)
+Usage (cron quotidien, depuis le dossier CVLM):
+    python -m infrastructure.jobs.cleanup_expired_files
+"""
+from infrastructure.database.config import get_session_factory
+from infrastructure.adapters.postgres_generation_history_repository import PostgresGenerationHistoryRepository
+from infrastructure.adapters.file_storage_factory import get_file_storage
+from infrastructure.adapters.sharded_file_storage import ShardedFileStorage
+from infrastructure.adapters.logger_config import setup_logger
+from domain.services.generation_history_service import GenerationHistoryService
+
+logger = setup_logger(__name__)
+
+
+def run() -> int:
+    """Supprime les fichiers expirés, retourne le nombre de fichiers supprimés"""
+    SessionLocal = get_session_factory()
+    db = SessionLocal()
+    try:
+        service = GenerationHistoryService(PostgresGenerationHistoryRepository(db))
+        cleaned = service.cleanup_expired_files()
+    finally:
+        db.close()
+    
+    storage = get_file_storage()
+    if isinstance(storage, ShardedFileStorage):
+        # Objets orphelins (écritures interrompues, fichiers supprimés hors du stockage)
+        storage.collect_garbage()
+    return cleaned
+
+
+if __name__ == "__main__":
+    cleaned = run()
+    logger.info(f"Nettoyage terminé: {cleaned} fichier(s) supprimé(s)")
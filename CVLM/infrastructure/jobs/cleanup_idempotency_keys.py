@@ -0,0 +1,26 @@
+"""
+Job de purge des clés d'idempotence expirées
+Usage (cron, depuis le dossier CVLM): python -m infrastructure.jobs.cleanup_idempotency_keys
+"""
+from infrastructure.database.config import get_session_factory
+from infrastructure.adapters.postgres_idempotency_repository import PostgresIdempotencyRepository
+from infrastructure.adapters.logger_config import setup_logger
+from domain.services.idempotency_service import IdempotencyService
+
+logger = setup_logger(__name__)
+
+
+def run() -> int:
+    """Supprime les clés expirées, retourne le nombre de clés supprimées"""
+    SessionLocal = get_session_factory()
+    db = SessionLocal()
+    try:
+        service = IdempotencyService(PostgresIdempotencyRepository(db))
+        return service.cleanup_expired()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    deleted = run()
+    logger.info(f"Purge terminée: {deleted} clé(s) d'idempotence supprimée(s)")
@@ -0,0 +1,34 @@
+"""
+Job de maintenance des crédits:
+- restitue les réservations expirées (génération interrompue)
+- enregistre un snapshot des soldes
+Usage (cron, depuis le dossier CVLM): python -m infrastructure.jobs.credit_maintenance
+"""
+from infrastructure.database.config import get_session_factory
+from infrastructure.adapters.postgres_user_repository import PostgresUserRepository
+from infrastructure.adapters.postgres_credit_ledger_repository import PostgresCreditLedgerRepository
+from infrastructure.adapters.logger_config import setup_logger
+from domain.services.credit_service import CreditService
+
+logger = setup_logger(__name__)
+
+
+def run(take_snapshot: bool = True) -> dict:
+    """Exécute la maintenance, retourne les compteurs"""
+    SessionLocal = get_session_factory()
+    db = SessionLocal()
+    try:
+        service = CreditService(PostgresUserRepository(db), PostgresCreditLedgerRepository(db))
+        released = service.release_expired_reservations()
+        snapshots = service.take_balance_snapshots() if take_snapshot else 0
+        return {"released": released, "snapshots": snapshots}
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    stats = run()
+    logger.info(
+        f"Maintenance crédits terminée: {stats['released']} réservation(s) restituée(s), "
+        f"{stats['snapshots']} snapshot(s)"
+    )
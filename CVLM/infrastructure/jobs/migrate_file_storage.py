@@ -0,0 +1,83 @@
+"""
+Job de migration du stockage plat (cvs/, letters/) vers le stockage adressé par contenu
+Reprenable: un fichier migré quitte l'ancien répertoire, relancer reprend les restants.
+Usage (une fois, depuis le dossier CVLM, avant FILE_STORAGE_BACKEND=sharded):
+    python -m infrastructure.jobs.migrate_file_storage [--keep-source]
+"""
+import sys
+from pathlib import Path
+from typing import Dict
+
+from sqlalchemy import update
+
+from infrastructure.database.config import get_session_factory
+from infrastructure.database.models import CvModel, MotivationalLetterModel, GenerationHistoryModel
+from infrastructure.adapters.sharded_file_storage import ShardedFileStorage
+from infrastructure.adapters.logger_config import setup_logger
+from config.constants import FILE_STORAGE_BASE_PATH
+
+logger = setup_logger(__name__)
+
+# (répertoire plat, préfixe du nom, tables dont file_path pointe vers ces fichiers)
+FLAT_LAYOUT = (
+    ("cvs", "cv_", (CvModel,)),
+    ("letters", "letter_", (MotivationalLetterModel, GenerationHistoryModel)),
+)
+
+
+def run(base_path: str = FILE_STORAGE_BASE_PATH, keep_source: bool = False) -> Dict[str, int]:
+    """
+    Déplace chaque fichier dans le stockage partitionné et met à jour les chemins en base
+
+    Chaque fichier est traité dans sa propre transaction: le chemin en base ne
+    change qu'une fois la référence écrite, l'ancien fichier n'est supprimé
+    qu'après le commit.
+
+    Returns:
+        Nombre de fichiers migrés par répertoire
+    """
+    storage = ShardedFileStorage(base_path)
+    SessionLocal = get_session_factory()
+    migrated = {}
+
+    for folder, prefix, models in FLAT_LAYOUT:
+        source_dir = Path(base_path) / folder
+        count = 0
+
+        for source in sorted(source_dir.glob(f"{prefix}*.pdf")):
+            file_id = source.stem[len(prefix):]
+            new_path = (storage.save_cv if folder == "cvs" else storage.save_letter)(
+                file_id, source.read_bytes(), source.name
+            )
+            # Chemins enregistrés par LocalFileStorage: relatifs à la base ou absolus
+            old_paths = {str(source), str(source.absolute())}
+
+            db = SessionLocal()
+            try:
+                for model in models:
+                    db.execute(
+                        update(model)
+                        .where(model.file_path.in_(old_paths))
+                        .values(file_path=new_path)
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                storage.delete_file(str(Path(new_path).relative_to(storage.base_path)))
+                raise
+            finally:
+                db.close()
+
+            if not keep_source:
+                source.unlink(missing_ok=True)
+            count += 1
+
+        migrated[folder] = count
+        logger.info(f"Migration stockage: {count} fichier(s) migré(s) depuis {folder}/")
+
+    return migrated
+
+
+if __name__ == "__main__":
+    migrated = run(keep_source="--keep-source" in sys.argv[1:])
+    logger.info(f"Migration terminée: {sum(migrated.values())} fichier(s)")
@@ -0,0 +1,30 @@
+"""
+Job de réparation des statistiques d'historique (user_generation_stats)
+Usage (cron, depuis le dossier CVLM):
+    python -m infrastructure.jobs.rebuild_history_stats [user_id]
+"""
+import sys
+from typing import Optional
+
+from infrastructure.database.config import get_session_factory
+from infrastructure.adapters.postgres_generation_history_repository import PostgresGenerationHistoryRepository
+from infrastructure.adapters.logger_config import setup_logger
+from domain.services.generation_history_service import GenerationHistoryService
+
+logger = setup_logger(__name__)
+
+
+def run(user_id: Optional[str] = None) -> int:
+    """Reconstruit les statistiques, retourne le nombre d'utilisateurs traités"""
+    SessionLocal = get_session_factory()
+    db = SessionLocal()
+    try:
+        service = GenerationHistoryService(PostgresGenerationHistoryRepository(db))
+        return service.rebuild_stats(user_id)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuilt = run(sys.argv[1] if len(sys.argv) > 1 else None)
+    logger.info(f"Reconstruction terminée: {rebuilt} utilisateur(s)")
@@ -0,0 +1,8 @@
+"""
+Configuration pytest: les modules de l'application sont importés depuis la
+racine du projet (api, domain, infrastructure, config), comme dans l'API
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,49 @@
+"""
+Cache des hash de contenu (ContentDigestCache): ETags et références du stockage partitionné
+
+Un hash n'est servi depuis la mémoire que si le fichier (inode, taille, mtime)
+n'a pas changé depuis son enregistrement.
+"""
+import hashlib
+import os
+
+from infrastructure.adapters.content_digest_cache import ContentDigestCache
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 8
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_digest_cache_serves_remembered_hash_without_reading(tmp_path):
+    path = tmp_path / "lettre.pdf"
+    path.write_bytes(CONTENT)
+    cache = ContentDigestCache(maxsize=8)
+
+    # Fichier inchangé: le hash enregistré est servi tel quel, sans relecture
+    cache.remember(path, "enregistre")
+    assert cache.get(path) == "enregistre"
+
+
+def test_digest_cache_invalidated_on_rewrite(tmp_path):
+    path = tmp_path / "lettre.pdf"
+    path.write_bytes(CONTENT)
+    cache = ContentDigestCache(maxsize=8)
+    assert cache.get(path) == DIGEST
+
+    # Même taille, même inode: seul le mtime change
+    rewritten = bytes(reversed(CONTENT))
+    stat = path.stat()
+    path.write_bytes(rewritten)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get(path) == hashlib.sha256(rewritten).hexdigest()
+
+
+def test_digest_cache_forgets_deleted_file(tmp_path):
+    path = tmp_path / "lettre.pdf"
+    path.write_bytes(CONTENT)
+    cache = ContentDigestCache(maxsize=8)
+    cache.get(path)
+
+    path.unlink()
+
+    assert cache.get(path) is None
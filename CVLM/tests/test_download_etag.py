@@ -0,0 +1,130 @@
+"""
+Téléchargements conditionnels: ETag de contenu, 304 sur If-None-Match, Range/If-Range
+
+L'ETag est le sha256 du fichier (ContentDigestCache), pas le mtime/taille de
+Starlette: un PDF re-rendu à l'identique garde le même ETag, un contenu
+réécrit en change, et If-Range est validé contre ce même ETag.
+"""
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+try:
+    from api.dependencies import get_current_user, get_download_letter_use_case
+    from api.routes.download import _etag_matches, router
+except OSError:
+    # WeasyPrint importé sans ses bibliothèques système (pango)
+    pytest.skip("WeasyPrint indisponible", allow_module_level=True)
+
+from domain.entities.user import User
+from domain.use_cases.download_letter import DownloadLetterOutput
+from infrastructure.adapters.file_storage_factory import get_async_file_storage
+from infrastructure.adapters.local_file_storage import LocalFileStorage
+from infrastructure.adapters.threaded_file_storage import ThreadedFileStorage
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 8
+ETAG = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+
+
+def test_etag_matches():
+    assert _etag_matches(None, ETAG) is False
+    assert _etag_matches("", ETAG) is False
+    assert _etag_matches("*", ETAG) is True
+    assert _etag_matches(" * ", ETAG) is True
+    assert _etag_matches(ETAG, ETAG) is True
+    assert _etag_matches(f'"autre", {ETAG}', ETAG) is True
+    assert _etag_matches(f"W/{ETAG}", ETAG) is True
+    assert _etag_matches(f'W/"autre", W/{ETAG}', ETAG) is True
+    assert _etag_matches('"autre"', ETAG) is False
+    assert _etag_matches(ETAG.strip('"'), ETAG) is False
+
+
+class _DownloadLetter:
+    """Use case réduit au résultat: chemin, nom et ETag fourni par le stockage"""
+
+    def __init__(self, storage, file_path):
+        self.storage = storage
+        self.file_path = file_path
+
+    async def execute(self, input_data, user):
+        return DownloadLetterOutput(
+            file_path=self.file_path,
+            filename="lettre.pdf",
+            etag=await self.storage.get_etag(self.file_path)
+        )
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    return LocalFileStorage(base_path=str(tmp_path))
+
+
+@pytest.fixture
+def client(local_storage):
+    storage = ThreadedFileStorage(local_storage, max_workers=2)
+    file_path = local_storage.save_letter("L1", CONTENT, "lettre.pdf")
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id="u1", email="u1@example.com", google_id="g1", name="U1"
+    )
+    app.dependency_overrides[get_download_letter_use_case] = lambda: _DownloadLetter(storage, file_path)
+    app.dependency_overrides[get_async_file_storage] = lambda: storage
+
+    with TestClient(app) as client:
+        yield client
+    storage.shutdown()
+
+
+def test_download_sends_content_etag(client):
+    response = client.get("/download-letter/L1")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"].startswith("private")
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+@pytest.mark.parametrize("if_none_match", [ETAG, f"W/{ETAG}", f'"autre", {ETAG}', "*"])
+def test_matching_if_none_match_returns_304(client, if_none_match):
+    response = client.get("/download-letter/L1", headers={"If-None-Match": if_none_match})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == ETAG
+
+
+def test_stale_if_none_match_returns_file(client):
+    response = client.get("/download-letter/L1", headers={"If-None-Match": '"ancien"'})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_if_range_uses_content_etag(client):
+    response = client.get("/download-letter/L1", headers={"Range": "bytes=0-99", "If-Range": ETAG})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[:100]
+    assert response.headers["content-range"] == f"bytes 0-99/{len(CONTENT)}"
+
+
+def test_stale_if_range_returns_whole_file(client):
+    response = client.get("/download-letter/L1", headers={"Range": "bytes=0-99", "If-Range": '"ancien"'})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_rewritten_letter_changes_etag(local_storage, client):
+    local_storage.save_letter("L1", b"%PDF-1.4 nouveau rendu", "lettre.pdf")
+
+    response = client.get("/download-letter/L1", headers={"If-None-Match": ETAG})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == f'"{hashlib.sha256(b"%PDF-1.4 nouveau rendu").hexdigest()}"'
+
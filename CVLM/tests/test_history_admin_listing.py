@@ -0,0 +1,83 @@
+"""
+Historique admin filtré par utilisateur (get_all_with_pagination)
+
+Le total est une lecture seule: la ligne user_generation_stats si elle existe,
+sinon un COUNT de l'historique filtré. Un filtre sur un utilisateur inconnu
+(faute de frappe) ne doit jamais créer de ligne de statistiques.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database.config import Base
+from infrastructure.database.models import GenerationHistoryModel, UserGenerationStatsModel
+from infrastructure.adapters.postgres_generation_history_repository import (
+    PostgresGenerationHistoryRepository
+)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[GenerationHistoryModel.__table__, UserGenerationStatsModel.__table__]
+    )
+    session = sessionmaker(bind=engine)()
+    now = datetime(2025, 1, 1)
+
+    session.add_all([
+        GenerationHistoryModel(
+            id=f"{user_id}-{i}", user_id=user_id, type="pdf", created_at=now + timedelta(minutes=i)
+        )
+        for user_id, count in (("with-stats", 3), ("without-stats", 4))
+        for i in range(count)
+    ])
+    # Compteur maintenu par create(): lu tel quel, sans COUNT
+    session.add(UserGenerationStatsModel(user_id="with-stats", total_count=3, company_counts={}))
+    session.commit()
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _stats_user_ids(session):
+    return {row.user_id for row in session.query(UserGenerationStatsModel).all()}
+
+
+def test_total_from_stats_row(session):
+    result = PostgresGenerationHistoryRepository(session).get_all_with_pagination(
+        per_page=2, user_filter="with-stats"
+    )
+
+    assert result["total"] == 3
+    assert result["total_is_estimate"] is False
+    assert [item.id for item in result["items"]] == ["with-stats-2", "with-stats-1"]
+
+
+def test_total_counted_without_creating_stats_row(session):
+    result = PostgresGenerationHistoryRepository(session).get_all_with_pagination(
+        per_page=2, user_filter="without-stats"
+    )
+
+    assert result["total"] == 4
+    assert len(result["items"]) == 2
+    assert _stats_user_ids(session) == {"with-stats"}
+
+
+def test_unknown_user_filter_is_read_only(session):
+    result = PostgresGenerationHistoryRepository(session).get_all_with_pagination(user_filter="typo")
+    session.rollback()
+
+    assert result["total"] == 0
+    assert result["items"] == []
+    assert _stats_user_ids(session) == {"with-stats"}
@@ -0,0 +1,115 @@
+"""
+Nombre de requêtes SQL de la liste des lettres (/list-letters)
+
+list_summaries doit rester à une requête par page: lettres + nom du CV en
+LEFT JOIN, tri et pagination keyset en SQL. Une régression N+1 (CV chargé
+lettre par lettre, raw_text chargé en différé) ferait grossir ce compte.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database.config import Base
+from infrastructure.database.models import CvModel, MotivationalLetterModel
+from infrastructure.adapters.postgres_motivational_letter_repository import (
+    PostgresMotivationalLetterRepository
+)
+
+USER_ID = "user-1"
+LETTER_COUNT = 120
+PER_PAGE = 50
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[CvModel.__table__, MotivationalLetterModel.__table__])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    now = datetime(2025, 1, 1)
+
+    session.add_all([
+        CvModel(id=f"cv-{i}", user_id=USER_ID, filename=f"cv_{i}.pdf", file_path="", file_size=1)
+        for i in range(3)
+    ])
+    session.add_all([
+        MotivationalLetterModel(
+            id=f"letter-{i:03d}",
+            user_id=USER_ID,
+            # Un CV sur quatre supprimé: cv_filename à None via le LEFT JOIN
+            cv_id=f"cv-{i % 4}",
+            filename=f"lettre_{i}.pdf",
+            file_path="",
+            file_size=1000 + i,
+            raw_text="texte " * 200,
+            llm_provider="openai",
+            # Dates en doublon: le curseur départage sur l'id
+            created_at=now + timedelta(minutes=i // 2)
+        )
+        for i in range(LETTER_COUNT)
+    ])
+    # Lettres d'un autre utilisateur, jamais listées
+    session.add(MotivationalLetterModel(
+        id="other", user_id="user-2", filename="x.pdf", file_path="", file_size=1, llm_provider="openai"
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL exécuté sur le moteur pendant le test"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_list_summaries_runs_one_query_per_page(session, statements):
+    repo = PostgresMotivationalLetterRepository(session=session)
+    seen = []
+    cursor = None
+
+    while True:
+        statements.clear()
+        page = repo.list_summaries(USER_ID, per_page=PER_PAGE, cursor=cursor)
+        # Accès à tous les champs affichés: aucun chargement différé
+        for letter in page["items"]:
+            (letter.id, letter.filename, letter.cv_filename, letter.file_size, letter.created_at)
+
+        assert len(statements) == 1, statements
+        assert "raw_text" not in statements[0]
+
+        seen.extend(letter.id for letter in page["items"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        assert len(page["items"]) == PER_PAGE
+        cursor = page["next_cursor"]
+
+    # Toutes les lettres, une seule fois, plus récentes d'abord
+    assert len(seen) == LETTER_COUNT
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_list_summaries_joins_cv_filename(session, statements):
+    repo = PostgresMotivationalLetterRepository(session=session)
+
+    items = repo.list_summaries(USER_ID, per_page=LETTER_COUNT)["items"]
+
+    assert len(statements) == 1
+    by_id = {letter.id: letter for letter in items}
+    assert by_id["letter-001"].cv_filename == "cv_1.pdf"
+    assert by_id["letter-003"].cv_filename is None
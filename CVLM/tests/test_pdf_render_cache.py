@@ -0,0 +1,89 @@
+"""
+Cache des rendus PDF (PdfRenderCache): clés par générateur/gabarit/mise en page,
+taille suivie en mémoire et éviction LRU jusqu'à 90% de max_bytes
+"""
+import os
+
+import pytest
+
+from infrastructure.adapters.pdf_render_cache import PdfRenderCache
+
+ENTRY = 250
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PdfRenderCache(base_path=str(tmp_path), max_bytes=4 * ENTRY)
+
+
+def _age(cache: PdfRenderCache, key: str, mtime: int) -> None:
+    """Date de dernier accès fixée (l'éviction trie sur le mtime)"""
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+def test_key_separates_generator_template_and_layout():
+    base = PdfRenderCache.make_key("weasyprint", "v1", "texte", layout="classic")
+
+    assert PdfRenderCache.make_key("weasyprint", "v1", "texte", layout="classic") == base
+    assert PdfRenderCache.make_key("fpdf", "v1", "texte", layout="classic") != base
+    assert PdfRenderCache.make_key("weasyprint", "v2", "texte", layout="classic") != base
+    assert PdfRenderCache.make_key("weasyprint", "v1", "texte", layout="modern") != base
+    assert PdfRenderCache.make_key("weasyprint", "v1", "texte") != base
+    assert PdfRenderCache.make_key("weasyprint", "v1", "autre texte", layout="classic") != base
+
+
+def test_key_parts_are_delimited():
+    # Parties séparées: déplacer un caractère d'une partie à l'autre change la clé
+    assert PdfRenderCache.make_key("ab", "c", "texte") != PdfRenderCache.make_key("a", "bc", "texte")
+    assert PdfRenderCache.make_key("g", "v", "texte", layout="a") != PdfRenderCache.make_key("g", "v", "atexte")
+
+
+def test_put_then_get(cache):
+    assert cache.get("ab12") is None
+
+    cache.put("ab12", b"%PDF rendu")
+
+    assert cache.get("ab12") == b"%PDF rendu"
+    assert cache._path("ab12").parent.name == "ab"
+
+
+def test_overwrite_accounts_size_delta(cache):
+    cache.put("ab12", b"x" * 400)
+    cache.put("ab12", b"x" * 400)
+    assert cache._size == 400
+
+    cache.put("ab12", b"x" * 300)
+    assert cache._size == 300
+
+    cache.put("ab12", b"x" * 500)
+    assert cache._size == 500
+
+
+def test_eviction_removes_least_recently_used_down_to_90_percent(cache, tmp_path):
+    for index, key in enumerate(("aa01", "bb02", "cc03", "dd04")):
+        cache.put(key, b"x" * ENTRY)
+        _age(cache, key, 1_000 + index)
+    assert cache._size == cache.max_bytes
+
+    # aa01 relu: devient le plus récent, bb02 et cc03 sont les plus anciens
+    assert cache.get("aa01") is not None
+    cache.put("ee05", b"x" * ENTRY)
+
+    # 1250 > 1000: évincés jusqu'à 900 bytes, soit deux entrées
+    assert cache.get("bb02") is None
+    assert cache.get("cc03") is None
+    for key in ("aa01", "dd04", "ee05"):
+        assert cache.get(key) is not None
+    assert cache._size == 3 * ENTRY
+
+    # Taille recalculée depuis le disque à l'ouverture
+    assert PdfRenderCache(base_path=str(tmp_path), max_bytes=cache.max_bytes)._size == 3 * ENTRY
+
+
+def test_no_eviction_under_max_bytes(cache):
+    for key in ("aa01", "bb02", "cc03", "dd04"):
+        cache.put(key, b"x" * ENTRY)
+        cache.put(key, b"x" * ENTRY)
+
+    for key in ("aa01", "bb02", "cc03", "dd04"):
+        assert cache.get(key) is not None
@@ -0,0 +1,130 @@
+"""
+S3FileStorage contre un vrai serveur S3 local (moto en mode serveur, HTTP)
+
+Même chemin que le stand-in docker-compose (--profile s3): client boto3,
+création du bucket, envoi multipart, URL présignée suivie par un client HTTP.
+"""
+import urllib.request
+
+import pytest
+
+pytest.importorskip("boto3")
+moto_server = pytest.importorskip("moto.server")
+
+from boto3.s3.transfer import TransferConfig
+
+from infrastructure.adapters.s3_file_storage import S3FileStorage
+
+BUCKET = "cvlm-test"
+MB = 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def endpoint_url():
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def storage(endpoint_url, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    return S3FileStorage(
+        bucket=BUCKET,
+        prefix="env",
+        endpoint_url=endpoint_url,
+        region="us-east-1",
+        create_bucket=True
+    )
+
+
+def test_save_get_delete_letter(storage):
+    content = b"%PDF-1.4 lettre"
+
+    path = storage.save_letter("L1", content, "lettre_L1.pdf")
+
+    assert path == f"s3://{BUCKET}/env/letters/letter_L1.pdf"
+    assert storage.get_letter_path("L1") == path
+    assert storage.path_exists(path)
+    assert storage.get_file(path) == content
+    assert storage.get_file_size(path) == len(content)
+    assert storage.get_etag(path).startswith('"')
+
+    assert storage.delete_path(path) is True
+    assert not storage.path_exists(path)
+    assert storage.get_letter_path("L1") is None
+    assert storage.get_etag(path) is None
+    assert storage.delete_letter("L1") is False
+
+
+def test_save_file_by_key(storage):
+    key = storage.save_file(b"cv", "cv_1.pdf", subfolder="cvs")
+
+    assert key == "env/cvs/cv_1.pdf"
+    assert storage.file_exists(key)
+    assert storage.delete_file(key) is True
+    assert not storage.file_exists(key)
+
+
+def test_multipart_upload_above_threshold(storage):
+    # Parties de 5 Mo (minimum S3) au lieu des 8 Mo de production
+    storage.transfer_config = TransferConfig(
+        multipart_threshold=5 * MB, multipart_chunksize=5 * MB, use_threads=False
+    )
+    content = bytes(range(256)) * (11 * MB // 256)
+
+    path = storage.save_cv("big", content, "cv.pdf")
+
+    # ETag d'un objet multipart: <md5 des parties>-<nombre de parties>
+    assert storage.get_etag(path).strip('"').endswith("-3")
+    assert storage.get_file(path) == content
+
+
+def test_presigned_download(storage):
+    content = b"%PDF-1.4 presigned"
+    path = storage.save_letter("L2", content, "lettre_L2.pdf")
+
+    url = storage.get_download_url(path, "Lettre Société.pdf")
+
+    with urllib.request.urlopen(url) as response:
+        assert response.read() == content
+        disposition = response.headers["Content-Disposition"]
+    assert disposition.startswith("attachment;")
+    assert "filename*=UTF-8''Lettre%20Soci%C3%A9t%C3%A9.pdf" in disposition
+
+
+def test_presigned_download_uses_public_endpoint(endpoint_url, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    # L'API et le navigateur joignent le même serveur par deux adresses différentes
+    public_url = endpoint_url.replace("127.0.0.1", "localhost")
+    storage = S3FileStorage(
+        bucket=BUCKET,
+        endpoint_url=endpoint_url,
+        public_endpoint_url=public_url,
+        region="us-east-1",
+        create_bucket=True
+    )
+    path = storage.save_letter("L3", b"%PDF-1.4 public", "lettre_L3.pdf")
+
+    url = storage.get_download_url(path, "lettre.pdf")
+
+    assert url.startswith(public_url)
+    with urllib.request.urlopen(url) as response:
+        assert response.read() == b"%PDF-1.4 public"
+
+
+def test_stream_file(storage):
+    content = b"x" * (150 * 1024)
+    path = storage.save_letter("L4", content, "lettre_L4.pdf")
+
+    chunks = list(storage.stream_file(path, chunk_size=64 * 1024))
+
+    assert b"".join(chunks) == content
+    assert len(chunks) == 3
+    assert storage.stream_file(f"s3://{BUCKET}/env/letters/absent.pdf") is None
+    # Chemin local hérité: servi par l'API (FileResponse), pas en flux
+    assert storage.stream_file("/app/data/files/letters/letter_L4.pdf") is None
@@ -0,0 +1,162 @@
+"""
+Stockage adressé par contenu (ShardedFileStorage) et migration depuis le stockage plat
+
+Le compteur de références est le nombre de liens physiques de l'objet: un
+contenu identique n'est stocké qu'une fois, un objet sans référence disparaît.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.adapters.sharded_file_storage import ShardedFileStorage
+from infrastructure.database.config import Base
+from infrastructure.database.models import CvModel, MotivationalLetterModel, GenerationHistoryModel
+from infrastructure.jobs import migrate_file_storage
+
+CONTENT = b"%PDF-1.4 contenu"
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ShardedFileStorage(base_path=str(tmp_path))
+
+
+def test_identical_content_is_stored_once(storage):
+    cv_path = storage.save_cv("1", CONTENT, "cv.pdf")
+    letter_path = storage.save_letter("L1", CONTENT, "lettre.pdf")
+
+    assert cv_path != letter_path
+    assert storage.ref_count(DIGEST) == 2
+    assert os.path.samefile(cv_path, letter_path)
+    assert os.path.samefile(cv_path, storage.object_path(DIGEST))
+    assert Path(letter_path).read_bytes() == CONTENT
+
+
+def test_overwrite_releases_previous_object(storage):
+    path = storage.save_letter("L1", CONTENT, "lettre.pdf")
+    new_content = b"%PDF-1.4 nouveau rendu"
+    new_digest = hashlib.sha256(new_content).hexdigest()
+
+    assert storage.save_letter("L1", new_content, "lettre.pdf") == path
+
+    assert not storage.object_path(DIGEST).exists()
+    assert storage.ref_count(DIGEST) == 0
+    assert storage.ref_count(new_digest) == 1
+    assert storage.get_etag(path) == f'"{new_digest}"'
+    assert Path(path).read_bytes() == new_content
+
+
+def test_overwrite_keeps_object_still_referenced(storage):
+    storage.save_cv("1", CONTENT, "cv.pdf")
+    storage.save_letter("L1", CONTENT, "lettre.pdf")
+
+    storage.save_letter("L1", b"%PDF-1.4 autre", "lettre.pdf")
+
+    assert storage.ref_count(DIGEST) == 1
+    assert storage.object_path(DIGEST).exists()
+
+
+def test_delete_letter_drops_object_at_zero_references(storage):
+    cv_path = storage.save_cv("1", CONTENT, "cv.pdf")
+    storage.save_letter("L1", CONTENT, "lettre.pdf")
+
+    assert storage.delete_letter("L1") is True
+    assert storage.get_letter_path("L1") is None
+    assert storage.ref_count(DIGEST) == 1
+
+    assert storage.delete_path(cv_path) is True
+    assert storage.get_cv_path("1") is None
+    assert storage.ref_count(DIGEST) == 0
+    assert not storage.object_path(DIGEST).exists()
+
+
+def test_delete_missing_reference(storage):
+    path = storage.save_letter("L1", CONTENT, "lettre.pdf")
+    assert storage.delete_path(path) is True
+
+    assert storage.delete_path(path) is False
+    assert storage.delete_letter("L1") is False
+
+
+def test_collect_garbage_removes_unreferenced_objects(storage):
+    kept = storage.save_cv("1", b"%PDF-1.4 garde", "cv.pdf")
+    orphan = storage.save_letter("L1", CONTENT, "lettre.pdf")
+    # Référence supprimée hors du storage: l'objet reste à 0 référence
+    os.remove(orphan)
+    assert storage.ref_count(DIGEST) == 0
+    assert storage.object_path(DIGEST).exists()
+
+    assert storage.collect_garbage() == 1
+
+    assert not storage.object_path(DIGEST).exists()
+    assert Path(kept).exists()
+    assert storage.collect_garbage() == 0
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://")
+    tables = [CvModel.__table__, MotivationalLetterModel.__table__, GenerationHistoryModel.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(migrate_file_storage, "get_session_factory", lambda: factory)
+    yield factory
+    engine.dispose()
+
+
+def _write_flat(base: Path, folder: str, name: str, content: bytes) -> str:
+    path = base / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_migrate_moves_flat_files_and_rewrites_paths(tmp_path, session_factory):
+    cv_path = _write_flat(tmp_path, "cvs", "cv_1.pdf", b"%PDF-1.4 cv")
+    letter_path = _write_flat(tmp_path, "letters", "letter_L1.pdf", CONTENT)
+    _write_flat(tmp_path, "letters", "letter_L2.pdf", CONTENT)
+
+    db = session_factory()
+    db.add(CvModel(id="1", user_id="u", filename="cv.pdf", file_path=cv_path, file_size=11))
+    db.add(MotivationalLetterModel(
+        id="L1", user_id="u", filename="lettre.pdf", file_path=letter_path,
+        file_size=len(CONTENT), llm_provider="openai"
+    ))
+    db.add(GenerationHistoryModel(id="h1", user_id="u", type="pdf", file_path=letter_path))
+    db.add(GenerationHistoryModel(id="h2", user_id="u", type="pdf", file_path="ailleurs/lettre.pdf"))
+    db.commit()
+    db.close()
+
+    migrated = migrate_file_storage.run(base_path=str(tmp_path))
+
+    assert migrated == {"cvs": 1, "letters": 2}
+    assert not Path(cv_path).exists()
+    assert not Path(letter_path).exists()
+
+    storage = ShardedFileStorage(base_path=str(tmp_path))
+    new_cv_path = storage.get_cv_path("1")
+    new_letter_path = storage.get_letter_path("L1")
+    assert Path(new_cv_path).read_bytes() == b"%PDF-1.4 cv"
+    # L1 et L2 ont le même contenu: un seul objet
+    assert storage.ref_count(DIGEST) == 2
+
+    db = session_factory()
+    assert db.get(CvModel, "1").file_path == new_cv_path
+    assert db.get(MotivationalLetterModel, "L1").file_path == new_letter_path
+    assert db.get(GenerationHistoryModel, "h1").file_path == new_letter_path
+    assert db.get(GenerationHistoryModel, "h2").file_path == "ailleurs/lettre.pdf"
+    db.close()
+
+
+def test_migrate_keep_source(tmp_path, session_factory):
+    letter_path = _write_flat(tmp_path, "letters", "letter_L1.pdf", CONTENT)
+
+    assert migrate_file_storage.run(base_path=str(tmp_path), keep_source=True) == {"cvs": 0, "letters": 1}
+
+    assert Path(letter_path).read_bytes() == CONTENT
+    assert ShardedFileStorage(base_path=str(tmp_path)).ref_count(DIGEST) == 1